@@ -0,0 +1,181 @@
+"""Benchmarks du pipeline sur des pages athle.fr synthétiques.
+
+Usage :
+    uv run benchmarks/bench.py                 # compare à la baseline
+    uv run benchmarks/bench.py --save          # (ré)écrit la baseline
+    uv run benchmarks/bench.py --sizes 1,10    # tailles réduites
+
+Chaque cas est mesuré à 1, 10 et 100 pages (250 lignes par page). On garde
+le meilleur temps sur `--repeat` essais. Un cas plus lent que la baseline
+de plus de `--threshold` (25 % par défaut) est une régression (code 1).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from mypacer_club import analyzer, pipeline, reporter, scraper, synthetic
+from mypacer_club.model import build_report_model
+from mypacer_club.variants import ResultIndex, Variant
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+SIZES = (1, 10, 100)
+NOW = datetime(2026, 2, 16, 8, 0)
+SEED = 42
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> float:
+    """Meilleur temps (s) sur `repeat` essais."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_size(pages: int, repeat: int) -> dict[str, float]:
+    html_pages = synthetic.generate_club_pages(pages=pages, seed=SEED, today=NOW)
+    soups = [BeautifulSoup(h, "lxml") for h in html_pages]
+    rows = [r for s in soups for r in scraper.parse_raw_results(s)]
+    recent, highlights = analyzer.process_results(rows, today=NOW)
+    results: dict[str, float] = {}
+
+    results["parse"] = measure(
+        lambda: [scraper.parse_raw_results(s) for s in soups], repeat
+    )
+    results["analyze"] = measure(
+        lambda: analyzer.process_results(rows, today=NOW), repeat
+    )
+    results["cards"] = measure(
+        lambda: reporter._generate_cards(highlights, True), repeat
+    )
+    results["report"] = measure(
+        lambda: reporter.format_html_report(
+            "US SYNTHÉTIQUE", recent, highlights, today=NOW
+        ),
+        repeat,
+    )
+
+    # Rapport complet + une variante par catégorie d'âge, cartes partagées
+    variants = [Variant(c, categories=(c,)) for c in synthetic.CATEGORIES]
+
+    def render_variants() -> None:
+        cache: reporter.CardCache = {}
+        full = build_report_model("US SYNTHÉTIQUE", recent, highlights, today=NOW)
+        reporter.render_html(full, cache=cache)
+        index = ResultIndex(recent, highlights)
+        for v in variants:
+            reporter.render_html(
+                index.model("US SYNTHÉTIQUE", v, today=NOW), cache=cache
+            )
+
+    results["variants"] = measure(render_variants, repeat)
+
+    # Bout en bout, chemin --sample : toutes les lignes dans un seul fichier
+    sample = synthetic.generate_page(
+        rows=pages * synthetic.ROWS_PER_PAGE, seed=SEED, today=NOW
+    )
+    with tempfile.NamedTemporaryFile("w", suffix=".html", delete=False) as f:
+        f.write(sample)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            results["e2e_sample"] = measure(
+                lambda: pipeline.build_report("033033", NOW, sample=f.name), repeat
+            )
+    finally:
+        os.unlink(f.name)
+    return {f"{name}@{pages}": t for name, t in results.items()}
+
+
+def machine() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    """Affiche l'écart à la baseline. Retourne les cas en régression."""
+    regressions = []
+    for case, t in results.items():
+        ref = baseline.get(case)
+        if ref is None:
+            print(f"   {case:<16} {t * 1000:10.2f} ms   (pas de baseline)")
+            continue
+        ratio = t / ref if ref else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  ❌ régression"
+            regressions.append(case)
+        elif ratio < 1 - threshold:
+            flag = "  🚀"
+        print(f"   {case:<16} {t * 1000:10.2f} ms   x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks MyPacer Club")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(map(str, SIZES)),
+        help="Nombres de pages, séparés par des virgules",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Essais par cas")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Ralentissement toléré"
+    )
+    parser.add_argument("--baseline", default=BASELINE, help="Fichier de baseline")
+    parser.add_argument(
+        "--save", action="store_true", help="Écrit les résultats comme baseline"
+    )
+    args = parser.parse_args()
+
+    results: dict[str, float] = {}
+    for pages in (int(s) for s in args.sizes.split(",")):
+        print(f"⏱️  {pages} page(s)...")
+        results.update(run_size(pages, args.repeat))
+
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine(), "results": results}, f, indent=2)
+            f.write("\n")
+        compare(results, {}, args.threshold)
+        print(f"💾 Baseline écrite : {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        compare(results, {}, args.threshold)
+        print("ℹ️  Pas de baseline : lancez avec --save.")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        ref = json.load(f)
+    if ref.get("machine") != machine():
+        print(f"⚠️  Baseline mesurée sur une autre machine : {ref.get('machine')}")
+    regressions = compare(results, ref["results"], args.threshold)
+    if regressions:
+        print(f"❌ {len(regressions)} régression(s) : {', '.join(regressions)}")
+        sys.exit(1)
+    print("✅ Pas de régression.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Crawl d'un club contre le faux athle.fr local : concurrence et backoff.
+
+Usage :
+    uv run benchmarks/crawl.py --pages 20 --latency lognormal:0.2:0.5 \\
+        --throttle-rate 0.05 --workers 1,2,4,8 --backoff 0.5
+
+Pour chaque nombre de workers : durée du crawl, requêtes émises, 429 et 5xx
+reçus. Tout est déterministe à seed égal (hors ordonnancement des threads).
+Avec `--hedge p95`, chaque configuration est aussi mesurée avec hedging.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from mypacer_club import scraper
+from mypacer_club.hedging import Hedger
+from mypacer_club.standin import AthleStandin, Latency, StandinConfig
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark du crawl athle.fr")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--latency", default="lognormal:0.2:0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--backoff", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--hedge", help='Seuil de hedging ("p95", "0.5")')
+    parser.add_argument("--hedge-budget", type=float, default=0.1)
+    args = parser.parse_args()
+
+    runs = [(int(w), False) for w in args.workers.split(",")]
+    if args.hedge:
+        runs = [(w, hedged) for w, _ in runs for hedged in (False, True)]
+
+    print(f"{'workers':>8} {'durée':>9} {'requêtes':>9} {'429':>5} {'5xx':>5}")
+    for workers, hedged in runs:
+        config = StandinConfig(
+            pages=args.pages,
+            rows=args.rows,
+            seed=args.seed,
+            latency=Latency.parse(args.latency),
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            retry_after=args.retry_after,
+        )
+        server = AthleStandin(config).start()
+        hedger = Hedger.from_spec(args.hedge, args.hedge_budget) if hedged else None
+        start = time.perf_counter()
+        try:
+            scraper.fetch_all_club_pages(
+                "033033",
+                2026,
+                base_url=server.url,
+                max_workers=workers,
+                max_retries=args.max_retries,
+                backoff=args.backoff,
+                hedger=hedger,
+            )
+            elapsed = f"{time.perf_counter() - start:8.2f}s"
+        except SystemExit:
+            elapsed = "   échec"
+        finally:
+            server.stop()
+            if hedger:
+                hedger.close()
+        codes = Counter(h.status for h in server.hits)
+        errors = sum(n for code, n in codes.items() if code >= 500)
+        label = f"{workers}{'+h' if hedged else ''}"
+        print(
+            f"{label:>8} {elapsed:>9} {len(server.hits):>9} {codes[429]:>5} {errors:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Mémoire retenue par les résultats parsés, avec et sans dictionnaire de chaînes.
+
+Usage :
+    uv run benchmarks/memory.py --clubs 5 --pages 10
+
+Mesure (tracemalloc) la mémoire des lignes parsées pour `--clubs` clubs de
+`--pages` pages synthétiques chacun : sans partage de chaînes, avec un
+StringPool par club (comme le pipeline), puis un seul pour tous les clubs.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from mypacer_club import scraper, synthetic
+from mypacer_club.stringpool import StringPool
+
+NOW = datetime(2026, 2, 16, 8, 0)
+
+
+def retained(parse: Callable[[], Any]) -> tuple[int, Any]:
+    """Octets encore alloués après `parse` (le résultat est gardé vivant)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = parse()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mémoire des résultats parsés")
+    parser.add_argument("--clubs", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=synthetic.ROWS_PER_PAGE)
+    args = parser.parse_args()
+
+    print(f"🧱 Génération : {args.clubs} club(s) x {args.pages} page(s)...")
+    clubs = [
+        [
+            BeautifulSoup(html, "lxml")
+            for html in synthetic.generate_club_pages(
+                f"{i:06d}", pages=args.pages, rows=args.rows, seed=i, today=NOW
+            )
+        ]
+        for i in range(args.clubs)
+    ]
+
+    def without_pool() -> list[dict[str, Any]]:
+        return [r for soups in clubs for s in soups for r in scraper._parse_rows(s)]
+
+    def pool_per_club() -> list[dict[str, Any]]:
+        rows = []
+        for soups in clubs:
+            pool = StringPool()
+            rows += [r for s in soups for r in scraper._parse_rows(s, pool)]
+        return rows
+
+    def shared_pool() -> list[dict[str, Any]]:
+        pool = StringPool()
+        return [
+            r for soups in clubs for s in soups for r in scraper._parse_rows(s, pool)
+        ]
+
+    print(f"{'mode':<16} {'lignes':>8} {'mémoire':>10} {'octets/ligne':>13}")
+    reference = None
+    for name, parse in (
+        ("sans partage", without_pool),
+        ("pool par club", pool_per_club),
+        ("pool partagé", shared_pool),
+    ):
+        size, rows = retained(parse)
+        reference = reference or size
+        print(
+            f"{name:<16} {len(rows):>8} {size / 1e6:>8.2f} Mo {size / len(rows):>13.0f}"
+            f"   x{size / reference:.2f}"
+        )
+        del rows
+
+
+if __name__ == "__main__":
+    main()
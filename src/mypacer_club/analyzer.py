@@ -2,10 +2,28 @@ from datetime import datetime, timedelta
 import re
 from typing import Any
 
-
-def parse_date(date_str: str) -> datetime | None:
+from . import metrics
+
+# Mots-clés pour exclure les tours préliminaires des podiums
+PRELIM_KEYWORDS = (
+    "série",
+    "serie",
+    "demi",
+    "semi",
+    "qualif",
+    "tour",
+    "1/2",
+    "1/4",
+    "1/8",
+)
+
+# Niveaux retenus comme highlight : National ou Inter
+HIGH_LEVELS = ("N", "IR", "IA", "IB")
+
+
+def parse_date(date_str: str, today: datetime | None = None) -> datetime | None:
     """Convertit 'JJ/MM' en datetime avec gestion de l'année glissante."""
-    today = datetime.now()
+    today = today or datetime.now()
     match = re.match(r"^(\d{1,2})/(\d{1,2})$", date_str.strip())
     if not match:
         return None
@@ -24,29 +42,59 @@ def parse_date(date_str: str) -> datetime | None:
 
 
 def process_results(
-    raw_results: list[dict[str, Any]], days: int = 7
+    raw_results: list[dict[str, Any]], days: int = 7, today: datetime | None = None
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
     """
     Filtre les résultats récents et extrait les highlights.
     Retourne: (recent, highlights)
     """
-    today = datetime.now()
+    today = today or datetime.now()
     cutoff = today - timedelta(days=days)
 
     recent = []
     for r in raw_results:
-        dt = parse_date(r["date"])
+        dt = parse_date(r["date"], today)
         if dt and dt >= cutoff:
-            r["_dt"] = dt  # Stocké pour le tri
-            recent.append(r)
+            recent.append(_derive(r, dt))
 
     # Tri Chronologique : Date > Ville > Nom
     recent.sort(key=lambda x: (x["_dt"] or datetime.min, x["ville"], x["nom"]))
 
-    highlights = _extract_highlights(recent)
+    highlights = analyze_window(recent, analyzed=len(raw_results))
     return recent, highlights
 
 
+def analyze_window(
+    recent: list[dict[str, Any]], analyzed: int | None = None
+) -> list[dict[str, Any]]:
+    """Highlights de résultats déjà filtrés sur la période du rapport.
+
+    Pour les appelants qui découpent eux-mêmes la fenêtre (backfill).
+    `analyzed` est le nombre de résultats comptés comme analysés
+    (par défaut `len(recent)`).
+    """
+    highlights = _extract_highlights(recent)
+    metrics.ANALYZED_RESULTS.inc(len(recent) if analyzed is None else analyzed)
+    metrics.HIGHLIGHTS.inc(len(highlights))
+    return highlights
+
+
+def _derive(r: dict[str, Any], dt: datetime) -> dict[str, Any]:
+    """Copie de `r` avec les champs calculés par l'analyse (`_dt`, `is_podium`).
+
+    Les lignes parsées ne sont jamais modifiées : elles peuvent être partagées
+    entre threads (clubs, variantes, semaines du backfill).
+    """
+    return {**r, "_dt": dt, "is_podium": _is_podium(r)}
+
+
+def _is_podium(r: dict[str, Any]) -> bool:
+    """Podium en finale : les tours préliminaires ne comptent pas."""
+    tour_lower = r["tour"].lower()
+    is_prelim = any(kw in tour_lower for kw in PRELIM_KEYWORDS)
+    return r["place"] is not None and r["place"] <= 3 and not is_prelim
+
+
 def _niveau_rank(niveau: str) -> tuple[int, str]:
     """Hiérarchie sportive : IA > IB > N > IR."""
     if niveau.startswith("IA"):
@@ -61,37 +109,26 @@ def _niveau_rank(niveau: str) -> tuple[int, str]:
 
 
 def _extract_highlights(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Logique métier pour déterminer ce qui est une 'Grosse Perf'."""
-    highlights = []
+    """Logique métier pour déterminer ce qui est une 'Grosse Perf'.
 
-    # Mots-clés pour exclure les tours préliminaires des podiums
-    exclusions = [
-        "série",
-        "serie",
-        "demi",
-        "semi",
-        "qualif",
-        "tour",
-        "1/2",
-        "1/4",
-        "1/8",
-    ]
+    `results` n'est pas modifié : une ligne déjà dérivée (`_derive`) est
+    reprise telle quelle, les autres sont copiées avec `is_podium`.
+    """
+    highlights = []
 
     for r in results:
-        tour_lower = r["tour"].lower()
-        is_prelim = any(kw in tour_lower for kw in exclusions)
-
         # Règle 1: Podium (si Finale)
-        is_podium = r["place"] is not None and r["place"] <= 3 and not is_prelim
+        is_podium = _is_podium(r)
 
         # Règle 2: Qualification
         is_qualif = r["qualif"]
 
         # Règle 3: Niveau National ou Inter
-        is_high_level = r["niveau"].startswith(("N", "IR", "IA", "IB"))
+        is_high_level = r["niveau"].startswith(HIGH_LEVELS)
 
         if is_podium or is_qualif or is_high_level:
-            r["is_podium"] = is_podium
+            if r.get("is_podium") is not is_podium:
+                r = {**r, "is_podium": is_podium}
             highlights.append(r)
 
     # Tri Highlights : Médaillés d'abord (par place), puis le reste par niveau
@@ -0,0 +1,19 @@
+import os
+import threading
+
+
+def write(path: str, data: str | bytes) -> None:
+    """Écriture atomique : fichier temporaire puis `os.replace`.
+
+    Le nom temporaire est propre au process et au thread : les workers
+    `--queue` partagent les dossiers (caches, checkpoints, empreintes), deux
+    écritures simultanées ne se marchent donc jamais dessus.
+    """
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    if isinstance(data, bytes):
+        with open(tmp, "wb") as f:
+            f.write(data)
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+    os.replace(tmp, path)
@@ -0,0 +1,160 @@
+import contextvars
+import os
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from . import analyzer, model, parsecache, reporter, scraper, tracing
+from .stringpool import StringPool
+
+if TYPE_CHECKING:
+    import requests
+
+    from .hedging import Hedger
+
+WEEK = timedelta(days=7)
+
+
+class SeasonIndex:
+    """Résultats d'une saison triés par date.
+
+    Les dates sont parsées une seule fois ; une semaine n'est ensuite qu'une
+    tranche [lundi, lundi suivant) trouvée par dichotomie, déjà dans l'ordre
+    du rapport (date, ville, nom).
+    """
+
+    def __init__(self, rows: list[dict[str, Any]], year: int) -> None:
+        # Toute date JJ/MM de la saison est lue dans l'année `year`
+        reference = datetime(year, 12, 31)
+        dated = []
+        for r in rows:
+            dt = analyzer.parse_date(r["date"], reference)
+            if dt is not None:
+                dated.append({**r, "_dt": dt})  # Copie : `rows` reste intact
+        dated.sort(key=lambda x: (x["_dt"], x["ville"], x["nom"]))
+        self.rows = dated
+        self.dates = [r["_dt"] for r in dated]
+
+    def window(self, start: datetime, end: datetime) -> list[dict[str, Any]]:
+        """Résultats datés de [start, end)."""
+        lo = bisect_left(self.dates, start)
+        return self.rows[lo : bisect_left(self.dates, end, lo)]
+
+
+def season_weeks(year: int, today: datetime) -> list[datetime]:
+    """Lundis des semaines de la saison déjà terminées à `today`.
+
+    La première semaine est celle du 1er janvier ; la dernière est celle du
+    rapport hebdomadaire de `today` (voir `model.week_start`).
+    """
+    first = datetime(year, 1, 1)
+    monday = first - timedelta(days=first.weekday())
+    last = model.week_start(today)
+    december = datetime(year, 12, 31)
+    last = min(last, december - timedelta(days=december.weekday()))
+    weeks = []
+    while monday <= last:
+        weeks.append(monday)
+        monday += WEEK
+    return weeks
+
+
+@dataclass(frozen=True)
+class Week:
+    """Rapport d'une semaine passée."""
+
+    start: datetime
+    report: model.ReportModel
+    html: str
+
+
+def render_week(index: SeasonIndex, club_name: str, start: datetime) -> Week:
+    """Rapport de la semaine du lundi `start`, tel qu'envoyé le lundi suivant."""
+    recent = index.window(start, start + WEEK)
+    highlights = analyzer.analyze_window(recent)
+    report = model.build_report_model(
+        club_name, recent, highlights, today=start + WEEK + timedelta(hours=8)
+    )
+    return Week(start, report, reporter.render_html(report))
+
+
+def build_backfill(
+    club_id: str,
+    year: int,
+    today: datetime,
+    workers: int = 4,
+    sample: str | None = None,
+    session: "requests.Session | None" = None,
+    base_url: str | None = None,
+    fetch_workers: int = 1,
+    parse_cache_dir: str | None = None,
+    hedger: "Hedger | None" = None,
+) -> list[Week]:
+    """Tous les rapports hebdomadaires de la saison `year`, en un seul crawl.
+
+    Les semaines sont des tranches de l'index : aucune n'est re-scrapée ni
+    re-parsée. Elles sont rendues par `workers` threads.
+    """
+    with tracing.span("backfill", club=club_id, year=year) as sp:
+        with tracing.span("fetch") as fsp:
+            if sample:
+                print(f"📂 Chargement du sample : {sample}")
+                pages = [scraper.Page(0, None, scraper.load_local_page(sample))]
+            else:
+                pages = scraper.fetch_all_pages(
+                    club_id,
+                    year,
+                    session=session,
+                    base_url=base_url,
+                    max_workers=fetch_workers,
+                    hedger=hedger,
+                )
+                print(f"🔄 Scraping de la saison {year} ({len(pages)} page(s))...")
+            fsp["pages"] = len(pages)
+        club_name = scraper.extract_club_name(pages[0].soup, club_id)
+
+        with tracing.span("parse") as psp:
+            pool = StringPool()
+            records = (
+                parsecache.RecordCache(parse_cache_dir) if parse_cache_dir else None
+            )
+            rows = parsecache.parse_pages(pages, pool, records)
+            index = SeasonIndex(rows, year)
+            psp["rows"] = len(index.rows)
+
+        weeks = season_weeks(year, today)
+        print(f"   -> {len(index.rows)} résultats, {len(weeks)} semaine(s).")
+        with tracing.span("render", weeks=len(weeks)):
+            if workers <= 1:
+                reports = [render_week(index, club_name, w) for w in weeks]
+            else:
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(
+                            contextvars.copy_context().run,
+                            render_week,
+                            index,
+                            club_name,
+                            w,
+                        )
+                        for w in weeks
+                    ]
+                    reports = [f.result() for f in futures]
+        sp["weeks"] = len(reports)
+        return reports
+
+
+def write_backfill(weeks: list[Week], club_id: str, out_dir: str) -> list[str]:
+    """Écrit un fichier par semaine : `<out_dir>/<club>/<lundi>.html`."""
+    folder = os.path.join(out_dir, club_id)
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for week in weeks:
+        path = os.path.join(folder, f"{week.start.date().isoformat()}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(week.html)
+        paths.append(path)
+    return paths
@@ -0,0 +1,44 @@
+import os
+import shutil
+
+from . import atomicfile
+
+
+class PageCheckpoint:
+    """Pages déjà récupérées d'un crawl, conservées sur disque.
+
+    Une page = un fichier `<root>/<club>_<saison>/<position>.html` (HTML brut,
+    écriture atomique). Si le crawl échoue, le run suivant ne récupère que les
+    positions manquantes ; le dossier est supprimé quand le crawl aboutit.
+    """
+
+    def __init__(self, root: str, club_id: str, year: int) -> None:
+        self.dir = os.path.join(root, f"{club_id}_{year}")
+
+    def _path(self, position: int) -> str:
+        return os.path.join(self.dir, f"{position}.html")
+
+    def positions(self) -> list[int]:
+        """Positions déjà enregistrées."""
+        if not os.path.isdir(self.dir):
+            return []
+        return sorted(
+            int(name[:-5])
+            for name in os.listdir(self.dir)
+            if name.endswith(".html") and name[:-5].isdigit()
+        )
+
+    def load(self, position: int) -> str | None:
+        try:
+            with open(self._path(position), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def save(self, position: int, html: str) -> None:
+        os.makedirs(self.dir, exist_ok=True)
+        path = self._path(position)
+        atomicfile.write(path, html)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
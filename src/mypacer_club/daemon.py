@@ -0,0 +1,224 @@
+import json
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import requests
+
+from . import metrics, pipeline, scraper, transport
+from .scheduler import CronSchedule
+from .variants import Variant, parse_variants
+
+# Lundi 7h si le club ne précise pas de planning
+DEFAULT_SCHEDULE = "0 7 * * 1"
+
+
+@dataclass
+class ClubJob:
+    """Un club abonné et son planning d'envoi."""
+
+    club_id: str
+    recipients: list[str]
+    schedule: CronSchedule
+    variants: list[Variant] = field(default_factory=list)
+
+
+@dataclass
+class JobStatus:
+    """État d'un club, exposé par /status."""
+
+    next_run: datetime
+    last_run: datetime | None = None
+    last_duration: float | None = None
+    last_status: str | None = None
+    last_error: str | None = None
+    runs: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "next_run": self.next_run.isoformat(),
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_duration": self.last_duration,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "runs": self.runs,
+        }
+
+
+def load_config(path: str) -> list[ClubJob]:
+    """Charge la liste des clubs (JSON).
+
+    Format : {"clubs": [{"id": "033033", "to": ["a@club.fr"],
+    "schedule": "30 7 * * 1"}]}. `to` accepte aussi "a@x.fr,b@y.fr".
+    Chaque club peut déclarer ses `groups` et `variants` (voir variants).
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    jobs = []
+    for club in data["clubs"]:
+        to = club.get("to", [])
+        if isinstance(to, str):
+            to = [t.strip() for t in to.split(",") if t.strip()]
+        jobs.append(
+            ClubJob(
+                club_id=str(club["id"]),
+                recipients=to,
+                schedule=CronSchedule.parse(club.get("schedule", DEFAULT_SCHEDULE)),
+                variants=parse_variants(club),
+            )
+        )
+    return jobs
+
+
+class Daemon:
+    """Scheduler en process : garde session HTTP et état chauds entre les runs.
+
+    Entre deux runs restent chauds la session (connexions keep-alive) et,
+    avec `parse_cache_dir`, les lignes déjà parsées des pages inchangées.
+    """
+
+    def __init__(
+        self,
+        jobs: list[ClubJob],
+        api_key: str | None,
+        resend_url: str | None = None,
+        outbox_path: str | None = None,
+        athle_url: str | None = None,
+        session: requests.Session | None = None,
+        clock: Callable[[], datetime] = datetime.now,
+        fingerprint_dir: str | None = None,
+        fetch_workers: int = 1,
+        checkpoint_dir: str | None = None,
+        parse_cache_dir: str | None = None,
+    ) -> None:
+        self.jobs = jobs
+        self.api_key = api_key
+        self.resend_url = resend_url
+        self.outbox_path = outbox_path
+        self.athle_url = athle_url
+        self.fingerprint_dir = fingerprint_dir
+        self.fetch_workers = fetch_workers
+        self.checkpoint_dir = checkpoint_dir
+        self.parse_cache_dir = parse_cache_dir
+        self.clock = clock
+        self.started_at = clock()
+        self.session = session or transport.make_session()
+        self.status = {
+            j.club_id: JobStatus(next_run=j.schedule.next_after(self.started_at))
+            for j in jobs
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run_job(self, job: ClubJob) -> None:
+        """Exécute le pipeline d'un club ; une erreur n'arrête pas le daemon.
+
+        Toute exception du run (scraping, outbox, disque...) devient le
+        statut d'erreur du club, qui est reprogrammé dans tous les cas.
+        """
+        now = self.clock()
+        start = time.perf_counter()
+        status, error = "ok", None
+        try:
+            result = pipeline.run_job(
+                job.club_id,
+                job.recipients,
+                self.api_key,
+                now,
+                outbox_path=self.outbox_path,
+                resend_url=self.resend_url,
+                session=self.session,
+                base_url=self.athle_url,
+                variants=job.variants,
+                fingerprint_dir=self.fingerprint_dir,
+                fetch_workers=self.fetch_workers,
+                checkpoint_dir=self.checkpoint_dir,
+                parse_cache_dir=self.parse_cache_dir,
+            )
+            if result and result.failed:
+                status, error = "error", f"{len(result.failed)} envoi(s) en échec"
+        except scraper.FetchError as e:
+            status, error = "error", str(e)
+        except Exception as e:  # noqa: BLE001 - le daemon sert les autres clubs
+            status, error = "error", f"{type(e).__name__}: {e}"
+            print(f"❌ Club {job.club_id} : {error}", file=sys.stderr)
+        with self._lock:
+            st = self.status[job.club_id]
+            st.last_run = now
+            st.last_duration = time.perf_counter() - start
+            st.last_status = status
+            st.last_error = error
+            st.runs += 1
+            st.next_run = job.schedule.next_after(self.clock())
+
+    def due_jobs(self, now: datetime) -> list[ClubJob]:
+        with self._lock:
+            return [j for j in self.jobs if self.status[j.club_id].next_run <= now]
+
+    def run_pending(self) -> int:
+        """Lance les clubs arrivés à échéance. Retourne le nombre de runs."""
+        due = self.due_jobs(self.clock())
+        for job in due:
+            self.run_job(job)
+        return len(due)
+
+    def seconds_until_next(self) -> float:
+        with self._lock:
+            if not self.status:
+                return 60.0
+            nxt = min(st.next_run for st in self.status.values())
+        return max(0.0, (nxt - self.clock()).total_seconds())
+
+    def serve_forever(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            # Réveil au plus tard toutes les 60 s (changement d'heure, horloge)
+            self._stop.wait(min(self.seconds_until_next(), 60.0))
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def status_payload(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(),
+                "clubs": {cid: st.to_dict() for cid, st in self.status.items()},
+            }
+
+
+def start_status_server(
+    daemon: Daemon, port: int, host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """Expose /health, /status (JSON) et /metrics en local, dans un thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def _reply(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                self._reply(200, b"ok\n", "text/plain; charset=utf-8")
+            elif self.path == "/status":
+                body = json.dumps(daemon.status_payload()).encode()
+                self._reply(200, body, "application/json")
+            elif self.path == "/metrics":
+                body = metrics.REGISTRY.render().encode()
+                self._reply(200, body, "text/plain; version=0.0.4; charset=utf-8")
+            else:
+                self._reply(404, b"not found\n", "text/plain; charset=utf-8")
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
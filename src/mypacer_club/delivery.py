@@ -0,0 +1,156 @@
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import requests
+
+try:
+    import resend
+except ImportError:
+    resend = None  # type: ignore
+
+from . import metrics, retry
+
+FROM_ADDRESS = "MyPacer Club <noreply@pioum.ovh>"
+
+# Limite de l'endpoint /emails/batch de Resend
+BATCH_SIZE = 100
+
+# Erreurs d'un envoi : réponses d'erreur de l'API (ResendError, réseau compris)
+# ou échec de requests hors du filet du SDK
+SEND_ERRORS: tuple[type[Exception], ...] = (requests.RequestException,)
+if resend:
+    SEND_ERRORS += (resend.exceptions.ResendError, resend.exceptions.NoContentError)
+
+
+@dataclass(frozen=True)
+class Message:
+    """Un email à envoyer à un destinataire unique.
+
+    `key` est une clé d'idempotence optionnelle (voir outbox).
+    """
+
+    to: str
+    subject: str
+    html: str
+    key: str | None = None
+
+
+@dataclass
+class DeliveryReport:
+    """Bilan d'un envoi groupé."""
+
+    sent: int = 0
+    delivered: list[Message] = field(default_factory=list)
+    failed: list[tuple[Message, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Messages envoyés par seconde."""
+        return self.sent / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Rate limit, erreur serveur ou erreur réseau côté client HTTP."""
+    if getattr(error, "error_type", None) == "HttpClientError":
+        return True
+    try:
+        return int(getattr(error, "code", 0)) in retry.RETRYABLE_CODES
+    except (TypeError, ValueError):
+        return False
+
+
+def batch_key(chunk: list[Message]) -> str:
+    """Clé d'idempotence d'un lot sans clés : hash de son contenu.
+
+    Identique d'un essai à l'autre : un lot accepté par Resend dont la
+    réponse s'est perdue (timeout) n'est pas renvoyé par le retry.
+    """
+    digest = hashlib.sha256()
+    for m in sorted(chunk, key=lambda m: (m.to, m.subject, m.html)):
+        digest.update(json.dumps([m.to, m.subject, m.html]).encode("utf-8"))
+    return f"batch-{digest.hexdigest()}"
+
+
+def _send_chunk(chunk: list[Message], max_retries: int, backoff: float) -> None:
+    """Envoie un lot, avec retries sur erreurs transitoires.
+
+    Un message à clé part seul sur /emails, avec sa clé comme Idempotency-Key :
+    elle ne dépend ni du découpage en lots ni de l'ordre de l'outbox, un
+    message rejoué (crash après envoi) est donc toujours dédupliqué par Resend.
+    Les messages sans clé partent ensemble sur /emails/batch, avec la clé du
+    lot (`batch_key`).
+    """
+    params: list[Any] = [
+        {"from": FROM_ADDRESS, "to": [m.to], "subject": m.subject, "html": m.html}
+        for m in chunk
+    ]
+    key = chunk[0].key if len(chunk) == 1 else None
+    for attempt in range(max_retries + 1):
+        start = time.perf_counter()
+        try:
+            if key:
+                resend.Emails.send(params[0], {"idempotency_key": key})
+            else:
+                resend.Batch.send(params, {"idempotency_key": batch_key(chunk)})
+            metrics.SEND_SECONDS.observe(time.perf_counter() - start)
+            for m in chunk:
+                metrics.EMAIL_BYTES.observe(len(m.html.encode("utf-8")))
+            return
+        except SEND_ERRORS as e:
+            metrics.SEND_SECONDS.observe(time.perf_counter() - start)
+            if attempt == max_retries or not _is_retryable(e):
+                raise
+            time.sleep(retry.delay(getattr(e, "headers", None), attempt, backoff))
+
+
+def send_messages(
+    api_key: str,
+    messages: list[Message],
+    base_url: str | None = None,
+    max_workers: int = 4,
+    max_retries: int = 3,
+    backoff: float = 0.5,
+) -> DeliveryReport:
+    """Envoie les messages par lots de BATCH_SIZE, avec concurrence bornée.
+
+    Les messages à clé d'idempotence sont envoyés un par un (voir
+    `_send_chunk`).
+
+    `base_url` permet de cibler un faux serveur Resend (tests, charge).
+    """
+    report = DeliveryReport()
+    if not resend:
+        print("❌ Module 'resend' manquant.", file=sys.stderr)
+        report.failed = [(m, "resend manquant") for m in messages]
+        return report
+
+    resend.api_key = api_key
+    if base_url:
+        resend.api_url = base_url.rstrip("/")
+
+    plain = [m for m in messages if not m.key]
+    chunks = [[m] for m in messages if m.key]
+    chunks += [plain[i : i + BATCH_SIZE] for i in range(0, len(plain), BATCH_SIZE)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            (chunk, pool.submit(_send_chunk, chunk, max_retries, backoff))
+            for chunk in chunks
+        ]
+        for chunk, future in futures:
+            try:
+                future.result()
+                report.sent += len(chunk)
+                report.delivered.extend(chunk)
+            except SEND_ERRORS as e:
+                print(f"❌ Erreur Resend: {e}", file=sys.stderr)
+                report.failed.extend((m, str(e)) for m in chunk)
+                metrics.SEND_FAILURES.inc(len(chunk))
+    report.elapsed = time.perf_counter() - start
+    return report
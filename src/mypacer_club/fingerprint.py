@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict
+from datetime import datetime
+
+from . import analyzer, atomicfile, metrics, scraper
+from .variants import Variant
+
+
+def compute(
+    pages: Iterable[scraper.Page],
+    today: datetime,
+    days: int,
+    variants: Sequence[Variant] = (),
+    recipients: Sequence[str] = (),
+) -> str:
+    """Empreinte d'un run : tout ce dont dépend le rapport envoyé.
+
+    Hash de chaque page, fenêtre d'analyse (jour du run, nombre de jours),
+    règles des highlights, version du parseur, variantes et destinataires.
+    Deux runs de même empreinte produisent les mêmes emails.
+    """
+    h = hashlib.sha256()
+    config = {
+        "window": [today.date().isoformat(), days],
+        "parser": scraper.PARSER_VERSION,
+        "rules": [analyzer.PRELIM_KEYWORDS, analyzer.HIGH_LEVELS],
+        "variants": [dict(asdict(v), athletes=sorted(v.athletes)) for v in variants],
+        "recipients": sorted(recipients),
+    }
+    h.update(json.dumps(config, sort_keys=True).encode("utf-8"))
+    for page in pages:
+        # Pages tronquées (saison précédente) : pas de HTML brut, la soup suffit
+        html = page.html if page.html is not None else str(page.soup)
+        h.update(hashlib.sha256(html.encode("utf-8")).digest())
+    return h.hexdigest()
+
+
+class FingerprintStore:
+    """Empreinte du dernier run réussi de chaque club.
+
+    Un fichier par club : `<root>/<club>.txt` (écriture atomique), ce qui
+    permet à plusieurs workers (`--queue`) de partager le même dossier.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def _path(self, club_id: str) -> str:
+        return os.path.join(self.root, f"{club_id}.txt")
+
+    def get(self, club_id: str) -> str | None:
+        try:
+            with open(self._path(club_id), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def put(self, club_id: str, fingerprint: str) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(club_id)
+        atomicfile.write(path, fingerprint)
+
+
+class RunFingerprint:
+    """Empreinte d'un run en cours, comparée au dernier run réussi.
+
+    `check` est appelé une fois les pages récupérées ; `commit` seulement
+    quand le run a abouti (envoi sans échec). Avec `force`, le run va
+    toujours jusqu'au bout, mais son empreinte est quand même enregistrée.
+    """
+
+    def __init__(
+        self,
+        store: FingerprintStore,
+        club_id: str,
+        recipients: Sequence[str] = (),
+        force: bool = False,
+    ) -> None:
+        self.store = store
+        self.club_id = club_id
+        self.recipients = recipients
+        self.force = force
+        self.value: str | None = None
+        self.result: str | None = None
+
+    def check(
+        self,
+        pages: Iterable[scraper.Page],
+        today: datetime,
+        days: int,
+        variants: Sequence[Variant] = (),
+    ) -> bool:
+        """Calcule l'empreinte. True si le run peut s'arrêter là (inchangé,
+        non forcé) ; `result` garde le verdict pour les logs."""
+        self.value = compute(pages, today, days, variants, self.recipients)
+        unchanged = self.store.get(self.club_id) == self.value
+        if not unchanged:
+            result = "changed"
+        elif self.force:
+            result = "forced"
+        else:
+            result = "unchanged"
+        self.result = result
+        metrics.RUN_FINGERPRINT.inc(result=result)
+        return result == "unchanged"
+
+    def commit(self) -> None:
+        if self.value is not None:
+            self.store.put(self.club_id, self.value)
@@ -0,0 +1,176 @@
+import contextlib
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any
+
+from . import metrics
+
+if TYPE_CHECKING:
+    import requests
+
+
+def _ok(response: Any) -> bool:
+    return 200 <= int(response.status_code) < 300
+
+
+class Hedger:
+    """Requêtes couvertes (hedging) contre la traîne de latence d'athle.fr.
+
+    Si une page n'a pas répondu après `delay` secondes (fixe, ou quantile
+    `quantile` des latences observées), une seconde requête identique part ;
+    la première réponse 2xx arrivée l'emporte, l'autre est ignorée (une
+    erreur ou un 429/5xx laisse sa chance à l'autre copie). Le surcoût est
+    plafonné : au plus `budget` (ex: 0.1 = 10 %) requêtes en plus des
+    requêtes principales.
+
+    La requête principale part sur son propre thread : elle n'attend jamais
+    derrière d'autres dans le pool des requêtes de secours, quel que soit le
+    nombre de fetchers. Seules les réponses 2xx alimentent les latences
+    observées, mesurées depuis le départ effectif de la requête.
+
+    Avec `limit` (limite de requêtes en vol du scraper), chaque copie prend
+    sa propre place : la principale l'attend, la copie de secours n'est pas
+    envoyée si aucune place n'est libre. Une copie perdante garde sa place
+    jusqu'à sa fin.
+    """
+
+    def __init__(
+        self,
+        delay: float | None = None,
+        quantile: float = 0.95,
+        budget: float = 0.1,
+        initial_delay: float = 2.0,
+        min_samples: int = 20,
+        window: int = 500,
+        max_workers: int = 16,
+    ) -> None:
+        self.delay = delay
+        self.quantile = quantile
+        self.budget = budget
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedges = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="hedge")
+
+    @classmethod
+    def from_spec(cls, spec: str, budget: float = 0.1) -> "Hedger":
+        """Seuil "p95" (quantile observé) ou délai fixe en secondes ("1.5")."""
+        try:
+            if spec.startswith("p"):
+                return cls(quantile=float(spec[1:]) / 100, budget=budget)
+            return cls(delay=float(spec), budget=budget)
+        except ValueError:
+            raise ValueError(f"Seuil de hedging invalide : {spec!r}") from None
+
+    def threshold(self) -> float:
+        """Délai avant la requête de secours."""
+        if self.delay is not None:
+            return self.delay
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        return samples[min(len(samples) - 1, int(self.quantile * len(samples)))]
+
+    def _run(self, http: Any, url: str, kwargs: dict[str, Any]) -> "requests.Response":
+        start = time.perf_counter()
+        response: requests.Response = http.get(url, **kwargs)
+        if _ok(response):
+            with self._lock:
+                self._latencies.append(time.perf_counter() - start)
+        return response
+
+    def _run_held(
+        self, slot: threading.Semaphore, http: Any, url: str, kwargs: dict[str, Any]
+    ) -> "requests.Response":
+        """Requête de secours dont la place est déjà prise : la rend à la fin."""
+        try:
+            return self._run(http, url, kwargs)
+        finally:
+            slot.release()
+
+    def _start(
+        self,
+        http: Any,
+        url: str,
+        kwargs: dict[str, Any],
+        limit: threading.Semaphore | None,
+    ) -> "Future[requests.Response]":
+        """Requête principale, sur un thread dédié (pas de file d'attente)."""
+        future: Future[requests.Response] = Future()
+
+        def run() -> None:
+            try:
+                with limit or contextlib.nullcontext():
+                    future.set_result(self._run(http, url, kwargs))
+            except BaseException as e:  # noqa: BLE001 - transmise à l'appelant
+                future.set_exception(e)
+
+        threading.Thread(target=run, daemon=True, name="hedge-primary").start()
+        return future
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def get(
+        self,
+        http: Any,
+        url: str,
+        limit: threading.Semaphore | None = None,
+        **kwargs: Any,
+    ) -> "requests.Response":
+        """Comme `http.get(url, **kwargs)`, couvert si la réponse tarde.
+
+        `limit` : place à prendre pour chaque requête réellement envoyée.
+        """
+        with self._lock:
+            self.requests += 1
+        primary = self._start(http, url, kwargs, limit)
+        done, _ = wait([primary], timeout=self.threshold())
+        if done:
+            return primary.result()
+        if limit is not None and not limit.acquire(blocking=False):
+            metrics.HEDGED_REQUESTS.inc(outcome="no_slot")
+            return primary.result()
+        if not self._take_budget():
+            if limit is not None:
+                limit.release()
+            metrics.HEDGED_REQUESTS.inc(outcome="skipped")
+            return primary.result()
+
+        if limit is not None:
+            hedge = self._pool.submit(self._run_held, limit, http, url, kwargs)
+        else:
+            hedge = self._pool.submit(self._run, http, url, kwargs)
+        pending: set[Future[requests.Response]] = {primary, hedge}
+        fallback: requests.Response | None = None
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                if f.exception() is not None:
+                    error = error or f.exception()
+                elif _ok(f.result()):
+                    metrics.HEDGED_REQUESTS.inc(outcome="won" if f is hedge else "lost")
+                    return f.result()
+                else:
+                    fallback = fallback or f.result()
+        # Aucune copie en 2xx : la réponse d'erreur (429, 5xx) est rendue
+        # telle quelle, pour que l'appelant applique ses retries
+        if fallback is not None:
+            return fallback
+        assert error is not None
+        raise error
+
+    def close(self) -> None:
+        # Les requêtes perdantes encore en vol finissent (timeout) sans attente
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,275 @@
+import contextvars
+import heapq
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from html import escape
+from typing import TYPE_CHECKING, Any
+
+from . import analyzer, model, parsecache, planner, scraper, tracing
+from .stringpool import StringPool
+
+if TYPE_CHECKING:
+    import requests
+
+    from .hedging import Hedger
+    from .meetings import MeetingCache
+
+# Fenêtre du digest (jours), comme le rapport hebdomadaire
+DIGEST_DAYS = 7
+
+
+@dataclass(frozen=True)
+class Highlight:
+    """Une grosse perf, réduite aux champs utiles au classement inter-clubs."""
+
+    club: str
+    nom: str
+    epreuve: str
+    perf: str
+    place: int | None
+    niveau: str
+    date: str
+    ville: str
+    is_podium: bool
+    field_size: int | None = None
+    winning_mark: str | None = None
+
+    def rank(self) -> tuple[Any, ...]:
+        """Même ordre que les highlights d'un club : podiums, place, niveau.
+
+        À place égale, le podium le plus disputé (plateau connu) passe devant.
+        """
+        return (
+            not self.is_podium,
+            self.place if self.is_podium else 99,
+            -(self.field_size or 0),
+            analyzer._niveau_rank(self.niveau),
+            self.club,
+            self.nom,
+        )
+
+
+@dataclass
+class ClubSummary:
+    """Résultat de l'étape map : quelques compteurs et les meilleures perfs.
+
+    Les lignes brutes du club ne sont plus référencées une fois le résumé
+    construit : seule la taille du résumé compte pour l'étape reduce.
+    """
+
+    club_id: str
+    club_name: str
+    results: int = 0
+    athletes: int = 0
+    medals: tuple[int, int, int] = (0, 0, 0)
+    highlights: list[Highlight] = field(default_factory=list)
+
+    @property
+    def nb_medals(self) -> int:
+        return sum(self.medals)
+
+
+def summarize(
+    club_id: str,
+    club_name: str,
+    recent: list[dict[str, Any]],
+    highlights: list[dict[str, Any]],
+    top: int = 20,
+) -> ClubSummary:
+    """Résumé d'un club analysé (`analyzer.process_results`)."""
+    medals = [0, 0, 0]
+    for h in highlights:
+        if h.get("is_podium") and h["place"] in (1, 2, 3):
+            medals[h["place"] - 1] += 1
+    # Highlights déjà triés par l'analyse : les `top` premiers suffisent
+    best = [
+        Highlight(
+            club_name,
+            h["nom"],
+            h["epreuve"],
+            h["perf"],
+            h["place"],
+            h["niveau"],
+            h["date"],
+            h["ville"],
+            bool(h.get("is_podium")),
+            h.get("field_size"),
+            h.get("winning_mark"),
+        )
+        for h in highlights[:top]
+    ]
+    return ClubSummary(
+        club_id,
+        club_name,
+        results=len(recent),
+        athletes=len({r["nom"] for r in recent}),
+        medals=(medals[0], medals[1], medals[2]),
+        highlights=best,
+    )
+
+
+def summarize_club(
+    club_id: str,
+    now: datetime,
+    top: int = 20,
+    session: "requests.Session | None" = None,
+    base_url: str | None = None,
+    fetch_workers: int = 1,
+    parse_cache_dir: str | None = None,
+    hedger: "Hedger | None" = None,
+    meetings: "MeetingCache | None" = None,
+    **fetch_kwargs: Any,
+) -> ClubSummary:
+    """Étape map : scraping, parsing et analyse d'un club, puis résumé.
+
+    `meetings` (partagé entre les clubs) enrichit les highlights retenus.
+    """
+    with tracing.span("club", club=club_id) as sp:
+        pages, _ = planner.fetch_window(
+            club_id,
+            now,
+            DIGEST_DAYS,
+            session=session,
+            base_url=base_url,
+            max_workers=fetch_workers,
+            hedger=hedger,
+            **fetch_kwargs,
+        )
+        club_name = scraper.extract_club_name(pages[0].soup, club_id)
+        records = parsecache.RecordCache(parse_cache_dir) if parse_cache_dir else None
+        rows = parsecache.parse_pages(pages, StringPool(), records)
+        recent, highlights = analyzer.process_results(rows, days=DIGEST_DAYS, today=now)
+        if meetings is not None:
+            # Seuls les `top` premiers remontent dans le digest
+            highlights = (
+                meetings.enrich(
+                    highlights[:top],
+                    now,
+                    max_workers=fetch_workers,
+                    session=session,
+                    base_url=base_url,
+                    hedger=hedger,
+                    **fetch_kwargs,
+                )
+                + highlights[top:]
+            )
+        summary = summarize(club_id, club_name, recent, highlights, top)
+        sp["recent"] = summary.results
+        return summary
+
+
+@dataclass
+class Leaderboard:
+    """Classements inter-clubs (étape reduce)."""
+
+    highlights: list[Highlight]
+    medal_table: list[ClubSummary]
+    most_active: list[ClubSummary]
+    clubs: int
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def merge(summaries: Iterable[ClubSummary], top: int = 20) -> Leaderboard:
+    """Fusionne les résumés en classements.
+
+    Meilleures perfs : ordre des highlights (podiums, place, niveau).
+    Médailles : or, puis argent, puis bronze. Activité : nombre de résultats,
+    puis d'athlètes.
+    """
+    clubs = list(summaries)
+    best = heapq.nsmallest(
+        top, (h for c in clubs for h in c.highlights), key=Highlight.rank
+    )
+    medal_table = sorted(
+        (c for c in clubs if c.nb_medals),
+        key=lambda c: (tuple(-m for m in c.medals), c.club_name),
+    )
+    most_active = sorted(
+        (c for c in clubs if c.results),
+        key=lambda c: (-c.results, -c.athletes, c.club_name),
+    )
+    return Leaderboard(best, medal_table[:top], most_active[:top], len(clubs))
+
+
+def build_leaderboard(
+    club_ids: list[str],
+    now: datetime,
+    workers: int = 8,
+    top: int = 20,
+    **summary_kwargs: Any,
+) -> Leaderboard:
+    """Map (un club par tâche, `workers` en parallèle) puis reduce.
+
+    Un club en échec est écarté du classement et listé dans `failed`.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    summaries: list[ClubSummary] = []
+    failed: dict[str, str] = {}
+    with tracing.span("leaderboard", clubs=len(club_ids)) as sp:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            summarize_one = partial(summarize_club, now=now, top=top, **summary_kwargs)
+            futures = {
+                executor.submit(
+                    contextvars.copy_context().run, summarize_one, club_id
+                ): club_id
+                for club_id in club_ids
+            }
+            for future in as_completed(futures):
+                club_id = futures[future]
+                try:
+                    summary = future.result()
+                except scraper.FetchError as e:
+                    failed[club_id] = str(e)
+                    print(f"   ❌ {club_id} : {failed[club_id]}")
+                    continue
+                summaries.append(summary)
+                print(
+                    f"   -> {club_id} {summary.club_name} : {summary.results} "
+                    f"résultat(s), {summary.nb_medals} médaille(s)"
+                )
+        board = merge(summaries, top)
+        board.failed = failed
+        sp["failed"] = len(failed)
+    return board
+
+
+def render_html(board: Leaderboard, title: str, today: datetime) -> str:
+    """Digest HTML : meilleures perfs, médailles par club, clubs actifs."""
+    perfs = "".join(
+        f"<tr><td>{i}</td><td>{escape(h.nom)}<br><small>{escape(h.club)}</small></td>"
+        f"<td>{escape(h.epreuve)}</td><td><b>{escape(h.perf)}</b></td>"
+        f"<td>{h.place or ''}{f'/{h.field_size}' if h.field_size else ''}</td>"
+        f"<td>{escape(h.niveau)}</td>"
+        f"<td>{escape(h.date)} {escape(h.ville)}</td></tr>"
+        for i, h in enumerate(board.highlights, 1)
+    )
+    medals = "".join(
+        f"<tr><td>{escape(c.club_name)}</td><td>{c.medals[0]}</td>"
+        f"<td>{c.medals[1]}</td><td>{c.medals[2]}</td></tr>"
+        for c in board.medal_table
+    )
+    active = "".join(
+        f"<tr><td>{escape(c.club_name)}</td><td>{c.results}</td>"
+        f"<td>{c.athletes}</td></tr>"
+        for c in board.most_active
+    )
+    table = 'width="100%" cellpadding="6" cellspacing="0" style="font-size: 14px;"'
+    return f"""<!DOCTYPE html>
+<html lang="fr">
+<head><meta charset="utf-8"><title>{escape(title)}</title></head>
+<body style="font-family: sans-serif; color: #1e293b; max-width: 700px; margin: auto;">
+<h1 style="color: #1e40af;">{escape(title)}</h1>
+<p>Semaine du {model.week_start(today).strftime("%d/%m/%Y")} · {board.clubs} club(s)</p>
+<h2>🔥 Meilleures performances</h2>
+<table {table}><tr><th>#</th><th>Athlète</th><th>Épreuve</th><th>Perf</th>
+<th>Place</th><th>Niveau</th><th>Compétition</th></tr>{perfs}</table>
+<h2>🥇 Médailles par club</h2>
+<table {table}><tr><th>Club</th><th>Or</th><th>Argent</th><th>Bronze</th></tr>{medals}</table>
+<h2>🏃 Clubs les plus actifs</h2>
+<table {table}><tr><th>Club</th><th>Résultats</th><th>Athlètes</th></tr>{active}</table>
+</body>
+</html>
+"""
@@ -1,77 +1,716 @@
 import argparse
 import os
+import sys
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING
 
-try:
-    from dotenv import load_dotenv
+from . import metrics, tracing
 
-    load_dotenv()
-except ImportError:
-    pass
+# Le reste (pipeline, requests, bs4, resend, sqlite3...) est importé selon le
+# mode, une fois les arguments lus : démarrage rapide pour les runs cron
+if TYPE_CHECKING:
+    import requests
 
-from . import scraper, analyzer, reporter
+    from .hedging import Hedger
+    from .meetings import MeetingCache
+
+
+def _find_dotenv() -> str | None:
+    """Cherche un .env en remontant depuis le dossier courant, puis le package."""
+    for start in (os.getcwd(), os.path.dirname(os.path.abspath(__file__))):
+        folder = start
+        while True:
+            path = os.path.join(folder, ".env")
+            if os.path.isfile(path):
+                return path
+            parent = os.path.dirname(folder)
+            if parent == folder:
+                break
+            folder = parent
+    return None
+
+
+def _load_dotenv() -> None:
+    """Charge le .env s'il existe ; python-dotenv n'est importé que dans ce cas."""
+    path = _find_dotenv()
+    if not path:
+        return
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv(path)
+
+
+def _run_daemon(
+    args: argparse.Namespace, api_key: str | None, session: "requests.Session"
+) -> None:
+    """Mode daemon : planning cron par club, état chaud entre les runs."""
+    from . import daemon
+
+    jobs = daemon.load_config(args.config)
+    d = daemon.Daemon(
+        jobs,
+        api_key,
+        resend_url=args.resend_url,
+        outbox_path=args.outbox,
+        athle_url=args.athle_url,
+        session=session,
+        fingerprint_dir=args.fingerprint_dir,
+        fetch_workers=args.fetch_workers,
+        checkpoint_dir=args.checkpoint_dir,
+        parse_cache_dir=args.parse_cache,
+    )
+    server = daemon.start_status_server(d, args.status_port)
+    print(f"🕒 Daemon démarré : {len(jobs)} club(s).")
+    print(f"   -> Status : http://127.0.0.1:{server.server_address[1]}/status")
+    print(f"   -> Métriques : http://127.0.0.1:{server.server_address[1]}/metrics")
+    for job in jobs:
+        print(f"   -> {job.club_id} : {job.schedule.expr}")
+    try:
+        d.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Arrêt du daemon.")
+    finally:
+        d.stop()
+        server.shutdown()
+
+
+def _run_queue(
+    args: argparse.Namespace,
+    api_key: str | None,
+    session: "requests.Session",
+    hedger: "Hedger | None",
+    meetings: "MeetingCache | None" = None,
+) -> None:
+    """Mode worker : les clubs de --config sont répartis en shards entre
+    tous les workers qui partagent le dossier --queue."""
+    from . import daemon, model, pipeline, workqueue
+
+    now = datetime.now()
+    batch = args.batch or model.week_start(now).date().isoformat()
+    queue = workqueue.WorkQueue(
+        args.queue,
+        daemon.load_config(args.config),
+        batch,
+        shards=args.shards,
+        worker_id=args.worker_id,
+        lease_ttl=args.lease_ttl,
+    )
+
+    def process(job: daemon.ClubJob) -> str | None:
+        result = pipeline.run_job(
+            job.club_id,
+            job.recipients,
+            api_key,
+            now,
+            outbox_path=args.outbox,
+            resend_url=args.resend_url,
+            fingerprint_dir=args.fingerprint_dir,
+            force=args.force,
+            session=session,
+            base_url=args.athle_url,
+            fetch_workers=args.fetch_workers,
+            checkpoint_dir=args.checkpoint_dir,
+            parse_cache_dir=args.parse_cache,
+            hedger=hedger,
+            meetings=meetings,
+            variants=job.variants,
+        )
+        if result and result.failed:
+            return f"{len(result.failed)} envoi(s) en échec"
+        return None
+
+    print(f"🧩 Worker {queue.worker_id} : batch {batch}, {args.shards} shard(s).")
+    report = queue.run(process)
+    print(
+        f"✅ Shards traités : {len(report.shards)}, "
+        f"clubs OK : {len(report.processed)}, en échec : {len(report.failed)}"
+    )
+    for club_id, error in report.failed.items():
+        print(f"   ❌ {club_id} : {error}", file=sys.stderr)
+    if report.failed:
+        sys.exit(1)
+
+
+def _run_serve(
+    args: argparse.Namespace,
+    session: "requests.Session",
+    hedger: "Hedger | None",
+    meetings: "MeetingCache | None" = None,
+) -> None:
+    """Mode service : rapports servis à la demande, en cache mémoire."""
+    from . import service
+
+    build = service.pipeline_builder(
+        session,
+        base_url=args.athle_url,
+        fetch_workers=args.fetch_workers,
+        checkpoint_dir=args.checkpoint_dir,
+        parse_cache_dir=args.parse_cache,
+        hedger=hedger,
+        meetings=meetings,
+    )
+    reports = service.ReportService(
+        build, ttl=args.cache_ttl, max_entries=args.cache_size
+    )
+    server = service.make_server(reports, args.serve, args.serve_host)
+    port = server.server_address[1]
+    print(f"🌐 Service démarré : http://{args.serve_host}:{port}/clubs/<id>/report")
+    print(f"   -> Cache : {args.cache_size} rapport(s), {args.cache_ttl:g} s")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Arrêt du service.")
+    finally:
+        server.server_close()
+
+
+def _run_backfill(
+    args: argparse.Namespace,
+    session: "requests.Session | None",
+    hedger: "Hedger | None" = None,
+) -> None:
+    """Tous les rapports hebdomadaires d'une saison, en previews locales."""
+    from . import backfill
+
+    now = datetime.now()
+    weeks = backfill.build_backfill(
+        args.club,
+        args.season or now.year,
+        now,
+        workers=args.render_workers,
+        sample=args.sample,
+        session=session,
+        base_url=args.athle_url,
+        fetch_workers=args.fetch_workers,
+        parse_cache_dir=args.parse_cache,
+        hedger=hedger,
+    )
+    paths = backfill.write_backfill(weeks, args.club, args.backfill_dir)
+    folder = os.path.abspath(os.path.join(args.backfill_dir, args.club))
+    print(f"✅ {len(paths)} rapport(s) hebdomadaire(s) générés : {folder}")
+
+
+def _run_leaderboard(
+    args: argparse.Namespace,
+    api_key: str | None,
+    recipients: list[str],
+    session: "requests.Session",
+    hedger: "Hedger | None",
+    meetings: "MeetingCache | None" = None,
+) -> None:
+    """Digest inter-clubs des clubs de --config : map par club, puis reduce."""
+    from . import daemon, leaderboard
+
+    now = datetime.now()
+    club_ids = [job.club_id for job in daemon.load_config(args.config)]
+    print(f"🏆 Digest de {len(club_ids)} club(s) ({args.club_workers} en parallèle)...")
+    board = leaderboard.build_leaderboard(
+        club_ids,
+        now,
+        workers=args.club_workers,
+        top=args.top,
+        session=session,
+        base_url=args.athle_url,
+        fetch_workers=args.fetch_workers,
+        parse_cache_dir=args.parse_cache,
+        hedger=hedger,
+        meetings=meetings,
+    )
+    html = leaderboard.render_html(board, args.title, now)
+    if api_key and recipients:
+        from . import delivery, pipeline
+
+        subject = f"{args.title} - {now.strftime('%d/%m')}"
+        messages = [delivery.Message(t, subject, html) for t in recipients]
+        print(f"📧 Envoi à {', '.join(recipients)}...")
+        result = delivery.send_messages(api_key, messages, base_url=args.resend_url)
+        pipeline.print_delivery(result)
+        if result.failed:
+            sys.exit(1)
+    else:
+        with open(args.leaderboard_out, "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"✅ Digest généré : {os.path.abspath(args.leaderboard_out)}")
+    if board.failed:
+        sys.exit(1)
+
+
+def _run_all(
+    args: argparse.Namespace,
+    api_key: str | None,
+    session: "requests.Session",
+    hedger: "Hedger | None",
+    meetings: "MeetingCache | None" = None,
+) -> None:
+    """Un run de chaque club de --config, --club-workers clubs à la fois."""
+    from . import daemon, pipeline
+
+    jobs = daemon.load_config(args.config)
+    print(f"🚀 Run de {len(jobs)} club(s) ({args.club_workers} en parallèle)...")
+    failed = pipeline.run_clubs(
+        jobs,
+        api_key,
+        datetime.now(),
+        workers=args.club_workers,
+        outbox_path=args.outbox,
+        resend_url=args.resend_url,
+        fingerprint_dir=args.fingerprint_dir,
+        force=args.force,
+        session=session,
+        base_url=args.athle_url,
+        fetch_workers=args.fetch_workers,
+        checkpoint_dir=args.checkpoint_dir,
+        parse_cache_dir=args.parse_cache,
+        hedger=hedger,
+        meetings=meetings,
+    )
+    print(f"✅ Clubs OK : {len(jobs) - len(failed)}, en échec : {len(failed)}")
+    for club_id, error in failed.items():
+        print(f"   ❌ {club_id} : {error}", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+def _run(
+    args: argparse.Namespace,
+    api_key: str | None,
+    recipients: list[str],
+    hedger: "Hedger | None" = None,
+) -> None:
+    """Dispatch entre mode daemon, outbox et run direct."""
+    if args.sample:
+        # Pas de réseau côté athle.fr : ni session ni requests
+        if args.backfill:
+            _run_backfill(args, None)
+        else:
+            _run_once(args, api_key, recipients, None)
+        return
+
+    from . import scraper, transport
+    from .scraper import FetchError
+
+    scraper.limit_requests(args.max_in_flight)
+
+    if args.parse_cache:
+        from .parsecache import RecordCache
+
+        pruned = RecordCache(args.parse_cache).prune()
+        if pruned:
+            print(f"🧹 Cache de parsing : {pruned} entrée(s) expirée(s) supprimée(s).")
+    mode = "record" if args.record else "replay" if args.replay else "live"
+    session = transport.make_session(mode, args.record or args.replay, args.replay_pace)
+    meetings = None
+    if args.enrich_experimental:
+        from .meetings import MeetingCache
+
+        meetings = MeetingCache()
+    try:
+        if args.daemon:
+            _run_daemon(args, api_key, session)
+        elif args.queue:
+            _run_queue(args, api_key, session, hedger, meetings)
+        elif args.serve is not None:
+            _run_serve(args, session, hedger, meetings)
+        elif args.backfill:
+            _run_backfill(args, session, hedger)
+        elif args.leaderboard:
+            _run_leaderboard(args, api_key, recipients, session, hedger, meetings)
+        elif args.all_clubs:
+            _run_all(args, api_key, session, hedger, meetings)
+        else:
+            _run_once(args, api_key, recipients, session, hedger, meetings)
+    except FetchError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        session.close()
+        if hedger:
+            hedger.close()
+
+
+def _run_once(
+    args: argparse.Namespace,
+    api_key: str | None,
+    recipients: list[str],
+    session: "requests.Session | None",
+    hedger: "Hedger | None" = None,
+    meetings: "MeetingCache | None" = None,
+) -> None:
+    """Un run complet (ou une étape de l'outbox) pour un club."""
+    from . import pipeline
+
+    # Une seule horloge pour tout le run (analyse, semaine, sujet) ; un replay
+    # reprend celle de l'enregistrement pour reproduire le même rapport
+    now = datetime.now()
+    if args.replay and not args.sample:
+        from . import transport
+
+        now = transport.recorded_at(args.replay) or now
+    variants = []
+    if args.variants:
+        import json
+
+        from .variants import parse_variants
+
+        with open(args.variants, encoding="utf-8") as f:
+            variants = parse_variants(json.load(f))
+    try:
+        if args.outbox:
+            result = pipeline.run_outbox(
+                args.outbox,
+                args.stage,
+                args.club,
+                recipients,
+                api_key,
+                now,
+                resend_url=args.resend_url,
+                sample=args.sample,
+                save_sample=args.save_sample,
+                base_url=args.athle_url,
+                fetch_workers=args.fetch_workers,
+                checkpoint_dir=args.checkpoint_dir,
+                parse_cache_dir=args.parse_cache,
+                hedger=hedger,
+                meetings=meetings,
+                variants=variants,
+                session=session,
+            )
+        else:
+            result = pipeline.run_club(
+                args.club,
+                recipients,
+                api_key,
+                now,
+                resend_url=args.resend_url,
+                fingerprint_dir=args.fingerprint_dir,
+                force=args.force,
+                sample=args.sample,
+                save_sample=args.save_sample,
+                base_url=args.athle_url,
+                fetch_workers=args.fetch_workers,
+                checkpoint_dir=args.checkpoint_dir,
+                parse_cache_dir=args.parse_cache,
+                hedger=hedger,
+                meetings=meetings,
+                variants=variants,
+                session=session,
+            )
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    if result and result.failed:
+        sys.exit(1)
 
 
 def main() -> None:
+    # Avant le parser : les valeurs par défaut lisent l'environnement
+    _load_dotenv()
     parser = argparse.ArgumentParser(description="MyPacer Club Watcher")
-    parser.add_argument("--club", required=True, help="ID Club (ex: 033033)")
-    parser.add_argument("--to", help="Email destinataire")
+    parser.add_argument("--club", help="ID Club (ex: 033033)")
+    parser.add_argument(
+        "--to", help="Email(s) destinataire(s), séparés par des virgules"
+    )
     parser.add_argument("--sample", help="Fichier HTML local (skip le scraping)")
     parser.add_argument(
         "--save-sample", help="Sauvegarde le HTML brut scrapé dans ce fichier"
     )
+    parser.add_argument(
+        "--resend-url",
+        default=os.getenv("RESEND_API_URL"),
+        help="URL de base de l'API Resend (ex: faux serveur local)",
+    )
+    parser.add_argument(
+        "--athle-url",
+        default=os.getenv("ATHLE_BASE_URL"),
+        help="URL de liste.aspx (ex: faux serveur local, voir standin)",
+    )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=1,
+        help="Pages athle.fr récupérées en parallèle",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=os.getenv("MYPACER_MAX_IN_FLIGHT", "4"),
+        help="Requêtes athle.fr simultanées au plus, tous threads confondus "
+        "(clubs, pages, compétitions ; défaut 4)",
+    )
+    parser.add_argument(
+        "--variants",
+        help="Fichier JSON des variantes du rapport (groupes, catégories)",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=os.getenv("MYPACER_CHECKPOINT_DIR"),
+        help="Garde chaque page récupérée : un crawl interrompu reprend où il "
+        "s'est arrêté",
+    )
+    parser.add_argument(
+        "--parse-cache",
+        default=os.getenv("MYPACER_PARSE_CACHE"),
+        help="Cache des lignes parsées par page : une page inchangée n'est "
+        "pas reparsée",
+    )
+    parser.add_argument(
+        "--fingerprint-dir",
+        default=os.getenv("MYPACER_FINGERPRINT_DIR"),
+        help="Empreinte du dernier envoi réussi par club : un run sur des pages "
+        "inchangées s'arrête après le scraping (sans --outbox)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Avec --fingerprint-dir : analyse et envoi même si rien n'a changé",
+    )
+    parser.add_argument(
+        "--hedge",
+        metavar="SEUIL",
+        help='Double une requête athle.fr sans réponse après SEUIL : "p95" '
+        '(latence observée) ou secondes ("1.5")',
+    )
+    parser.add_argument(
+        "--hedge-budget",
+        type=float,
+        default=0.1,
+        help="Part maximale de requêtes en plus (défaut 0.1 = 10 %%)",
+    )
+    parser.add_argument(
+        "--enrich-experimental",
+        action="store_true",
+        help="Expérimental : enrichit les highlights de leur page compétition "
+        "(participants, vainqueur), via un filtre date/ville non confirmé sur "
+        "athle.fr ; une liste par compétition, partagée entre clubs",
+    )
+    capture = parser.add_mutually_exclusive_group()
+    capture.add_argument(
+        "--record", help="Enregistre chaque échange HTTP athle.fr (JSON lines)"
+    )
+    capture.add_argument(
+        "--replay", help="Rejoue un enregistrement au lieu d'appeler athle.fr"
+    )
+    parser.add_argument(
+        "--replay-pace",
+        choices=["fast", "original"],
+        default="fast",
+        help="Avec --replay : au plus vite, ou au rythme enregistré",
+    )
+    parser.add_argument(
+        "--outbox", help="Base SQLite de l'outbox (envois idempotents, reprise)"
+    )
+    parser.add_argument(
+        "--stage",
+        choices=["all", "render", "send"],
+        default="all",
+        help="Avec --outbox : rendre, envoyer, ou les deux",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Mode daemon : planning cron par club (nécessite --config)",
+    )
+    parser.add_argument(
+        "--config",
+        help="Fichier JSON des clubs (daemon, --queue, --leaderboard, --all-clubs)",
+    )
+    parser.add_argument(
+        "--status-port",
+        type=int,
+        default=8787,
+        help="Port local de /health et /status (mode daemon)",
+    )
+    parser.add_argument(
+        "--queue",
+        help="Dossier partagé des workers : clubs de --config répartis en shards",
+    )
+    parser.add_argument(
+        "--shards", type=int, default=16, help="Nombre de shards (mode --queue)"
+    )
+    parser.add_argument(
+        "--lease-ttl",
+        type=float,
+        default=300.0,
+        help="Durée (s) d'un bail de shard sans renouvellement (mode --queue)",
+    )
+    parser.add_argument("--worker-id", help="Identifiant du worker (défaut : hôte-pid)")
+    parser.add_argument(
+        "--batch", help="Lot de travail partagé (défaut : lundi de la semaine)"
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        metavar="PORT",
+        help="Mode service : /clubs/<id>/report et /clubs/<id>/results",
+    )
+    parser.add_argument(
+        "--serve-host", default="127.0.0.1", help="Adresse d'écoute (mode --serve)"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=600.0,
+        help="Durée (s) de vie d'un rapport en cache (mode --serve)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=128,
+        help="Nombre de rapports gardés en mémoire (mode --serve)",
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Génère tous les rapports hebdomadaires de la saison (previews)",
+    )
+    parser.add_argument(
+        "--season", type=int, help="Saison du backfill (défaut : année en cours)"
+    )
+    parser.add_argument(
+        "--backfill-dir", default="backfill", help="Dossier des rapports du backfill"
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=4,
+        help="Semaines rendues en parallèle (mode --backfill)",
+    )
+    parser.add_argument(
+        "--leaderboard",
+        action="store_true",
+        help="Digest inter-clubs des clubs de --config (perfs, médailles, activité)",
+    )
+    parser.add_argument(
+        "--leaderboard-out",
+        default="leaderboard.html",
+        help="Fichier du digest quand il n'est pas envoyé",
+    )
+    parser.add_argument(
+        "--title", default="Digest des clubs", help="Titre du digest inter-clubs"
+    )
+    parser.add_argument(
+        "--top", type=int, default=20, help="Lignes par classement du digest"
+    )
+    parser.add_argument(
+        "--all-clubs",
+        action="store_true",
+        help="Un run de chaque club de --config, sur des threads",
+    )
+    parser.add_argument(
+        "--club-workers",
+        type=int,
+        default=8,
+        help="Clubs traités en parallèle (--leaderboard, --all-clubs)",
+    )
+    parser.add_argument(
+        "--trace-out", help="Écrit les spans de chaque étape (JSON lines)"
+    )
+    parser.add_argument(
+        "--metrics-out", help="Écrit les métriques en fin de run (format Prometheus)"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cpu", "mem", "all"],
+        help="Profile chaque étape (cProfile et/ou tracemalloc)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default="profiles",
+        help="Dossier des profils (.pstats, .mem.txt)",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=15,
+        help="Nombre de fonctions chaudes affichées par étape",
+    )
     args = parser.parse_args()
+    if args.daemon and not args.config:
+        parser.error("--daemon nécessite --config")
+    if args.queue and not args.config:
+        parser.error("--queue nécessite --config")
+    modes = [
+        args.daemon,
+        bool(args.queue),
+        args.serve is not None,
+        args.backfill,
+        args.leaderboard,
+        args.all_clubs,
+    ]
+    if sum(modes) > 1:
+        parser.error(
+            "--daemon, --queue, --serve, --backfill, --leaderboard et --all-clubs "
+            "sont incompatibles"
+        )
+    if args.sample and (
+        args.daemon
+        or args.queue
+        or args.serve is not None
+        or args.leaderboard
+        or args.all_clubs
+    ):
+        parser.error(
+            "--sample ne s'utilise qu'avec un club (run direct ou --backfill), "
+            "pas avec --daemon, --queue, --serve, --leaderboard ou --all-clubs"
+        )
+    if args.leaderboard and not args.config:
+        parser.error("--leaderboard nécessite --config")
+    if args.all_clubs and not args.config:
+        parser.error("--all-clubs nécessite --config")
+    if args.enrich_experimental and (args.sample or args.daemon or args.backfill):
+        parser.error(
+            "--enrich-experimental est incompatible avec --sample, --daemon et "
+            "--backfill"
+        )
+    if args.max_in_flight < 1:
+        parser.error("--max-in-flight doit être au moins 1")
+    if args.hedge and args.daemon:
+        parser.error("--hedge n'est pas pris en charge en mode --daemon")
+    if args.hedge and args.replay:
+        parser.error("--hedge et --replay sont incompatibles (réponses rejouées)")
+    if (
+        not args.daemon
+        and not args.queue
+        and args.serve is None
+        and not args.leaderboard
+        and not args.all_clubs
+        and not args.club
+        and not (args.outbox and args.stage == "send")
+    ):
+        parser.error("--club est requis")
+    hedger = None
+    if args.hedge:
+        from .hedging import Hedger
+
+        try:
+            hedger = Hedger.from_spec(args.hedge, budget=args.hedge_budget)
+        except ValueError as e:
+            parser.error(str(e))
 
     # Config
     api_key = os.getenv("RESEND_API_KEY")
     to_email = args.to or os.getenv("RESEND_TO_EMAIL")
+    recipients = [t.strip() for t in (to_email or "").split(",") if t.strip()]
 
-    # 1. Scraping
-    if args.sample:
-        print(f"📂 Chargement du sample : {args.sample}")
-        soup = scraper.load_local_page(args.sample)
-        soups = [soup]
-    else:
-        year = datetime.now().year
-        soups, raw_html = scraper.fetch_all_club_pages(args.club, year)
-        print(f"🔄 Scraping du club {args.club} ({len(soups)} page(s))...")
-
-        if args.save_sample:
-            with open(args.save_sample, "w", encoding="utf-8") as f:
-                f.write(raw_html)
-            print(f"💾 Sample sauvegardé : {args.save_sample}")
-
-    club_name = scraper.extract_club_name(soups[0], args.club)
-
-    raw_data: list[dict[str, Any]] = []
-    for s in soups:
-        raw_data.extend(scraper.parse_raw_results(s))
-    print(f"   -> {len(raw_data)} résultats bruts trouvés.")
-
-    # 2. Analyse
-    recent, highlights = analyzer.process_results(raw_data, days=7)
-    print(f"   -> {len(recent)} résultats récents (7j).")
-    print(f"   -> {len(highlights)} highlights qualifiés.")
-
-    # 3. Reporting
-    html_content = reporter.format_html_report(club_name, recent, highlights)
-
-    if api_key and to_email:
-        # Mode Production
-        subject = f"Résultats {club_name} - {datetime.now().strftime('%d/%m')}"
-        reporter.send_email(api_key, to_email, subject, html_content)
-    else:
-        # Mode Développement
-        filename = f"preview_{args.club}.html"
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-        print("-" * 50)
-        print("ℹ️  MODE DEV (Pas d'email envoyé)")
-        print(f"✅ Preview générée : {os.path.abspath(filename)}")
-        print("💡 Pour envoyer un mail, configurez le .env ou utilisez --to")
-        print("-" * 50)
+    if args.trace_out:
+        tracing.enable(args.trace_out)
+    profiler = None
+    if args.profile:
+        from . import profiling
+
+        profiler = profiling.enable(args.profile, args.profile_dir, args.profile_top)
+    try:
+        _run(args, api_key, recipients, hedger)
+    finally:
+        tracing.disable()
+        if args.metrics_out:
+            metrics.REGISTRY.write_textfile(args.metrics_out)
+        if profiler:
+            profiler.print_report()
+            print(f"📊 Profils écrits : {', '.join(profiler.write())}")
+            profiling.disable()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+import contextvars
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlencode
+
+from bs4 import BeautifulSoup
+
+from . import analyzer, metrics, scraper, tracing
+from .singleflight import SingleFlightCache
+
+if TYPE_CHECKING:
+    import requests
+
+# Résultats d'une compétition, tous clubs confondus (même base que liste.aspx).
+# Expérimental : les lignes athle.fr ne portent pas d'identifiant de
+# compétition, et le filtre par date et ville (frmdate, frmville) n'est pas
+# confirmé sur athle.fr (seul le stand-in le sert). Une liste qui contient
+# d'autres compétitions, ou trop longue pour en être une, n'enrichit rien.
+MEETING_QUERY = "?frmbase=resultats&frmmode=1&frmespace=0&"
+
+# Pages suivies au plus par compétition : une liste plus longue est le signe
+# d'un filtre ignoré (toute la saison), pas d'une compétition
+MAX_MEETING_PAGES = 10
+
+# Clé d'une compétition : (saison, date JJ/MM, ville), comme model.Meeting
+MeetingKey = tuple[int, str, str]
+
+
+def meeting_url(key: MeetingKey, base_url: str | None = None) -> str:
+    year, date, ville = key
+    query = urlencode({"frmsaison": year, "frmdate": date, "frmville": ville})
+    return (base_url or scraper.ATHLE_URL) + MEETING_QUERY + query
+
+
+@dataclass(frozen=True)
+class EventField:
+    """Une épreuve (épreuve, tour) d'une compétition : participants et vainqueur."""
+
+    size: int
+    winning_mark: str | None
+
+
+def parse_meeting(
+    soups: list[BeautifulSoup], key: MeetingKey
+) -> dict[tuple[str, str], EventField] | None:
+    """Participants et perf du 1er de chaque (épreuve, tour) de la compétition.
+
+    `soups` contient toutes les pages de la liste : une épreuve peut être
+    coupée par la pagination. None si une ligne n'est pas de la compétition
+    `key` (date ou ville différente) : la liste n'est alors pas filtrée et
+    ses comptes seraient faux.
+    """
+    _, date, ville = key
+    rows = [r for soup in soups for r in scraper.parse_raw_results(soup)]
+    if any(r["date"] != date or r["ville"] != ville for r in rows):
+        return None
+    events: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for r in rows:
+        events.setdefault((r["epreuve"], r["tour"]), []).append(r)
+    return {
+        key: EventField(
+            len(results),
+            next((r["perf"] for r in results if r["place"] == 1), None),
+        )
+        for key, results in events.items()
+    }
+
+
+class MeetingCache:
+    """Pages compétition déjà récupérées, partagées entre athlètes et clubs.
+
+    Une compétition n'est demandée qu'une fois par période de `ttl` secondes,
+    même quand plusieurs clubs (threads du digest, daemon) l'enrichissent en
+    même temps. Un échec n'est gardé que `error_ttl` secondes : les clubs
+    d'un même run ne le retentent pas, le run suivant si. Une liste rejetée
+    (autres compétitions, plus de MAX_MEETING_PAGES pages) est gardée vide
+    pour `ttl` : elle ne changera pas d'ici là.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 6 * 3600.0,
+        max_entries: int = 2048,
+        error_ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        # None : compétition indisponible
+        self._cache: SingleFlightCache[dict[tuple[str, str], EventField] | None] = (
+            SingleFlightCache(
+                ttl,
+                max_entries,
+                clock,
+                ttl_for=lambda events: ttl if events is not None else error_ttl,
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(
+        self,
+        key: MeetingKey,
+        session: "requests.Session | None" = None,
+        base_url: str | None = None,
+        **fetch_kwargs: Any,
+    ) -> dict[tuple[str, str], EventField]:
+        def fetch() -> dict[tuple[str, str], EventField] | None:
+            year, date, ville = key
+            with tracing.span("fetch_meeting", year=year, date=date, ville=ville) as sp:
+                try:
+                    pages = scraper.fetch_listing(
+                        meeting_url(key, base_url),
+                        session,
+                        max_pages=MAX_MEETING_PAGES,
+                        **fetch_kwargs,
+                    )
+                except scraper.ListingTooLong as e:
+                    print(f"   ⚠️  Compétition {date} {ville} ignorée : {e}")
+                    return {}
+                except scraper.FetchError as e:
+                    print(f"   ⚠️  Compétition {date} {ville} indisponible : {e}")
+                    return None
+                sp["pages"] = len(pages)
+            events = parse_meeting([p.soup for p in pages], key)
+            if events is None:
+                print(
+                    f"   ⚠️  Compétition {date} {ville} ignorée : la liste contient "
+                    "d'autres compétitions"
+                )
+                return {}
+            return events
+
+        events, origin = self._cache.get("|".join(map(str, key)), fetch)
+        metrics.MEETING_CACHE.inc(result=origin)
+        return events or {}
+
+    def enrich(
+        self,
+        highlights: list[dict[str, Any]],
+        today: datetime,
+        max_workers: int = 1,
+        **fetch_kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        """Highlights avec `field_size` et `winning_mark`, dans le même ordre.
+
+        Une liste par compétition distincte (au plus), pas par highlight.
+        `max_workers` compétitions sont demandées à la fois, sous la limite
+        globale de requêtes du scraper (`scraper.limit_requests`). Les
+        highlights enrichis sont des copies : `highlights` n'est pas modifié.
+        """
+        keyed: list[tuple[dict[str, Any], MeetingKey | None]] = []
+        for h in highlights:
+            dt = analyzer.parse_date(h["date"], today)
+            keyed.append((h, (dt.year, h["date"], h["ville"]) if dt else None))
+
+        keys = list(dict.fromkeys(k for _, k in keyed if k is not None))
+        if max_workers <= 1 or len(keys) <= 1:
+            fields = [self.get(k, **fetch_kwargs) for k in keys]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            from functools import partial
+
+            get = partial(self.get, **fetch_kwargs)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(contextvars.copy_context().run, get, k) for k in keys
+                ]
+                fields = [f.result() for f in futures]
+
+        events_of = dict(zip(keys, fields))
+        enriched = []
+        for h, key in keyed:
+            events = events_of[key] if key is not None else {}
+            event = events.get((h["epreuve"], h["tour"]))
+            if event is not None:
+                h = {**h, "field_size": event.size, "winning_mark": event.winning_mark}
+            enriched.append(h)
+        return enriched
@@ -0,0 +1,255 @@
+import abc
+import math
+import threading
+from collections.abc import Sequence
+
+from . import atomicfile
+
+# Bornes par défaut (secondes) : athle.fr répond entre ~0.2 s et le timeout 40 s
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0)
+# Parsing d'une page : de l'ordre de la milliseconde
+CPU_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# Taille des emails (octets), autour de la limite Gmail ~102 Ko
+BYTES_BUCKETS = (10_000, 25_000, 50_000, 75_000, 100_000, 150_000)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} attend les labels {self.labelnames}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+    @abc.abstractmethod
+    def samples(self) -> list[str]:
+        """Lignes d'exposition Prometheus, hors HELP/TYPE."""
+
+    @abc.abstractmethod
+    def reset(self) -> None:
+        """Remet les valeurs à zéro (tests, nouveau run)."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, doc, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Par jeu de labels : [compteurs par bucket..., somme]
+        self._values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.setdefault(key, [0.0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+            data[-1] += value
+
+    def count(self, **labels: str) -> int:
+        data = self._values.get(self._key(labels))
+        return int(data[-2]) if data else 0
+
+    def samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        for key, data in items:
+            for bound, n in zip(self.buckets, data):
+                le = f'le="{_fmt(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_labels(self.labelnames, key, le)} {_fmt(n)}"
+                )
+            labels = _labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_fmt(data[-1])}")
+            lines.append(f"{self.name}_count{labels} {_fmt(data[-2])}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Format texte Prometheus (exposition 0.0.4)."""
+        lines: list[str] = []
+        for m in self._metrics:
+            lines.extend(m.header())
+            lines.extend(m.samples())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Écriture atomique, compatible textfile collector de node_exporter."""
+        atomicfile.write(path, self.render())
+
+    def reset(self) -> None:
+        for m in self._metrics:
+            m.reset()
+
+
+REGISTRY = Registry()
+
+
+def _register[M: _Metric](metric: M) -> M:
+    REGISTRY.register(metric)
+    return metric
+
+
+# --- Catalogue des métriques du pipeline ---
+
+PAGES_FETCHED = _register(
+    Counter("mypacer_pages_fetched_total", "Pages athle.fr récupérées.", ["club"])
+)
+PAGES_RESUMED = _register(
+    Counter(
+        "mypacer_pages_resumed_total",
+        "Pages reprises d'un checkpoint au lieu d'être récupérées.",
+        ["club"],
+    )
+)
+HTTP_RESPONSES = _register(
+    Counter("mypacer_http_responses_total", "Réponses athle.fr par code.", ["code"])
+)
+HEDGED_REQUESTS = _register(
+    Counter(
+        "mypacer_hedged_requests_total",
+        "Requêtes de secours : gagnantes, perdantes ou refusées (budget, place).",
+        ["outcome"],
+    )
+)
+FETCH_SECONDS = _register(
+    Histogram("mypacer_fetch_seconds", "Latence d'une page athle.fr.")
+)
+PARSED_ROWS = _register(
+    Counter("mypacer_parsed_rows_total", "Lignes de résultats parsées.")
+)
+PARSE_CACHE = _register(
+    Counter(
+        "mypacer_parse_cache_total",
+        "Pages servies par le cache de parsing (hit) ou parsées (miss).",
+        ["result"],
+    )
+)
+REPORT_CACHE = _register(
+    Counter(
+        "mypacer_report_cache_total",
+        "Rapports servis (mode --serve) : en cache, construits ou partagés.",
+        ["result"],
+    )
+)
+RUN_FINGERPRINT = _register(
+    Counter(
+        "mypacer_run_fingerprint_total",
+        "Runs comparés au dernier run réussi : inchangés, modifiés ou forcés.",
+        ["result"],
+    )
+)
+MEETING_CACHE = _register(
+    Counter(
+        "mypacer_meeting_cache_total",
+        "Pages compétition : en cache, récupérées ou partagées entre clubs.",
+        ["result"],
+    )
+)
+PARSE_SECONDS = _register(
+    Histogram(
+        "mypacer_parse_seconds", "Durée du parsing d'une page.", buckets=CPU_BUCKETS
+    )
+)
+ANALYZED_RESULTS = _register(
+    Counter("mypacer_analyzed_results_total", "Résultats passés à l'analyse.")
+)
+HIGHLIGHTS = _register(
+    Counter("mypacer_highlights_total", "Highlights détectés (tous clubs).")
+)
+CLUB_HIGHLIGHTS = _register(
+    Gauge("mypacer_club_highlights", "Highlights du dernier rapport.", ["club"])
+)
+EMAIL_BYTES = _register(
+    Histogram(
+        "mypacer_email_bytes", "Taille des emails envoyés.", buckets=BYTES_BUCKETS
+    )
+)
+SEND_SECONDS = _register(
+    Histogram("mypacer_send_seconds", "Latence d'un appel d'envoi Resend.")
+)
+SEND_FAILURES = _register(
+    Counter("mypacer_send_failures_total", "Emails non envoyés après retries.")
+)
@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+
+def week_start(today: datetime | None = None) -> datetime:
+    """Lundi de la semaine couverte par le rapport (semaine précédente)."""
+    # --- LOGIQUE ROBUSTE DE DATE ---
+    # On veut afficher le "Lundi" de la semaine précédente,
+    # peu importe si on lance le script le Lundi, Mardi ou Mercredi.
+    today = today or datetime.now()
+
+    # today.weekday() : Lundi=0, Mardi=1 ... Dimanche=6
+    # Si on est Lundi (0) : On recule de 0 + 7 = 7 jours (Lundi dernier)
+    # Si on est Mardi (1) : On recule de 1 + 7 = 8 jours (Lundi dernier)
+    days_to_subtract = today.weekday() + 7
+    start = today - timedelta(days=days_to_subtract)
+    return start.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def is_high_level(niveau: str) -> bool:
+    """Perf de niveau Inter ou National (compteur du dashboard)."""
+    return niveau.startswith(("N", "I"))
+
+
+@dataclass
+class Meeting:
+    """Une compétition (date + ville) et les résultats du club."""
+
+    date: str
+    ville: str
+    results: list[dict[str, Any]] = field(default_factory=list)
+    athletes: set[str] = field(default_factory=set)
+
+
+@dataclass
+class ReportModel:
+    """Contenu d'un rapport, indépendant du format de sortie.
+
+    Construit une seule fois par `build_report_model` ; les renderers
+    (HTML, texte, JSON...) ne font que le lire.
+    """
+
+    club_name: str
+    generated_at: datetime
+    week_start: datetime
+    recent: list[dict[str, Any]]
+    highlights: list[dict[str, Any]]
+    nb_athletes: int
+    nb_high: int
+    meetings: list[Meeting]
+    by_athlete: dict[str, list[dict[str, Any]]]
+
+    @property
+    def week_label(self) -> str:
+        return self.week_start.strftime("%d/%m")
+
+    @property
+    def nb_highlights(self) -> int:
+        return len(self.highlights)
+
+    @property
+    def preheader(self) -> str:
+        return (
+            f"{self.nb_athletes} athlètes · {self.nb_highlights} highlights"
+            f" · {self.club_name}"
+        )
+
+
+def build_report_model(
+    club_name: str,
+    recent: list[dict[str, Any]],
+    highlights: list[dict[str, Any]],
+    today: datetime | None = None,
+) -> ReportModel:
+    """Calcule stats et regroupements en un seul passage sur `recent`."""
+    today = today or datetime.now()
+    meetings: dict[tuple[str, str], Meeting] = {}
+    by_athlete: dict[str, list[dict[str, Any]]] = {}
+    nb_high = 0
+
+    for r in recent:
+        by_athlete.setdefault(r["nom"], []).append(r)
+        key = (r["date"], r["ville"])
+        meeting = meetings.get(key)
+        if meeting is None:
+            meeting = meetings[key] = Meeting(r["date"], r["ville"])
+        meeting.results.append(r)
+        meeting.athletes.add(r["nom"])
+        if is_high_level(r["niveau"]):
+            nb_high += 1
+
+    return ReportModel(
+        club_name=club_name,
+        generated_at=today,
+        week_start=week_start(today),
+        recent=recent,
+        highlights=highlights,
+        nb_athletes=len(by_athlete),
+        nb_high=nb_high,
+        meetings=list(meetings.values()),
+        by_athlete=by_athlete,
+    )
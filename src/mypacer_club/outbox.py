@@ -0,0 +1,151 @@
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+
+from . import delivery
+
+# Au-delà, le message est abandonné (statut "dead") et n'est plus retenté.
+MAX_ATTEMPTS = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    key TEXT PRIMARY KEY,
+    club_id TEXT NOT NULL,
+    week TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    html TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    sent_at TEXT
+)
+"""
+
+
+def make_key(club_id: str, week: str, recipient: str) -> str:
+    """Clé d'idempotence : un seul email par club, semaine et destinataire."""
+    return f"{club_id}:{week}:{recipient.strip().lower()}"
+
+
+@dataclass(frozen=True)
+class OutboxEntry:
+    key: str
+    club_id: str
+    week: str
+    recipient: str
+    subject: str
+    html: str
+    status: str
+    attempts: int
+    last_error: str | None
+
+
+class Outbox:
+    """File d'envoi persistante (SQLite) entre le rendu et l'envoi.
+
+    Le rendu enfile un message par destinataire ; `drain` les envoie et
+    marque chaque clé comme envoyée. Relancer le script ne renvoie rien
+    de ce qui est déjà parti.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(_SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def has(self, key: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM outbox WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def enqueue(
+        self, club_id: str, week: str, recipient: str, subject: str, html: str
+    ) -> bool:
+        """Ajoute un message. Retourne False si la clé existe déjà."""
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO outbox"
+            " (key, club_id, week, recipient, subject, html, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                make_key(club_id, week, recipient),
+                club_id,
+                week,
+                recipient.strip(),
+                subject,
+                html,
+                datetime.now().isoformat(timespec="seconds"),
+            ),
+        )
+        self.conn.commit()
+        return cur.rowcount == 1
+
+    def pending(self, limit: int | None = None) -> list[OutboxEntry]:
+        query = "SELECT * FROM outbox WHERE status = 'pending' ORDER BY created_at"
+        params: tuple[int, ...] = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        return [_entry(row) for row in self.conn.execute(query, params)]
+
+    def get(self, key: str) -> OutboxEntry | None:
+        row = self.conn.execute("SELECT * FROM outbox WHERE key = ?", (key,)).fetchone()
+        return _entry(row) if row else None
+
+    def mark_sent(self, keys: list[str]) -> None:
+        now = datetime.now().isoformat(timespec="seconds")
+        self.conn.executemany(
+            "UPDATE outbox SET status = 'sent', sent_at = ?, attempts = attempts + 1"
+            " WHERE key = ?",
+            [(now, k) for k in keys],
+        )
+        self.conn.commit()
+
+    def mark_failed(
+        self, failures: list[tuple[str, str]], max_attempts: int = MAX_ATTEMPTS
+    ) -> None:
+        self.conn.executemany(
+            "UPDATE outbox SET attempts = attempts + 1, last_error = ?,"
+            " status = CASE WHEN attempts + 1 >= ? THEN 'dead' ELSE 'pending' END"
+            " WHERE key = ?",
+            [(err, max_attempts, k) for k, err in failures],
+        )
+        self.conn.commit()
+
+    def drain(
+        self,
+        api_key: str,
+        base_url: str | None = None,
+        max_attempts: int = MAX_ATTEMPTS,
+        limit: int | None = None,
+    ) -> delivery.DeliveryReport:
+        """Envoie les messages en attente et enregistre le résultat de chacun."""
+        messages = [
+            delivery.Message(e.recipient, e.subject, e.html, key=e.key)
+            for e in self.pending(limit)
+        ]
+        report = delivery.send_messages(api_key, messages, base_url=base_url)
+        self.mark_sent([m.key for m in report.delivered if m.key])
+        self.mark_failed(
+            [(m.key, err) for m, err in report.failed if m.key], max_attempts
+        )
+        return report
+
+
+def _entry(row: sqlite3.Row) -> OutboxEntry:
+    return OutboxEntry(
+        key=row["key"],
+        club_id=row["club_id"],
+        week=row["week"],
+        recipient=row["recipient"],
+        subject=row["subject"],
+        html=row["html"],
+        status=row["status"],
+        attempts=row["attempts"],
+        last_error=row["last_error"],
+    )
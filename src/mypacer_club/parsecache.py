@@ -0,0 +1,112 @@
+import hashlib
+import marshal
+import os
+import re
+import shutil
+import time
+import zlib
+from typing import Any
+
+from . import atomicfile, metrics, scraper
+from .stringpool import StringPool
+
+
+class RecordCache:
+    """Lignes parsées des pages déjà vues, indexées par hash du HTML.
+
+    Une page inchangée d'un run à l'autre (toutes sauf les plus récentes
+    d'une saison) ne coûte alors ni soup ni parsing. Une entrée par page :
+    `<root>/v<version>/<hash[:2]>/<hash>.bin`, colonnes + lignes en tuples
+    (marshal, compressé zlib). Les entrées d'une autre version du parseur
+    (dossiers `v<n>` seulement) sont supprimées à l'ouverture.
+    """
+
+    def __init__(self, root: str, version: int = scraper.PARSER_VERSION) -> None:
+        self.root = root
+        self.dir = os.path.join(root, f"v{version}")
+        self.hits = 0
+        if os.path.isdir(root):
+            for name in os.listdir(root):
+                if re.fullmatch(r"v\d+", name) and name != f"v{version}":
+                    shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+    @staticmethod
+    def key(html: str) -> str:
+        return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.dir, key[:2], f"{key}.bin")
+
+    def get(
+        self, key: str, pool: StringPool | None = None
+    ) -> list[dict[str, Any]] | None:
+        """Lignes de la page `key`, None si absente ou illisible."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                fields, rows = marshal.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (ValueError, EOFError, TypeError, zlib.error):
+            return None  # Entrée tronquée ou corrompue : reparsée puis réécrite
+        # Date d'accès pour prune() (atime n'est pas fiable)
+        os.utime(path)
+        intern = pool.intern if pool is not None else str
+        return [
+            {f: intern(v) if type(v) is str else v for f, v in zip(fields, row)}
+            for row in rows
+        ]
+
+    def put(self, key: str, rows: list[dict[str, Any]]) -> None:
+        fields = tuple(rows[0]) if rows else ()
+        data = zlib.compress(
+            marshal.dumps((fields, [tuple(r[f] for f in fields) for r in rows]))
+        )
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomicfile.write(path, data)
+
+    def parse(
+        self, page: scraper.Page, pool: StringPool | None = None
+    ) -> list[dict[str, Any]]:
+        """Lignes de `page` : depuis le cache, sinon parsées puis mises en cache."""
+        if page.html is None:
+            return scraper.parse_raw_results(page.soup, pool)
+        key = self.key(page.html)
+        rows = self.get(key, pool)
+        if rows is not None:
+            metrics.PARSE_CACHE.inc(result="hit")
+            self.hits += 1
+            return rows
+        metrics.PARSE_CACHE.inc(result="miss")
+        rows = scraper.parse_raw_results(page.soup, pool)
+        self.put(key, rows)
+        return rows
+
+    def prune(self, max_age_days: float = 60) -> int:
+        """Supprime les entrées inutilisées depuis `max_age_days`. Retourne leur nombre."""
+        limit = time.time() - max_age_days * 86400
+        removed = 0
+        for parent, _, files in os.walk(self.dir):
+            for name in files:
+                path = os.path.join(parent, name)
+                try:
+                    if os.path.getmtime(path) < limit:
+                        os.remove(path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+
+def parse_pages(
+    pages: list[scraper.Page], pool: StringPool, cache: RecordCache | None = None
+) -> list[dict[str, Any]]:
+    """Lignes de toutes les pages, via `cache` s'il est fourni."""
+    rows: list[dict[str, Any]] = []
+    for page in pages:
+        if cache is not None:
+            rows.extend(cache.parse(page, pool))
+        else:
+            rows.extend(scraper.parse_raw_results(page.soup, pool))
+    return rows
@@ -0,0 +1,408 @@
+import contextvars
+import os
+import sys
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from . import (
+    analyzer,
+    checkpoint,
+    fingerprint,
+    metrics,
+    model,
+    parsecache,
+    planner,
+    profiling,
+    reporter,
+    scraper,
+    tracing,
+)
+from .stringpool import StringPool
+from .variants import ResultIndex, Variant
+
+# Envoi (resend, requests) et outbox (sqlite3) sont importés à la demande :
+# une preview --sample n'en a pas besoin
+if TYPE_CHECKING:
+    import requests
+
+    from . import delivery
+    from .daemon import ClubJob
+    from .hedging import Hedger
+    from .meetings import MeetingCache
+
+
+# Fenêtre d'analyse du rapport hebdomadaire (jours)
+REPORT_DAYS = 7
+
+
+@contextmanager
+def _stage(name: str, **attrs: Any) -> Iterator[dict[str, Any]]:
+    """Étape du pipeline : span de trace + profil (si activés)."""
+    with tracing.span(name, **attrs) as sp, profiling.stage(name):
+        yield sp
+
+
+@dataclass(frozen=True)
+class Rendered:
+    """Un document rendu : rapport complet (`variant` None) ou variante."""
+
+    variant: Variant | None
+    report: model.ReportModel
+    html: str
+
+    def club_key(self, club_id: str) -> str:
+        """Club (ou club/variante) pour les clés d'outbox et les previews."""
+        return club_id if self.variant is None else f"{club_id}/{self.variant.slug}"
+
+    def recipients(self, default: list[str]) -> list[str]:
+        return default if self.variant is None else list(self.variant.recipients)
+
+
+def build_report(
+    club_id: str, now: datetime, **build_kwargs: Any
+) -> tuple[model.ReportModel, str]:
+    """Scraping, analyse et rendu. Retourne (modèle, html)."""
+    rendered = build_reports(club_id, now, **build_kwargs)[0]
+    return rendered.report, rendered.html
+
+
+def build_reports(
+    club_id: str,
+    now: datetime,
+    variants: Sequence[Variant] = (),
+    sample: str | None = None,
+    save_sample: str | None = None,
+    session: "requests.Session | None" = None,
+    base_url: str | None = None,
+    fetch_workers: int = 1,
+    checkpoint_dir: str | None = None,
+    parse_cache_dir: str | None = None,
+    hedger: "Hedger | None" = None,
+    run_fingerprint: fingerprint.RunFingerprint | None = None,
+    meetings: "MeetingCache | None" = None,
+) -> list[Rendered]:
+    """Scraping, analyse et rendu du rapport complet, puis de chaque variante.
+
+    Les variantes ne coûtent qu'une sélection dans l'index des résultats et
+    un rendu (cartes partagées avec le rapport complet).
+    `base_url` cible un autre serveur qu'athle.fr (ex: standin local).
+    `checkpoint_dir` garde les pages récupérées pour reprendre un crawl
+    interrompu ; `parse_cache_dir` les lignes déjà parsées des pages
+    inchangées. `hedger` double les requêtes athle.fr qui tardent.
+    Avec `run_fingerprint`, des pages identiques au dernier run réussi
+    arrêtent le run après le scraping : la liste retournée est alors vide.
+    Avec `meetings`, les highlights sont enrichis de leur page compétition
+    (participants, perf du vainqueur), partagée entre clubs.
+    """
+    with tracing.span("club", club=club_id):
+        # 1. Scraping
+        with _stage("fetch") as sp:
+            if sample:
+                print(f"📂 Chargement du sample : {sample}")
+                pages = [scraper.Page(0, None, scraper.load_local_page(sample))]
+            else:
+                year = now.year
+                # Début janvier : fin de la saison précédente incluse
+                pages, raw_html = planner.fetch_window(
+                    club_id,
+                    now,
+                    REPORT_DAYS,
+                    session=session,
+                    base_url=base_url,
+                    max_workers=fetch_workers,
+                    hedger=hedger,
+                    checkpoint=(
+                        checkpoint.PageCheckpoint(checkpoint_dir, club_id, year)
+                        if checkpoint_dir
+                        else None
+                    ),
+                )
+                print(f"🔄 Scraping du club {club_id} ({len(pages)} page(s))...")
+
+                if save_sample:
+                    with open(save_sample, "w", encoding="utf-8") as f:
+                        f.write(raw_html)
+                    print(f"💾 Sample sauvegardé : {save_sample}")
+            sp["pages"] = len(pages)
+
+        if run_fingerprint is not None:
+            with _stage("fingerprint") as sp:
+                unchanged = run_fingerprint.check(pages, now, REPORT_DAYS, variants)
+                sp["result"] = run_fingerprint.result
+            short = (run_fingerprint.value or "")[:12]
+            if unchanged:
+                print(
+                    f"⏭️  Pages inchangées depuis le dernier envoi ({short}), run ignoré."
+                )
+                return []
+            print(f"   -> Empreinte {short} ({run_fingerprint.result}).")
+
+        club_name = scraper.extract_club_name(pages[0].soup, club_id)
+
+        with _stage("parse") as sp:
+            pool = StringPool()
+            records = (
+                parsecache.RecordCache(parse_cache_dir) if parse_cache_dir else None
+            )
+            raw_data = parsecache.parse_pages(pages, pool, records)
+            if records is not None:
+                sp["cache_hits"] = records.hits
+            sp["rows"] = len(raw_data)
+            sp["distinct_strings"] = len(pool)
+        print(f"   -> {len(raw_data)} résultats bruts trouvés.")
+
+        # 2. Analyse
+        with _stage("analyze", rows=len(raw_data)) as sp:
+            recent, highlights = analyzer.process_results(
+                raw_data, days=REPORT_DAYS, today=now
+            )
+            sp["recent"] = len(recent)
+            sp["highlights"] = len(highlights)
+        metrics.CLUB_HIGHLIGHTS.set(len(highlights), club=club_id)
+        print(f"   -> {len(recent)} résultats récents ({REPORT_DAYS}j).")
+        print(f"   -> {len(highlights)} highlights qualifiés.")
+
+        if meetings is not None and highlights and not sample:
+            with _stage("enrich", highlights=len(highlights)) as sp:
+                highlights = meetings.enrich(
+                    highlights,
+                    now,
+                    max_workers=fetch_workers,
+                    session=session,
+                    base_url=base_url,
+                    hedger=hedger,
+                )
+                sp["enriched"] = sum("field_size" in h for h in highlights)
+            print(f"   -> {sp['enriched']} highlight(s) enrichi(s) (compétitions).")
+
+        # 3. Reporting
+        with _stage("render", variants=len(variants)) as sp:
+            report = model.build_report_model(club_name, recent, highlights, today=now)
+            cache: reporter.CardCache = {}
+            rendered = [
+                Rendered(None, report, reporter.render_html(report, cache=cache))
+            ]
+            if variants:
+                index = ResultIndex(recent, highlights)
+                for v in variants:
+                    vmodel = index.model(club_name, v, today=now)
+                    vhtml = reporter.render_html(vmodel, cache=cache)
+                    rendered.append(Rendered(v, vmodel, vhtml))
+            sp["bytes"] = sum(len(r.html.encode("utf-8")) for r in rendered)
+        if variants:
+            print(f"   -> {len(variants)} variante(s) rendue(s).")
+        return rendered
+
+
+def subject(report: model.ReportModel) -> str:
+    return f"Résultats {report.club_name} - {report.generated_at.strftime('%d/%m')}"
+
+
+def print_delivery(report: "delivery.DeliveryReport") -> None:
+    print(f"✅ {report.sent} envoyé(s) ({report.rate:.1f} msg/s).")
+    if report.failed:
+        print(f"❌ {len(report.failed)} échec(s).", file=sys.stderr)
+
+
+def run_outbox(
+    outbox_path: str,
+    stage: str,
+    club_id: str | None,
+    recipients: list[str],
+    api_key: str | None,
+    now: datetime,
+    resend_url: str | None = None,
+    variants: Sequence[Variant] = (),
+    **build_kwargs: Any,
+) -> "delivery.DeliveryReport | None":
+    """Mode outbox : rendu et envoi découplés, idempotents par destinataire."""
+    from . import outbox
+
+    box = outbox.Outbox(outbox_path)
+    try:
+        has_recipients = recipients or any(v.recipients for v in variants)
+        if stage in ("all", "render") and club_id and has_recipients:
+            week = model.week_start(now).date().isoformat()
+            keys = [outbox.make_key(club_id, week, t) for t in recipients]
+            keys += [
+                outbox.make_key(f"{club_id}/{v.slug}", week, t)
+                for v in variants
+                for t in v.recipients
+            ]
+            if all(box.has(k) for k in keys):
+                print(f"⏭️  Rapport {club_id} ({week}) déjà en file, rendu ignoré.")
+            else:
+                docs = build_reports(club_id, now, variants, **build_kwargs)
+                added = sum(
+                    box.enqueue(
+                        doc.club_key(club_id), week, t, subject(doc.report), doc.html
+                    )
+                    for doc in docs
+                    for t in doc.recipients(recipients)
+                )
+                print(f"📥 {added} message(s) ajouté(s) à l'outbox.")
+
+        if stage in ("all", "send"):
+            if not api_key:
+                raise RuntimeError("RESEND_API_KEY manquante.")
+            print(f"📧 Envoi des messages en attente ({outbox_path})...")
+            with _stage("send", club=club_id, outbox=True) as sp:
+                result = box.drain(api_key, base_url=resend_url)
+                sp["sent"] = result.sent
+                sp["failed"] = len(result.failed)
+            print_delivery(result)
+            return result
+        return None
+    finally:
+        box.close()
+
+
+def run_club(
+    club_id: str,
+    recipients: list[str],
+    api_key: str | None,
+    now: datetime,
+    resend_url: str | None = None,
+    variants: Sequence[Variant] = (),
+    fingerprint_dir: str | None = None,
+    force: bool = False,
+    **build_kwargs: Any,
+) -> "delivery.DeliveryReport | None":
+    """Pipeline complet d'un club : envoi si configuré, sinon preview locale.
+
+    Avec `fingerprint_dir` (et un envoi configuré), un run dont l'empreinte
+    est celle du dernier envoi réussi s'arrête après le scraping, sauf si
+    `force`.
+    """
+    run_fp = None
+    if fingerprint_dir and api_key:
+        run_fp = fingerprint.RunFingerprint(
+            fingerprint.FingerprintStore(fingerprint_dir), club_id, recipients, force
+        )
+    docs = build_reports(club_id, now, variants, run_fingerprint=run_fp, **build_kwargs)
+    if not docs:
+        return None
+
+    if api_key and any(doc.recipients(recipients) for doc in docs):
+        from . import delivery
+
+        # Mode Production
+        messages = [
+            delivery.Message(t, subject(doc.report), doc.html)
+            for doc in docs
+            for t in doc.recipients(recipients)
+        ]
+        print(f"📧 Envoi à {', '.join(m.to for m in messages)}...")
+        with _stage("send", club=club_id, messages=len(messages)) as sp:
+            result = delivery.send_messages(api_key, messages, base_url=resend_url)
+            sp["sent"] = result.sent
+            sp["failed"] = len(result.failed)
+            sp["bytes"] = sum(len(m.html.encode("utf-8")) for m in messages)
+        print_delivery(result)
+        if run_fp is not None and not result.failed:
+            run_fp.commit()
+        return result
+
+    # Mode Développement
+    print("-" * 50)
+    print("ℹ️  MODE DEV (Pas d'email envoyé)")
+    for doc in docs:
+        filename = f"preview_{doc.club_key(club_id).replace('/', '_')}.html"
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(doc.html)
+        print(f"✅ Preview générée : {os.path.abspath(filename)}")
+    print("💡 Pour envoyer un mail, configurez le .env ou utilisez --to")
+    print("-" * 50)
+    return None
+
+
+def run_job(
+    club_id: str,
+    recipients: list[str],
+    api_key: str | None,
+    now: datetime,
+    outbox_path: str | None = None,
+    resend_url: str | None = None,
+    fingerprint_dir: str | None = None,
+    force: bool = False,
+    **build_kwargs: Any,
+) -> "delivery.DeliveryReport | None":
+    """Un club en mode batch (daemon, workers) : outbox si configurée, sinon direct.
+
+    L'outbox étant déjà idempotente par semaine, l'empreinte ne sert qu'au
+    run direct.
+    """
+    if outbox_path:
+        return run_outbox(
+            outbox_path,
+            "all",
+            club_id,
+            recipients,
+            api_key,
+            now,
+            resend_url=resend_url,
+            **build_kwargs,
+        )
+    return run_club(
+        club_id,
+        recipients,
+        api_key,
+        now,
+        resend_url=resend_url,
+        fingerprint_dir=fingerprint_dir,
+        force=force,
+        **build_kwargs,
+    )
+
+
+def run_clubs(
+    jobs: Sequence["ClubJob"],
+    api_key: str | None,
+    now: datetime,
+    workers: int = 4,
+    **job_kwargs: Any,
+) -> dict[str, str]:
+    """Un run de chaque club, `workers` clubs à la fois sur des threads.
+
+    Les clubs partagent session, caches et hedger ; les lignes parsées ne
+    sont plus modifiées après le parsing, ce qui rend les threads utiles sur
+    un Python sans GIL. Une exception d'un club le marque en échec sans
+    arrêter les autres. Retourne les clubs en échec (id -> erreur).
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    def run(job: "ClubJob") -> "delivery.DeliveryReport | None":
+        return run_job(
+            job.club_id,
+            job.recipients,
+            api_key,
+            now,
+            variants=job.variants,
+            **job_kwargs,
+        )
+
+    failed: dict[str, str] = {}
+    with tracing.span("clubs", clubs=len(jobs), workers=workers) as sp:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(contextvars.copy_context().run, run, job): job.club_id
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                club_id = futures[future]
+                try:
+                    result = future.result()
+                except scraper.FetchError as e:
+                    failed[club_id] = str(e)
+                    continue
+                except Exception as e:  # noqa: BLE001 - échec du club, pas du lot
+                    failed[club_id] = f"{type(e).__name__}: {e}"
+                    print(f"❌ Club {club_id} : {failed[club_id]}", file=sys.stderr)
+                    continue
+                if result and result.failed:
+                    failed[club_id] = f"{len(result.failed)} envoi(s) en échec"
+        sp["failed"] = len(failed)
+    return failed
@@ -0,0 +1,179 @@
+import contextvars
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from bs4 import BeautifulSoup, Tag
+
+from . import scraper, tracing
+
+if TYPE_CHECKING:
+    import requests
+
+    from .checkpoint import PageCheckpoint
+
+
+@dataclass(frozen=True)
+class SeasonPlan:
+    """Une saison à récupérer.
+
+    `since` à None : toutes les pages. Sinon, seules les premières pages
+    (résultats les plus récents en tête) jusqu'à dépasser `since`.
+    """
+
+    year: int
+    since: datetime | None = None
+
+
+def plan_seasons(today: datetime, days: int) -> list[SeasonPlan]:
+    """Saisons couvrant la fenêtre d'analyse [today - days, today].
+
+    athle.fr range les résultats par année civile (`frmsaison`) : début
+    janvier, la fin de la saison précédente est aussi dans la fenêtre.
+    """
+    start = (today - timedelta(days=days)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    plans = [SeasonPlan(today.year)]
+    for year in range(today.year - 1, start.year - 1, -1):
+        plans.append(SeasonPlan(year, since=start))
+    return plans
+
+
+def _row_date(text: str, year: int) -> datetime | None:
+    match = re.match(r"^(\d{1,2})/(\d{1,2})$", text.strip())
+    if not match:
+        return None
+    try:
+        return datetime(year, int(match.group(2)), int(match.group(1)))
+    except ValueError:
+        return None
+
+
+def _trim_before(soup: BeautifulSoup, year: int, since: datetime) -> datetime | None:
+    """Retire de la page les résultats antérieurs à `since`.
+
+    Les dates JJ/MM n'ont pas d'année : ramenées dans le flux de la saison en
+    cours, celles d'avant octobre seraient lues par l'analyse comme des dates
+    de l'année en cours. Retourne la date la plus ancienne de la page.
+    """
+    table = soup.find("table", id="ctnResultats")
+    if not isinstance(table, Tag):
+        return None
+    oldest = None
+    for row in table.find_all("tr"):
+        cells = row.find_all("td")
+        if len(cells) < 9:
+            continue
+        dt = _row_date(cells[7].get_text(strip=True), year)
+        if dt is None:
+            continue
+        oldest = dt if oldest is None or dt < oldest else oldest
+        if dt < since:
+            row.decompose()
+    return oldest
+
+
+def fetch_season_since(
+    club_id: str,
+    year: int,
+    since: datetime,
+    session: "requests.Session | None" = None,
+    base_url: str | None = None,
+    **fetch_kwargs: Any,
+) -> list[BeautifulSoup]:
+    """Résultats d'une saison postérieurs à `since`, sur ses premières pages.
+
+    Les pages se suivent du plus récent au plus ancien : on s'arrête dès
+    qu'une page contient un résultat plus ancien que `since`.
+    """
+    soups: list[BeautifulSoup] = []
+    position, total = 0, 1
+    while position < total:
+        soup, _ = scraper.fetch_club_page(
+            club_id, year, position, session, base_url, **fetch_kwargs
+        )
+        soups.append(soup)
+        if position == 0:
+            total = scraper._get_total_pages(soup)
+        oldest = _trim_before(soup, year, since)
+        if oldest is None or oldest < since:
+            break
+        position += 1
+    return soups
+
+
+def _fetch_plan(
+    plan: SeasonPlan,
+    club_id: str,
+    session: "requests.Session | None",
+    base_url: str | None,
+    max_workers: int,
+    checkpoint: "PageCheckpoint | None",
+    fetch_kwargs: dict[str, Any],
+) -> tuple[list[scraper.Page], str | None]:
+    with tracing.span("season", year=plan.year, partial=plan.since is not None) as sp:
+        if plan.since is None:
+            pages = scraper.fetch_all_pages(
+                club_id,
+                plan.year,
+                session=session,
+                base_url=base_url,
+                max_workers=max_workers,
+                checkpoint=checkpoint,
+                **fetch_kwargs,
+            )
+            sp["pages"] = len(pages)
+            return pages, pages[0].html
+        soups = fetch_season_since(
+            club_id, plan.year, plan.since, session, base_url, **fetch_kwargs
+        )
+        sp["pages"] = len(soups)
+        # Pages tronquées : leur soup ne correspond plus au HTML reçu
+        return [scraper.Page(i, None, soup) for i, soup in enumerate(soups)], None
+
+
+def fetch_window(
+    club_id: str,
+    today: datetime,
+    days: int,
+    session: "requests.Session | None" = None,
+    base_url: str | None = None,
+    max_workers: int = 1,
+    checkpoint: "PageCheckpoint | None" = None,
+    **fetch_kwargs: Any,
+) -> tuple[list[scraper.Page], str]:
+    """Pages de toutes les saisons utiles à la fenêtre d'analyse.
+
+    Retourne (pages, html_page1) : la
+    saison en cours d'abord, puis les précédentes, en un seul flux. Plusieurs
+    saisons sont récupérées en parallèle. `checkpoint` ne concerne que la
+    saison en cours (les autres se limitent à quelques pages).
+    """
+    plans = plan_seasons(today, days)
+    fetch = partial(
+        _fetch_plan,
+        club_id=club_id,
+        session=session,
+        base_url=base_url,
+        max_workers=max_workers,
+        checkpoint=checkpoint,
+        fetch_kwargs=fetch_kwargs,
+    )
+    if len(plans) == 1:
+        results = [fetch(plans[0])]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=len(plans)) as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, fetch, plan)
+                for plan in plans
+            ]
+            results = [f.result() for f in futures]
+
+    pages = [page for season_pages, _ in results for page in season_pages]
+    raw_html = results[0][1] or ""
+    return pages, raw_html
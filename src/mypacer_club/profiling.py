@@ -0,0 +1,215 @@
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+# cProfile, pstats et tracemalloc ne sont chargés qu'avec --profile
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+# Modules dont on affiche les fonctions chaudes
+HOT_MODULES = ("scraper.py", "analyzer.py", "reporter.py")
+
+# Relevé de la mémoire tracée pendant une étape (secondes), et hausse qui
+# déclenche un nouveau snapshot (+10 % depuis le dernier)
+PEAK_INTERVAL = 0.005
+PEAK_STEP = 1.1
+
+
+@dataclass
+class MemStage:
+    """Mémoire d'une étape : pic et principales allocations au pic."""
+
+    peak: int = 0
+    top: list[str] = field(default_factory=list)
+
+
+class _PeakSampler:
+    """Snapshot tracemalloc pris au plus haut de la mémoire d'une étape.
+
+    Un thread relève `get_traced_memory()` toutes les PEAK_INTERVAL
+    secondes et reprend un snapshot dès que la mémoire dépasse de PEAK_STEP
+    celle du précédent : les allocations libérées avant la fin de l'étape
+    restent visibles.
+    """
+
+    def __init__(self) -> None:
+        import tracemalloc
+
+        self.start = tracemalloc.take_snapshot()
+        self.size = tracemalloc.get_traced_memory()[0]
+        self.peak = self.start
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        import tracemalloc
+
+        while not self._stop.wait(PEAK_INTERVAL):
+            current = tracemalloc.get_traced_memory()[0]
+            if current > self.size * PEAK_STEP:
+                self.peak = tracemalloc.take_snapshot()
+                self.size = current
+
+    def stop(self) -> "tracemalloc.Snapshot":
+        """Arrête le relevé. Retourne le snapshot le plus haut (fin comprise)."""
+        import tracemalloc
+
+        self._stop.set()
+        self._thread.join()
+        if tracemalloc.get_traced_memory()[0] >= self.size:
+            self.peak = tracemalloc.take_snapshot()
+        return self.peak
+
+
+class Profiler:
+    """Profilage par étape (cProfile et/ou tracemalloc).
+
+    Chaque étape accumule son propre profil, écrit dans `out_dir` :
+    `<etape>.pstats` (CPU) et `<etape>.mem.txt` (mémoire : pic et
+    principales allocations vivantes au pic, depuis le début de l'étape).
+
+    Un seul profileur CPU peut être actif à la fois (Python 3.12+) : seules
+    les étapes du thread principal sont profilées en CPU. Celles des threads
+    de clubs (`--all-clubs`, `--club-workers`) sont comptées dans
+    `cpu_skipped`.
+    """
+
+    def __init__(self, mode: str, out_dir: str, top: int = 15) -> None:
+        import tracemalloc
+
+        self.cpu = mode in ("cpu", "all")
+        self.mem = mode in ("mem", "all")
+        self.out_dir = out_dir
+        self.top = top
+        self.cpu_stages: dict[str, cProfile.Profile] = {}
+        self.mem_stages: dict[str, MemStage] = {}
+        self.cpu_skipped = 0
+        self._lock = threading.Lock()
+        os.makedirs(out_dir, exist_ok=True)
+        if self.mem and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        import cProfile
+        import tracemalloc
+
+        prof = None
+        if self.cpu and threading.current_thread() is threading.main_thread():
+            prof = self.cpu_stages.setdefault(name, cProfile.Profile())
+        elif self.cpu:
+            with self._lock:
+                self.cpu_skipped += 1
+        sampler = None
+        if self.mem:
+            tracemalloc.reset_peak()
+            sampler = _PeakSampler()
+        if prof:
+            prof.enable()
+        try:
+            yield
+        finally:
+            if prof:
+                prof.disable()
+            if sampler is not None:
+                self._record_mem(name, sampler)
+
+    def _record_mem(self, name: str, sampler: _PeakSampler) -> None:
+        import tracemalloc
+
+        _, peak = tracemalloc.get_traced_memory()
+        at_peak = sampler.stop()
+        # Le profilage lui-même alloue : on l'exclut des deux snapshots
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        diff = at_peak.filter_traces(ignore).compare_to(
+            sampler.start.filter_traces(ignore), "lineno"
+        )
+        st = self.mem_stages.setdefault(name, MemStage())
+        st.peak = max(st.peak, peak)
+        st.top = [str(d) for d in diff[: self.top]]
+
+    def write(self) -> list[str]:
+        """Écrit les profils sur disque. Retourne les chemins créés."""
+        paths = []
+        for name, prof in self.cpu_stages.items():
+            path = os.path.join(self.out_dir, f"{name}.pstats")
+            prof.dump_stats(path)
+            paths.append(path)
+        for name, st in self.mem_stages.items():
+            path = os.path.join(self.out_dir, f"{name}.mem.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"peak: {st.peak} bytes\n")
+                f.write("\n".join(st.top) + "\n")
+            paths.append(path)
+        return paths
+
+    def hot_functions(self, name: str) -> list[tuple[str, int, float, float]]:
+        """Top-N fonctions du projet : (fonction, appels, temps propre, cumulé)."""
+        prof = self.cpu_stages.get(name)
+        if prof is None:
+            return []
+        import pstats
+
+        prof.create_stats()
+        rows = []
+        stats = pstats.Stats(prof).stats  # type: ignore[attr-defined]
+        for (filename, lineno, func), (_, ncalls, tt, ct, _) in stats.items():
+            if os.path.basename(filename) in HOT_MODULES:
+                label = f"{os.path.basename(filename)}:{lineno}({func})"
+                rows.append((label, ncalls, tt, ct))
+        rows.sort(key=lambda r: r[3], reverse=True)
+        return rows[: self.top]
+
+    def print_report(self) -> None:
+        if self.cpu_skipped:
+            print(
+                f"⚠️  Profil CPU limité au thread principal : {self.cpu_skipped} "
+                "étape(s) de threads de clubs non profilée(s)."
+            )
+        for name in self.cpu_stages:
+            print(f"🔥 [{name}] fonctions chaudes (cumulé) :")
+            for label, ncalls, tt, ct in self.hot_functions(name):
+                print(
+                    f"   {ct * 1000:9.2f} ms  {tt * 1000:9.2f} ms  {ncalls:7d}  {label}"
+                )
+        for name, st in self.mem_stages.items():
+            print(f"🧠 [{name}] pic mémoire : {st.peak / 1024:.0f} Ko")
+            for line in st.top[:5]:
+                print(f"   {line}")
+
+
+_profiler: Profiler | None = None
+
+
+def enable(mode: str, out_dir: str, top: int = 15) -> Profiler:
+    global _profiler
+    _profiler = Profiler(mode, out_dir, top)
+    return _profiler
+
+
+def disable() -> None:
+    global _profiler
+    if _profiler and _profiler.mem:
+        import tracemalloc
+
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+    _profiler = None
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Profile une étape si le profilage est actif, sinon ne fait rien."""
+    if _profiler is None:
+        yield
+        return
+    with _profiler.stage(name):
+        yield
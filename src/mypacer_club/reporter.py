@@ -1,33 +1,36 @@
 import sys
-from datetime import datetime, timedelta
+import time
+from collections.abc import Iterable, Iterator
+from datetime import datetime
 from typing import Any
 
-try:
-    import resend
-except ImportError:
-    resend = None  # type: ignore
+from . import metrics
+from .model import Meeting, ReportModel, build_report_model
 
+# Gmail tronque les messages au-delà de ~102 Ko ("[Message tronqué]").
+# On garde une marge pour les en-têtes ajoutés par le fournisseur.
+MAX_EMAIL_BYTES = 100_000
 
-def _generate_dashboard(
-    recent: list[dict[str, Any]], highlights: list[dict[str, Any]]
-) -> str:
+# Emplacement de la section "Tous les Résultats" dans le gabarit.
+_RESULTS_SLOT = "<!--results-->"
+
+
+def _generate_dashboard(model: ReportModel) -> str:
     """Génère les stats en haut du mail."""
-    nb_athletes = len({r["nom"] for r in recent})
-    nb_high = sum(1 for r in recent if r["niveau"].startswith(("N", "I")))
 
     return f"""
     <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f0f7ff; border-radius: 8px; margin-bottom: 25px; border: 1px solid #dbeafe;">
         <tr>
             <td align="center" style="padding: 15px; border-right: 1px solid #dbeafe;">
-                <div style="font-size: 24px; font-weight: bold; color: #1e40af;">{nb_athletes}</div>
+                <div style="font-size: 24px; font-weight: bold; color: #1e40af;">{model.nb_athletes}</div>
                 <div style="font-size: 13px; text-transform: uppercase; color: #475569;">Athlètes</div>
             </td>
             <td align="center" style="padding: 15px; border-right: 1px solid #dbeafe;">
-                <div style="font-size: 24px; font-weight: bold; color: #1e40af;">{len(highlights)}</div>
+                <div style="font-size: 24px; font-weight: bold; color: #1e40af;">{model.nb_highlights}</div>
                 <div style="font-size: 13px; text-transform: uppercase; color: #475569;">Highlights</div>
             </td>
             <td align="center" style="padding: 15px;">
-                <div style="font-size: 24px; font-weight: bold; color: #1e40af;">{nb_high}</div>
+                <div style="font-size: 24px; font-weight: bold; color: #1e40af;">{model.nb_high}</div>
                 <div style="font-size: 13px; text-transform: uppercase; color: #475569;">Perfs IR et Nat.</div>
             </td>
         </tr>
@@ -35,17 +38,14 @@ def _generate_dashboard(
     """
 
 
-def _generate_congrats(
-    recent: list[dict[str, Any]], highlights: list[dict[str, Any]]
-) -> str:
+def _generate_congrats(model: ReportModel) -> str:
     """Génère un bandeau motivationnel après le dashboard."""
-    if not recent:
+    if not model.recent:
         return ""
-    nb_athletes = len({r["nom"] for r in recent})
-    if highlights:
-        text = f"\U0001f389 Bravo ! {nb_athletes} athlètes en compétition, {len(highlights)} performances remarquables !"
+    if model.highlights:
+        text = f"\U0001f389 Bravo ! {model.nb_athletes} athlètes en compétition, {model.nb_highlights} performances remarquables !"
     else:
-        text = f"\U0001f4aa {nb_athletes} athlètes en compétition cette semaine !"
+        text = f"\U0001f4aa {model.nb_athletes} athlètes en compétition cette semaine !"
     return f"""
     <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f0fdf4; border-radius: 8px; margin-bottom: 25px; border: 1px solid #bbf7d0;">
         <tr>
@@ -57,78 +57,112 @@ def _generate_congrats(
     """
 
 
-def _generate_cards(items: list[dict[str, Any]], is_highlight: bool = False) -> str:
+# Cache des cartes déjà rendues, partagé entre les variantes d'un même rapport
+# (clé : id du résultat et type de carte)
+CardCache = dict[tuple[int, bool], str]
+
+
+def _generate_cards(
+    items: list[dict[str, Any]],
+    is_highlight: bool = False,
+    cache: CardCache | None = None,
+) -> str:
     """Génère la liste de cartes HTML."""
-    html = ""
+    return "".join(_iter_cards(items, is_highlight, cache))
+
+
+def _iter_cards(
+    items: list[dict[str, Any]],
+    is_highlight: bool = False,
+    cache: CardCache | None = None,
+) -> Iterator[str]:
+    """Produit les cartes HTML fragment par fragment (rendu interruptible)."""
     last_group = ""
 
     for r in items:
         # En-tête Date/Lieu
         current_group = f"{r['date']} - {r['ville']}"
         if current_group != last_group and not is_highlight:
-            html += f"""
+            yield f"""
             <div style="background-color: #f1f5f9; color: #475569; padding: 6px 10px; font-size: 12px; font-weight: bold; margin-top: 15px; border-radius: 4px; text-transform: uppercase;">
                 📅 {r["date"]} à {r["ville"]}
             </div>
             """
             last_group = current_group
 
-        # Styles Carte
-        bg_card = "#ffffff"
-        border_col = "#e2e8f0"  # Gris défaut
-        medal = ""
-
-        if is_highlight and r.get("is_podium"):
-            if r["place"] == 1:
-                border_col, bg_card, medal = (
-                    "#f59e0b",
-                    "#fffbeb",
-                    '<span style="font-size:18px">🥇</span> ',
-                )
-            elif r["place"] == 2:
-                border_col, bg_card, medal = (
-                    "#94a3b8",
-                    "#f8fafc",
-                    '<span style="font-size:18px">🥈</span> ',
-                )
-            elif r["place"] == 3:
-                border_col, bg_card, medal = (
-                    "#d97706",
-                    "#fff7ed",
-                    '<span style="font-size:18px">🥉</span> ',
-                )
-
-        # Métadonnées (Points • Niveau • Place)
-        meta = []
-        if r["points"]:
-            meta.append(f"{r['points']} pts")
-        if r["niveau"]:
-            style = (
-                "font-weight:bold; color:#0f172a;"
-                if r["niveau"].startswith(("N", "IR", "IA", "IB"))
-                else ""
+        if cache is None:
+            yield _card(r, is_highlight)
+            continue
+        key = (id(r), is_highlight)
+        card = cache.get(key)
+        if card is None:
+            card = cache[key] = _card(r, is_highlight)
+        yield card
+
+
+def _card(r: dict[str, Any], is_highlight: bool) -> str:
+    """Carte HTML d'un résultat."""
+    # Styles Carte
+    bg_card = "#ffffff"
+    border_col = "#e2e8f0"  # Gris défaut
+    medal = ""
+
+    if is_highlight and r.get("is_podium"):
+        if r["place"] == 1:
+            border_col, bg_card, medal = (
+                "#f59e0b",
+                "#fffbeb",
+                '<span style="font-size:18px">🥇</span> ',
+            )
+        elif r["place"] == 2:
+            border_col, bg_card, medal = (
+                "#94a3b8",
+                "#f8fafc",
+                '<span style="font-size:18px">🥈</span> ',
+            )
+        elif r["place"] == 3:
+            border_col, bg_card, medal = (
+                "#d97706",
+                "#fff7ed",
+                '<span style="font-size:18px">🥉</span> ',
             )
-            meta.append(f"<span style='{style}'>{r['niveau']}</span>")
-        if r["place"]:
-            txt = "1er" if r["place"] == 1 else f"{r['place']}e"
-            meta.append(f"<span style='color:#334155;'>{txt}</span>")
-
-        meta_html = " &bull; ".join(meta)
-        qualif = ""
-        if r["qualif"]:
-            q_label = r["qualif"].upper()
-            if r["qualif"] == "qe":
-                q_bg, q_color = "#f3e8ff", "#6b21a8"
-            else:
-                q_bg, q_color = "#dbeafe", "#1e40af"
-            qualif = f'<span style="background:{q_bg}; color:{q_color}; padding:1px 4px; border-radius:3px; font-size:12px; font-weight:bold; margin-left:5px;">{q_label}</span>'
-        tour = (
-            f" - <span style='color:#64748b; font-style:italic;'>{r['tour']}</span>"
-            if r["tour"]
+
+    # Métadonnées (Points • Niveau • Place)
+    meta = []
+    if r["points"]:
+        meta.append(f"{r['points']} pts")
+    if r["niveau"]:
+        style = (
+            "font-weight:bold; color:#0f172a;"
+            if r["niveau"].startswith(("N", "IR", "IA", "IB"))
             else ""
         )
+        meta.append(f"<span style='{style}'>{r['niveau']}</span>")
+    if r["place"]:
+        txt = "1er" if r["place"] == 1 else f"{r['place']}e"
+        # Highlights enrichis (voir meetings) : taille du plateau
+        if is_highlight and r.get("field_size"):
+            txt += f"/{r['field_size']}"
+        meta.append(f"<span style='color:#334155;'>{txt}</span>")
+    if is_highlight and r.get("winning_mark") and r["place"] != 1:
+        meta.append(f"vainqueur {r['winning_mark']}")
+
+    meta_html = " &bull; ".join(meta)
+    qualif = ""
+    if r["qualif"]:
+        q_label = r["qualif"].upper()
+        if r["qualif"] == "qe":
+            q_bg, q_color = "#f3e8ff", "#6b21a8"
+        else:
+            q_bg, q_color = "#dbeafe", "#1e40af"
+        qualif = f'<span style="background:{q_bg}; color:{q_color}; padding:1px 4px; border-radius:3px; font-size:12px; font-weight:bold; margin-left:5px;">{q_label}</span>'
+    tour = (
+        f" - <span style='color:#64748b; font-style:italic;'>{r['tour']}</span>"
+        if r["tour"]
+        else ""
+    )
 
-        html += f"""
+    return f"""
         <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom: 8px; border-bottom: 1px solid #f1f5f9; background-color: {bg_card};">
             <tr>
                 <td style="padding: 10px 10px 10px 15px; border-left: 5px solid {border_col};">
@@ -150,44 +184,102 @@ def _generate_cards(items: list[dict[str, Any]], is_highlight: bool = False) ->
             </tr>
         </table>
         """
-    return html
 
 
-def format_html_report(
-    club_name: str, recent: list[dict[str, Any]], highlights: list[dict[str, Any]]
+def _fit(fragments: Iterable[str], budget: int) -> str | None:
+    """Concatène les fragments tant qu'ils tiennent dans le budget (en octets).
+
+    Retourne None dès que le budget est dépassé : le reste n'est pas rendu.
+    """
+    parts: list[str] = []
+    size = 0
+    for frag in fragments:
+        size += len(frag.encode("utf-8"))
+        if size > budget:
+            return None
+        parts.append(frag)
+    return "".join(parts)
+
+
+def _iter_athlete_lines(by_athlete: dict[str, list[dict[str, Any]]]) -> Iterator[str]:
+    """Mode condensé : une ligne par athlète avec ses épreuves."""
+    for nom, rows in by_athlete.items():
+        perfs = ", ".join(f"{r['epreuve']} {r['perf']}" for r in rows)
+        yield f"""
+        <div style="padding: 6px 10px; border-bottom: 1px solid #f1f5f9; font-size: 13px; color: #475569;">
+            <strong style="color: #0f172a;">{nom}</strong> &mdash; {perfs}
+        </div>
+        """
+
+
+def _iter_meeting_counts(meetings: list[Meeting]) -> Iterator[str]:
+    """Mode minimal : une ligne par compétition avec les effectifs."""
+    for m in meetings:
+        yield f"""
+        <div style="padding: 6px 10px; border-bottom: 1px solid #f1f5f9; font-size: 13px; color: #475569;">
+            📅 <strong style="color: #0f172a;">{m.date} à {m.ville}</strong> &mdash; {len(m.results)} résultats, {len(m.athletes)} athlètes
+        </div>
+        """
+
+
+def _generate_results_section(
+    model: ReportModel, budget: int, cache: CardCache | None = None
 ) -> str:
-    """Assemble l'email complet."""
+    """Rend la liste complète en se dégradant pour tenir dans le budget.
+
+    Ordre : cartes détaillées > une ligne par athlète > compte par compétition.
+    """
+    if not model.recent:
+        return '<p style="text-align:center; color:#666; font-style:italic;">Aucune compétition.</p>'
 
-    # --- LOGIQUE ROBUSTE DE DATE ---
-    # On veut afficher le "Lundi" de la semaine précédente,
-    # peu importe si on lance le script le Lundi, Mardi ou Mercredi.
-    today = datetime.now()
+    notice = '<p style="color:#64748b; font-size:12px; font-style:italic;">Liste condensée pour respecter la taille maximale de l\'email. Détail complet sur www.athle.fr.</p>'
+    budget_condensed = budget - len(notice.encode("utf-8"))
 
-    # today.weekday() : Lundi=0, Mardi=1 ... Dimanche=6
-    # Si on est Lundi (0) : On recule de 0 + 7 = 7 jours (Lundi dernier)
-    # Si on est Mardi (1) : On recule de 1 + 7 = 8 jours (Lundi dernier)
-    days_to_subtract = today.weekday() + 7
-    start_of_week = today - timedelta(days=days_to_subtract)
+    cards = _fit(_iter_cards(model.recent, False, cache), budget)
+    if cards is not None:
+        return cards
+    lines = _fit(_iter_athlete_lines(model.by_athlete), budget_condensed)
+    if lines is not None:
+        return notice + lines
+    counts = _fit(_iter_meeting_counts(model.meetings), budget_condensed)
+    if counts is not None:
+        return notice + counts
+    return notice
 
-    week_str = start_of_week.strftime("%d/%m")
-    # -------------------------------
 
-    nb_athletes = len({r["nom"] for r in recent})
+def format_html_report(
+    club_name: str,
+    recent: list[dict[str, Any]],
+    highlights: list[dict[str, Any]],
+    max_bytes: int = MAX_EMAIL_BYTES,
+    today: datetime | None = None,
+) -> str:
+    """Assemble l'email complet (raccourci vers `render_html`)."""
+    model = build_report_model(club_name, recent, highlights, today)
+    return render_html(model, max_bytes)
 
-    preheader = (
-        f"{nb_athletes} athlètes \u00b7 {len(highlights)} highlights \u00b7 {club_name}"
-    )
 
-    return f"""
+def render_html(
+    model: ReportModel,
+    max_bytes: int = MAX_EMAIL_BYTES,
+    cache: CardCache | None = None,
+) -> str:
+    """Rend le modèle en HTML email.
+
+    Le dashboard et les highlights sont toujours conservés ; seule la liste
+    complète est condensée si le document dépasse `max_bytes`. `cache`
+    réutilise les cartes déjà rendues (variantes d'un même rapport).
+    """
+    document = f"""
     <!DOCTYPE html>
     <html lang="fr">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Résultats {club_name}</title>
+        <title>Résultats {model.club_name}</title>
     </head>
     <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; color: #333; background-color: #ffffff; margin: 0; padding: 0;">
-        <div style="display:none; max-height:0; overflow:hidden;">{preheader}</div>
+        <div style="display:none; max-height:0; overflow:hidden;">{model.preheader}</div>
         <div style="max-width: 600px; margin: 0 auto; padding: 10px;">
 
             <!-- Bouton copier : masqué par défaut, révélé par JS (invisible dans les emails) -->
@@ -200,18 +292,18 @@ def format_html_report(
 
             <div id="report-content">
             <div style="text-align:center; margin-bottom: 25px;">
-                <h1 style="color: #111; font-size: 22px; margin-bottom: 5px; font-weight: 800; letter-spacing: -0.5px;">{club_name}</h1>
-                <div style="color: #475569; font-size: 14px;">Résultats de la semaine du {week_str}</div>
+                <h1 style="color: #111; font-size: 22px; margin-bottom: 5px; font-weight: 800; letter-spacing: -0.5px;">{model.club_name}</h1>
+                <div style="color: #475569; font-size: 14px;">Résultats de la semaine du {model.week_label}</div>
             </div>
 
-            {_generate_dashboard(recent, highlights)}
+            {_generate_dashboard(model)}
 
-            {_generate_congrats(recent, highlights)}
+            {_generate_congrats(model)}
 
-            {'<table width="100%" cellpadding="0" cellspacing="0" style="background-color: #fffbeb; border-radius: 8px; border: 1px solid #fde68a;"><tr><td style="padding: 15px;"><h2 style="color: #92400e; font-size: 15px; margin-top: 0; margin-bottom: 15px; text-transform: uppercase; font-weight: 700; border-bottom: 2px solid #fde68a; padding-bottom: 5px;">🏆 Podiums et hautes performances</h2>' + _generate_cards(highlights, True) + "</td></tr></table>" if highlights else ""}
+            {'<table width="100%" cellpadding="0" cellspacing="0" style="background-color: #fffbeb; border-radius: 8px; border: 1px solid #fde68a;"><tr><td style="padding: 15px;"><h2 style="color: #92400e; font-size: 15px; margin-top: 0; margin-bottom: 15px; text-transform: uppercase; font-weight: 700; border-bottom: 2px solid #fde68a; padding-bottom: 5px;">🏆 Podiums et hautes performances</h2>' + _generate_cards(model.highlights, True, cache) + "</td></tr></table>" if model.highlights else ""}
 
-            <h2 style="color: #1e40af; font-size: 15px; margin-top: 30px; margin-bottom: 15px; text-transform: uppercase; font-weight: 700; border-bottom: 2px solid #e2e8f0; padding-bottom: 5px;">🏃 Tous les Résultats ({len(recent)})</h2>
-            {_generate_cards(recent, False) if recent else '<p style="text-align:center; color:#666; font-style:italic;">Aucune compétition.</p>'}
+            <h2 style="color: #1e40af; font-size: 15px; margin-top: 30px; margin-bottom: 15px; text-transform: uppercase; font-weight: 700; border-bottom: 2px solid #e2e8f0; padding-bottom: 5px;">🏃 Tous les Résultats ({len(model.recent)})</h2>
+            {_RESULTS_SLOT}
 
             <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #eee; color: #94a3b8; font-size: 13px; text-align: center;">
                 <p style="font-size: 14px; color: #475569; font-weight: bold; margin-bottom: 10px;">📣 Partagez ces résultats avec vos athlètes !</p>
@@ -307,15 +399,35 @@ def format_html_report(
     </html>
     """
 
+    # Budget restant pour la liste complète, une fois le reste du document rendu
+    budget = max_bytes - (len(document.encode("utf-8")) - len(_RESULTS_SLOT))
+    return document.replace(
+        _RESULTS_SLOT, _generate_results_section(model, budget, cache), 1
+    )
+
+
+def _resend() -> Any:
+    """Module resend (None s'il manque), importé au premier envoi seulement.
+
+    resend tire requests : inutile pour une simple preview.
+    """
+    try:
+        import resend
+    except ImportError:
+        return None
+    return resend
+
 
 def send_email(api_key: str, to: str, subject: str, html: str) -> None:
     """Envoie via Resend."""
+    resend = _resend()
     if not resend:
         print("❌ Module 'resend' manquant.", file=sys.stderr)
         return
 
     resend.api_key = api_key
     print(f"📧 Envoi à {to}...")
+    start = time.perf_counter()
     try:
         resend.Emails.send(
             {
@@ -325,6 +437,10 @@ def send_email(api_key: str, to: str, subject: str, html: str) -> None:
                 "html": html,
             }
         )
+        metrics.EMAIL_BYTES.observe(len(html.encode("utf-8")))
         print("✅ Envoyé.")
     except Exception as e:
+        metrics.SEND_FAILURES.inc()
         print(f"❌ Erreur Resend: {e}")
+    finally:
+        metrics.SEND_SECONDS.observe(time.perf_counter() - start)
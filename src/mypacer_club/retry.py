@@ -0,0 +1,27 @@
+from collections.abc import Mapping
+
+# Codes HTTP pour lesquels un nouvel essai a du sens (rate limit, erreurs serveur)
+RETRYABLE_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Attente maximale avant un nouvel essai (secondes), même si le serveur
+# demande plus : au-delà, mieux vaut échouer et laisser le prochain run reprendre
+MAX_DELAY = 30.0
+
+
+def delay(
+    headers: Mapping[str, str] | None,
+    attempt: int,
+    backoff: float,
+    max_delay: float = MAX_DELAY,
+) -> float:
+    """Attente avant le nouvel essai `attempt` (0 = premier), plafonnée.
+
+    Retry-After (en secondes) s'il est fourni, sinon backoff exponentiel.
+    """
+    retry_after = {k.lower(): v for k, v in (headers or {}).items()}.get("retry-after")
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), max_delay)
+        except ValueError:
+            pass
+    return float(min(backoff * (2**attempt), max_delay))
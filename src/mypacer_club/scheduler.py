@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+# (min, max) de chaque champ cron : minute heure jour mois jour_semaine
+_FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_field(expr: str, lo: int, hi: int) -> frozenset[int]:
+    """Parse un champ cron : '*', '*/n', 'a', 'a-b', 'a-b/n', listes 'x,y'."""
+    values: set[int] = set()
+    for part in expr.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+            if step <= 0:
+                raise ValueError(f"Pas invalide : {expr}")
+        if part == "*":
+            start, end = lo, hi
+        elif "-" in part:
+            a, b = part.split("-", 1)
+            start, end = int(a), int(b)
+        else:
+            start = int(part)
+            end = hi if step > 1 else start
+        if not (lo <= start <= end <= hi):
+            raise ValueError(f"Valeur hors limites ({lo}-{hi}) : {expr}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """Expression cron à 5 champs (heure locale), ex: '30 7 * * 1'."""
+
+    expr: str
+    minutes: frozenset[int]
+    hours: frozenset[int]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]  # 0 = dimanche (convention cron)
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expr: str) -> "CronSchedule":
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError(f"Expression cron invalide (5 champs) : {expr!r}")
+        fields = [_parse_field(p, lo, hi) for p, (lo, hi) in zip(parts, _FIELDS)]
+        weekdays = frozenset(d % 7 for d in fields[4])  # 7 = dimanche
+        return cls(
+            expr=expr,
+            minutes=fields[0],
+            hours=fields[1],
+            days=fields[2],
+            months=fields[3],
+            weekdays=weekdays,
+            any_day=parts[2] == "*",
+            any_weekday=parts[4] == "*",
+        )
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom = dt.day in self.days
+        dow = (dt.weekday() + 1) % 7 in self.weekdays
+        # Sémantique cron : si les deux champs sont restreints, l'un OU l'autre
+        if self.any_day:
+            return dow
+        if self.any_weekday:
+            return dom
+        return dom or dow
+
+    def matches(self, dt: datetime) -> bool:
+        return (
+            dt.minute in self.minutes
+            and dt.hour in self.hours
+            and dt.month in self.months
+            and self._day_matches(dt)
+        )
+
+    def next_after(self, dt: datetime) -> datetime:
+        """Prochaine échéance strictement après `dt` (à la minute)."""
+        t = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months:
+                # Saut au 1er du mois suivant
+                t = (t.replace(day=1) + timedelta(days=32)).replace(
+                    day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+            elif t.hour not in self.hours:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Aucune échéance pour {self.expr!r}")
@@ -1,18 +1,45 @@
+import contextlib
+import contextvars
 import re
 import sys
-from typing import Any
+import threading
+import time
+from typing import TYPE_CHECKING, Any
 
-import requests
 from bs4 import BeautifulSoup, Tag
 
+from . import metrics, retry, tracing
+from .stringpool import StringPool
+
+# requests (et urllib3) ne sont importés qu'au premier fetch : le mode
+# --sample n'en a pas besoin
+if TYPE_CHECKING:
+    import requests
+
+    from .checkpoint import PageCheckpoint
+    from .hedging import Hedger
+
 # Constantes
-BASE_URL = (
-    "https://www.athle.fr/bases/liste.aspx"
-    "?frmbase=resultats&frmmode=1&frmclub={club_id}"
-    "&frmespace=0&frmsaison={year}"
-)
+ATHLE_URL = "https://www.athle.fr/bases/liste.aspx"
+QUERY = "?frmbase=resultats&frmmode=1&frmclub={club_id}&frmespace=0&frmsaison={year}"
 USER_AGENT = "Mozilla/5.0 (Compatible; MyPacerClub/1.0; +https://mypacer.fr)"
 
+# À incrémenter dès que la sortie de _parse_rows change : invalide le cache
+# des lignes parsées (voir parsecache)
+PARSER_VERSION = 1
+
+# Requêtes athle.fr en vol au plus, tous threads confondus (pages de club et
+# pages compétition) : None = pas de limite (voir limit_requests)
+_in_flight: threading.BoundedSemaphore | None = None
+
+
+class FetchError(Exception):
+    """Page athle.fr irrécupérable (réseau, 4xx, 5xx après retries)."""
+
+
+class ListingTooLong(FetchError):
+    """Liste plus longue que le nombre de pages accepté (`fetch_listing`)."""
+
 
 def load_local_page(filepath: str) -> BeautifulSoup:
     """Charge un fichier HTML local (mode --sample)."""
@@ -33,31 +60,270 @@ def _get_total_pages(soup: BeautifulSoup) -> int:
     return int(match.group(2)) if match else 1
 
 
-def fetch_club_page(
-    club_id: str, year: int, position: int = 0
-) -> tuple[BeautifulSoup, str]:
-    """Récupère le HTML de la page résultats. Retourne (soup, html_brut)."""
-    url = BASE_URL.format(club_id=club_id, year=year)
+def limit_requests(max_in_flight: int | None) -> None:
+    """Limite le nombre de requêtes athle.fr simultanées pour tout le process.
+
+    Les pools de threads (clubs, pages, compétitions) s'additionnent : c'est
+    cette limite, partagée, qui borne la charge envoyée à athle.fr. Les
+    attentes entre retries ne comptent pas. None retire la limite.
+    """
+    global _in_flight
+    _in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+
+
+def page_url(
+    club_id: str, year: int, position: int = 0, base_url: str | None = None
+) -> str:
+    """URL de la page `position` (0 = première) des résultats d'un club.
+
+    `base_url` remplace l'URL de liste.aspx (ex: serveur local, voir standin).
+    """
+    url = (base_url or ATHLE_URL) + QUERY.format(club_id=club_id, year=year)
     if position > 0:
         url += f"&frmposition={position}"
-    try:
-        response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=40)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        print(f"Erreur HTTP : {e}", file=sys.stderr)
-        sys.exit(1)
-    return BeautifulSoup(response.text, "lxml"), response.text
+    return url
+
+
+class Page:
+    """Une page de résultats récupérée.
+
+    La soup n'est construite qu'au premier accès : une page déjà présente
+    dans le cache de parsing n'en a jamais besoin. `html` vaut None quand la
+    soup ne correspond plus au HTML reçu (pages tronquées, voir planner).
+    """
+
+    def __init__(
+        self, position: int, html: str | None, soup: BeautifulSoup | None = None
+    ) -> None:
+        self.position = position
+        self.html = html
+        self._soup = soup
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            assert self.html is not None
+            with tracing.span("soup", position=self.position):
+                self._soup = BeautifulSoup(self.html, "lxml")
+        return self._soup
+
+
+def fetch_page_html(
+    club_id: str,
+    year: int,
+    position: int = 0,
+    session: "requests.Session | None" = None,
+    base_url: str | None = None,
+    max_retries: int = 2,
+    backoff: float = 1.0,
+    hedger: "Hedger | None" = None,
+) -> str:
+    """Récupère le HTML brut de la page résultats.
+
+    `session` permet de réutiliser les connexions (mode daemon). Les erreurs
+    réseau, 429 et 5xx sont réessayées `max_retries` fois. Avec `hedger`, une
+    requête qui tarde est doublée (voir hedging).
+    """
+    url = page_url(club_id, year, position, base_url)
+    with tracing.span("fetch_page", club=club_id, year=year, position=position) as sp:
+        html = get_html(url, sp, session, max_retries, backoff, hedger)
+        metrics.PAGES_FETCHED.inc(club=club_id)
+    return html
+
+
+def get_html(
+    url: str,
+    sp: dict[str, Any],
+    session: "requests.Session | None" = None,
+    max_retries: int = 2,
+    backoff: float = 1.0,
+    hedger: "Hedger | None" = None,
+) -> str:
+    """GET athle.fr avec retries et backoff : toutes les requêtes y passent.
 
+    `sp` est le span de l'appelant (statut, essais, taille). Chaque requête
+    envoyée (copie de secours du hedger comprise) attend une place sous
+    `limit_requests`. Lève FetchError quand la page
+    reste irrécupérable.
+    """
+    import requests
 
-def fetch_all_club_pages(club_id: str, year: int) -> tuple[list[BeautifulSoup], str]:
-    """Récupère toutes les pages de résultats. Retourne (soups, html_page1)."""
-    first_soup, raw_html = fetch_club_page(club_id, year)
-    total = _get_total_pages(first_soup)
-    soups = [first_soup]
-    for i in range(1, total):
-        soup, _ = fetch_club_page(club_id, year, position=i)
-        soups.append(soup)
-    return soups, raw_html
+    http = session or requests
+    for attempt in range(max_retries + 1):
+        start = time.perf_counter()
+        try:
+            headers = {"User-Agent": USER_AGENT}
+            if hedger is not None:
+                # Une place par requête envoyée, copie de secours comprise
+                response = hedger.get(
+                    http, url, limit=_in_flight, headers=headers, timeout=40
+                )
+            else:
+                with _in_flight or contextlib.nullcontext():
+                    start = time.perf_counter()  # Sans l'attente d'une place
+                    response = http.get(url, headers=headers, timeout=40)
+            sp["status_code"] = response.status_code
+            metrics.HTTP_RESPONSES.inc(code=str(response.status_code))
+            response.raise_for_status()
+            break
+        except requests.RequestException as e:
+            if e.response is None:
+                metrics.HTTP_RESPONSES.inc(code="error")
+            retryable = (
+                e.response is None or e.response.status_code in retry.RETRYABLE_CODES
+            )
+            if attempt == max_retries or not retryable:
+                raise FetchError(f"Erreur HTTP : {e}") from e
+            sent = e.response.headers if e.response is not None else None
+            time.sleep(retry.delay(sent, attempt, backoff))
+        finally:
+            metrics.FETCH_SECONDS.observe(time.perf_counter() - start)
+    sp["attempts"] = attempt + 1
+    sp["bytes"] = len(response.content)
+    sp["cache_hit"] = False
+    return str(response.text)
+
+
+def fetch_listing(
+    url: str,
+    session: "requests.Session | None" = None,
+    max_pages: int | None = None,
+    **fetch_kwargs: Any,
+) -> list[Page]:
+    """Toutes les pages d'une liste liste.aspx autre qu'un club (compétition).
+
+    `url` est la première page ; elle donne le nombre de pages, récupérées
+    ensuite une à une. Au-delà de `max_pages`, rien de plus n'est demandé :
+    lève ListingTooLong. Mêmes options que `fetch_page_html`.
+    """
+    pages: list[Page] = []
+    total = 1
+    while len(pages) < total:
+        position = len(pages)
+        target = url + (f"&frmposition={position}" if position else "")
+        with tracing.span("fetch_listing", position=position) as sp:
+            pages.append(Page(position, get_html(target, sp, session, **fetch_kwargs)))
+        if position == 0:
+            total = _get_total_pages(pages[0].soup)
+            if max_pages is not None and total > max_pages:
+                raise ListingTooLong(f"{total} pages (au plus {max_pages})")
+    return pages
+
+
+def fetch_club_page(
+    club_id: str,
+    year: int,
+    position: int = 0,
+    session: "requests.Session | None" = None,
+    base_url: str | None = None,
+    **fetch_kwargs: Any,
+) -> tuple[BeautifulSoup, str]:
+    """Récupère la page résultats. Retourne (soup, html_brut)."""
+    page = Page(
+        position,
+        fetch_page_html(club_id, year, position, session, base_url, **fetch_kwargs),
+    )
+    return page.soup, str(page.html)
+
+
+def _same_snapshot(previous_html: str, first_soup: BeautifulSoup) -> bool:
+    """Vrai si la page 1 n'a pas bougé depuis le checkpoint.
+
+    De nouveaux résultats décalent toute la pagination : les pages gardées
+    ne sont alors plus réutilisables.
+    """
+    previous = BeautifulSoup(previous_html, "lxml")
+    return _get_total_pages(previous) == _get_total_pages(first_soup) and _parse_rows(
+        previous
+    ) == _parse_rows(first_soup)
+
+
+def fetch_all_club_pages(
+    club_id: str, year: int, **kwargs: Any
+) -> tuple[list[BeautifulSoup], str]:
+    """Récupère toutes les pages de résultats. Retourne (soups, html_page1).
+
+    Voir `fetch_all_pages` pour les options.
+    """
+    pages = fetch_all_pages(club_id, year, **kwargs)
+    return [p.soup for p in pages], str(pages[0].html)
+
+
+def fetch_all_pages(
+    club_id: str,
+    year: int,
+    session: "requests.Session | None" = None,
+    base_url: str | None = None,
+    max_workers: int = 1,
+    checkpoint: "PageCheckpoint | None" = None,
+    **fetch_kwargs: Any,
+) -> list[Page]:
+    """Récupère toutes les pages de résultats d'une saison.
+
+    La première page donne le nombre de pages ; les suivantes sont récupérées
+    par `max_workers` threads (1 par défaut, pour ménager athle.fr). Seule la
+    soup de la première page est construite ici.
+
+    Avec `checkpoint`, chaque page récupérée est gardée sur disque : après un
+    échec, le run suivant ne refait que les positions manquantes (la page 1
+    est toujours relue pour vérifier que la pagination n'a pas bougé).
+    """
+    first = Page(
+        0, fetch_page_html(club_id, year, 0, session, base_url, **fetch_kwargs)
+    )
+    raw_html = str(first.html)
+    total = _get_total_pages(first.soup)
+
+    resumed: dict[int, Page] = {}
+    if checkpoint:
+        saved = [p for p in checkpoint.positions() if p > 0]
+        previous = checkpoint.load(0)
+        if saved and previous is not None and _same_snapshot(previous, first.soup):
+            for position in saved:
+                html = checkpoint.load(position)
+                if html is not None and position < total:
+                    resumed[position] = Page(position, html)
+            metrics.PAGES_RESUMED.inc(len(resumed), club=club_id)
+            print(f"♻️  Reprise du crawl : {len(resumed)} page(s) déjà récupérée(s).")
+        elif saved:
+            print("♻️  Checkpoint obsolète (résultats modifiés), crawl complet.")
+            checkpoint.clear()
+        checkpoint.save(0, raw_html)
+
+    def fetch(position: int) -> Page:
+        if position in resumed:
+            return resumed[position]
+        html = fetch_page_html(
+            club_id, year, position, session, base_url, **fetch_kwargs
+        )
+        if checkpoint:
+            checkpoint.save(position, html)
+        return Page(position, html)
+
+    try:
+        if max_workers <= 1:
+            pages = [first] + [fetch(i) for i in range(1, total)]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                # Contexte copié par page : les spans restent rattachés au parent
+                futures = [
+                    pool.submit(contextvars.copy_context().run, fetch, i)
+                    for i in range(1, total)
+                ]
+                pages = [first] + [f.result() for f in futures]
+    except FetchError:
+        if checkpoint:
+            kept = len(checkpoint.positions())
+            print(
+                f"💾 {kept}/{total} page(s) conservée(s) : relancez pour reprendre.",
+                file=sys.stderr,
+            )
+        raise
+    if checkpoint:
+        checkpoint.clear()
+    return pages
 
 
 def extract_club_name(soup: BeautifulSoup, default_id: str) -> str:
@@ -69,8 +335,25 @@ def extract_club_name(soup: BeautifulSoup, default_id: str) -> str:
     return f"Club {default_id}"
 
 
-def parse_raw_results(soup: BeautifulSoup) -> list[dict[str, Any]]:
-    """Transforme le tableau HTML en liste de dictionnaires bruts."""
+def parse_raw_results(
+    soup: BeautifulSoup, pool: StringPool | None = None
+) -> list[dict[str, Any]]:
+    """Transforme le tableau HTML en liste de dictionnaires bruts.
+
+    Les colonnes répétitives passent par `pool` (un par run, partagé entre
+    les pages) : une seule chaîne en mémoire par ville, épreuve, nom...
+    """
+    start = time.perf_counter()
+    results = _parse_rows(soup, pool if pool is not None else StringPool())
+    metrics.PARSE_SECONDS.observe(time.perf_counter() - start)
+    metrics.PARSED_ROWS.inc(len(results))
+    return results
+
+
+def _parse_rows(
+    soup: BeautifulSoup, pool: StringPool | None = None
+) -> list[dict[str, Any]]:
+    intern = pool.intern if pool is not None else str
     table = soup.find("table", id="ctnResultats")
 
     # On vérifie que c'est bien une balise Tag pour rassurer Mypy
@@ -122,16 +405,16 @@ def parse_raw_results(soup: BeautifulSoup) -> list[dict[str, Any]]:
 
         # Construction du dict typé
         result_item: dict[str, Any] = {
-            "nom": cells[0].get_text(strip=True),
-            "epreuve": cells[1].get_text(strip=True),
-            "tour": cells[3].get_text(strip=True),
+            "nom": intern(cells[0].get_text(strip=True)),
+            "epreuve": intern(cells[1].get_text(strip=True)),
+            "tour": intern(cells[3].get_text(strip=True)),
             "perf": perf,
             "points": points,
             "place": place,
             "qualif": qualif,
-            "niveau": cells[6].get_text(strip=True),
-            "date": cells[7].get_text(strip=True),
-            "ville": cells[8].get_text(strip=True),
+            "niveau": intern(cells[6].get_text(strip=True)),
+            "date": intern(cells[7].get_text(strip=True)),
+            "ville": intern(cells[8].get_text(strip=True)),
         }
         results.append(result_item)
 
@@ -0,0 +1,118 @@
+import json
+import re
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any
+
+from . import metrics, model, pipeline, scraper
+from .singleflight import SingleFlightCache
+
+if TYPE_CHECKING:
+    import requests
+
+ROUTE = re.compile(r"^/clubs/(\w+)/(report|results)$")
+
+
+class ReportService:
+    """Rapports à la demande, gardés en mémoire `ttl` secondes.
+
+    Un même club n'est jamais scrapé deux fois en parallèle, et au plus
+    `max_builds` clubs différents le sont en même temps : une rafale de
+    requêtes ne devient pas une rafale de crawls athle.fr.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[str], pipeline.Rendered],
+        ttl: float = 600.0,
+        max_entries: int = 128,
+        max_builds: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._build = build
+        self.cache: SingleFlightCache[pipeline.Rendered] = SingleFlightCache(
+            ttl, max_entries, clock
+        )
+        self._builds = threading.Semaphore(max_builds)
+
+    def report(self, club_id: str) -> pipeline.Rendered:
+        def build() -> pipeline.Rendered:
+            with self._builds:
+                return self._build(club_id)
+
+        rendered, origin = self.cache.get(club_id, build)
+        metrics.REPORT_CACHE.inc(result=origin)
+        return rendered
+
+
+def pipeline_builder(
+    session: "requests.Session | None" = None,
+    clock: Callable[[], datetime] = datetime.now,
+    **build_kwargs: Any,
+) -> Callable[[str], pipeline.Rendered]:
+    """Construit le rapport complet d'un club avec le pipeline habituel."""
+
+    def build(club_id: str) -> pipeline.Rendered:
+        docs = pipeline.build_reports(club_id, clock(), session=session, **build_kwargs)
+        return docs[0]
+
+    return build
+
+
+def _public(result: dict[str, Any]) -> dict[str, Any]:
+    """Résultat sans les champs internes de l'analyse (`_dt`...)."""
+    return {k: v for k, v in result.items() if not k.startswith("_")}
+
+
+def results_payload(report: model.ReportModel) -> dict[str, Any]:
+    return {
+        "club": report.club_name,
+        "generated_at": report.generated_at.isoformat(),
+        "week_start": report.week_start.date().isoformat(),
+        "recent": [_public(r) for r in report.recent],
+        "highlights": [_public(r) for r in report.highlights],
+    }
+
+
+def make_server(
+    service: ReportService, port: int, host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """Expose /clubs/<id>/report (HTML), /clubs/<id>/results (JSON) et /health."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def _reply(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                self._reply(200, b"ok\n", "text/plain; charset=utf-8")
+                return
+            match = ROUTE.match(self.path)
+            if not match:
+                self._reply(404, b"not found\n", "text/plain; charset=utf-8")
+                return
+            club_id, kind = match.groups()
+            try:
+                rendered = service.report(club_id)
+            except scraper.FetchError as e:
+                error = f"Rapport indisponible : {e}\n"
+                self._reply(502, error.encode(), "text/plain; charset=utf-8")
+                return
+            if kind == "report":
+                self._reply(200, rendered.html.encode(), "text/html; charset=utf-8")
+            else:
+                payload = results_payload(rendered.report)
+                body = json.dumps(payload, ensure_ascii=False).encode()
+                self._reply(200, body, "application/json")
+
+    return ThreadingHTTPServer((host, port), Handler)
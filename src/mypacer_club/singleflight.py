@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+
+class _Flight[V]:
+    """Calcul en cours pour une clé, attendu par les requêtes suivantes."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: V | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlightCache[V]:
+    """Cache TTL + LRU, avec un seul calcul en vol par clé.
+
+    Les requêtes simultanées pour une clé absente attendent le calcul lancé
+    par la première (single-flight) au lieu d'en lancer chacune un. Une
+    erreur n'est pas mise en cache : elle est remontée à toutes les requêtes
+    qui attendaient. `ttl_for` donne une durée propre à une valeur (ex: un
+    échec gardé comme valeur, mais moins longtemps).
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+        ttl_for: Callable[[V], float] | None = None,
+    ) -> None:
+        self.ttl = ttl
+        self.ttl_for = ttl_for
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, V]] = OrderedDict()
+        self._flights: dict[str, _Flight[V]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, build: Callable[[], V]) -> tuple[V, str]:
+        """Retourne (valeur, origine) : "hit", "miss" (calculée ici) ou "shared"."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self.clock():
+                    self._entries.move_to_end(key)
+                    return value, "hit"
+                del self._entries[key]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, "shared"  # type: ignore[return-value]
+
+        try:
+            value = build()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            flight.value = value
+            with self._lock:
+                ttl = self.ttl if self.ttl_for is None else self.ttl_for(value)
+                self._entries[key] = (self.clock() + ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return value, "miss"
@@ -0,0 +1,394 @@
+"""Serveur local qui imite liste.aspx d'athle.fr (tests de charge du crawl).
+
+Usage :
+    uv run -m mypacer_club.standin --port 8800 --pages 20 \\
+        --latency lognormal:0.2:0.5 --throttle-rate 0.05
+    uv run -m mypacer_club.main --club 033033 \\
+        --athle-url http://127.0.0.1:8800/bases/liste.aspx
+"""
+
+import argparse
+import math
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from html import escape, unescape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from . import synthetic
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Distribution de latence par requête (secondes).
+
+    Formats : "0.2" (fixe), "0.05-0.3" (uniforme), "lognormal:0.2:0.5"
+    (médiane, sigma).
+    """
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        try:
+            if spec.startswith("lognormal:"):
+                _, median, sigma = spec.split(":")
+                return cls("lognormal", float(median), float(sigma))
+            if "-" in spec:
+                low, high = spec.split("-")
+                return cls("uniform", float(low), float(high))
+            return cls("fixed", float(spec))
+        except ValueError:
+            raise ValueError(f"Latence invalide : {spec!r}") from None
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(self.a), self.b) if self.a else 0.0
+        return self.a
+
+
+@dataclass
+class StandinConfig:
+    """Contenu servi et pannes injectées."""
+
+    pages: int = 3
+    rows: int = synthetic.ROWS_PER_PAGE
+    seed: int = 0
+    mix: synthetic.Mix = synthetic.DEFAULT_MIX
+    today: datetime | None = None
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float | None = 1.0
+    # Toutes les `insert_every` pages servies pour un club, `insert_rows`
+    # nouveaux résultats apparaissent en tête (décalage de la pagination)
+    insert_every: int = 0
+    insert_rows: int = 0
+    # Pages enregistrées (<club>_<saison>_<position>.html), prioritaires
+    recorded_dir: str | None = None
+
+
+@dataclass(frozen=True)
+class Hit:
+    """Une requête reçue par le serveur."""
+
+    club_id: str
+    year: int
+    position: int
+    status: int
+    # Page compétition ("JJ/MM Ville") ; club_id vide
+    meeting: str = ""
+
+
+class AthleStandin:
+    """Serveur HTTP en thread qui sert les pages résultats d'un ou plusieurs clubs.
+
+    Les pages sont générées (module synthetic) ou relues depuis `recorded_dir`.
+    `fail_next` force les prochaines réponses (ex: [429, 503]).
+    """
+
+    def __init__(
+        self,
+        config: StandinConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.config = config or StandinConfig()
+        self.host = host
+        self.hits: list[Hit] = []
+        self.fail_next: list[int] = []
+        self._rows: dict[tuple[str, int], list[str]] = {}
+        self._served: dict[tuple[str, int], int] = {}
+        self._inserts: dict[tuple[str, int], int] = {}
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        """URL à passer au scraper (`--athle-url`)."""
+        return f"http://{self.host}:{self._server.server_address[1]}/bases/liste.aspx"
+
+    def start(self) -> "AthleStandin":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def insert_results(self, club_id: str, year: int, n: int) -> None:
+        """Ajoute `n` résultats en tête de liste, comme une compétition du jour."""
+        with self._lock:
+            self._insert(club_id, year, n)
+
+    def _insert(self, club_id: str, year: int, n: int) -> None:
+        key = (club_id, year)
+        rows = self._club_rows(club_id, year)
+        k = self._inserts.get(key, 0)
+        rng = random.Random(f"{self.config.seed}:{club_id}:{year}:insert{k}")
+        self._rows[key] = (
+            synthetic.generate_rows(n, rng, self.config.mix, self._today(year)) + rows
+        )
+        self._inserts[key] = k + 1
+
+    def _today(self, year: int) -> datetime:
+        """Date de référence de la saison `year` (31/12 pour une saison close)."""
+        today = self.config.today or datetime(year, 2, 16)
+        return min(today, datetime(year, 12, 31))
+
+    def _club_rows(self, club_id: str, year: int) -> list[str]:
+        """Lignes de la saison, les plus récentes en tête (comme athle.fr)."""
+        key = (club_id, year)
+        if key not in self._rows:
+            cfg = self.config
+            dated = [
+                row
+                for position in range(cfg.pages)
+                for row in synthetic.generate_dated_rows(
+                    cfg.rows,
+                    synthetic.page_rng(cfg.seed, club_id, year, position),
+                    cfg.mix,
+                    self._today(year),
+                    since=datetime(year, 1, 1),
+                )
+            ]
+            dated.sort(key=lambda row: row[0], reverse=True)
+            self._rows[key] = [html for _, html in dated]
+        return self._rows[key]
+
+    def _recorded(self, club_id: str, year: int, position: int) -> str | None:
+        if not self.config.recorded_dir:
+            return None
+        path = os.path.join(
+            self.config.recorded_dir, f"{club_id}_{year}_{position}.html"
+        )
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def page(self, club_id: str, year: int, position: int) -> str | None:
+        """HTML de la page `position`, ou None hors pagination."""
+        recorded = self._recorded(club_id, year, position)
+        if recorded is not None:
+            return recorded
+        size = self.config.rows
+        with self._lock:
+            rows = self._club_rows(club_id, year)
+            total = max(1, math.ceil(len(rows) / size))
+            if position >= total:
+                return None
+            chunk = rows[position * size : (position + 1) * size]
+            cfg = self.config
+            if cfg.insert_every and cfg.insert_rows:
+                served = self._served.get((club_id, year), 0) + 1
+                self._served[(club_id, year)] = served
+                if served % cfg.insert_every == 0:
+                    self._insert(club_id, year, cfg.insert_rows)
+        return synthetic.render_page(chunk, club_id, year, position, total)
+
+    def meeting(
+        self, year: int, date: str, ville: str, position: int = 0
+    ) -> str | None:
+        """Page `position` d'une compétition : les lignes des clubs déjà servis
+        à cette date et dans cette ville, plus d'autres participants par
+        épreuve. Paginée comme les pages club ; None hors pagination."""
+        cell = f"<td>{date}</td><td>{escape(ville, quote=False)}</td>"
+        events: dict[tuple[str, str], list[str]] = {}
+        places: dict[tuple[str, str], list[int]] = {}
+        with self._lock:
+            club_rows = [
+                row
+                for (_, y), rows in self._rows.items()
+                if y == year
+                for row in rows
+                if cell in row
+            ]
+        for row in club_rows:
+            cells = [
+                unescape(c)
+                for c in re.findall(r"<td>(.*?)</td>", row.split("</tr>", 1)[0])
+            ]
+            key = (cells[1], cells[3])
+            events.setdefault(key, []).append(row)
+            place = re.match(r"(\d+)\.", cells[2])
+            if place:
+                places.setdefault(key, []).append(int(place.group(1)))
+        rows_html = []
+        for (epreuve, tour), rows in events.items():
+            rng = random.Random(f"{self.config.seed}:{year}:{date}:{ville}:{epreuve}")
+            taken = places.get((epreuve, tour), [])
+            size = max([len(rows), rng.randint(3, 40), *taken])
+            others = [p for p in range(1, size + 1) if p not in taken]
+            rows_html += rows
+            rows_html += synthetic.generate_event_rows(
+                epreuve, tour, date, ville, others[: size - len(rows)], rng
+            )
+        size = self.config.rows
+        total = max(1, math.ceil(len(rows_html) / size))
+        if position >= total:
+            return None
+        chunk = rows_html[position * size : (position + 1) * size]
+        return synthetic.render_page(chunk, "", year, position, total, club_name=ville)
+
+    def _draw(self) -> tuple[int, float]:
+        """Statut forcé ou tiré au sort, et latence de la réponse."""
+        cfg = self.config
+        with self._lock:
+            delay = cfg.latency.sample(self._rng)
+            if self.fail_next:
+                return self.fail_next.pop(0), delay
+            draw = self._rng.random()
+        if draw < cfg.throttle_rate:
+            return 429, delay
+        if draw < cfg.throttle_rate + cfg.error_rate:
+            return 503, delay
+        return 200, delay
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _reply(
+                self, status: int, body: str, headers: dict[str, str] | None = None
+            ) -> None:
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                query = parse_qs(urlsplit(self.path).query)
+                if "frmville" in query and "frmclub" not in query:
+                    self._meeting(query)
+                    return
+                try:
+                    club_id = query["frmclub"][0]
+                    year = int(query["frmsaison"][0])
+                    position = int(query.get("frmposition", ["0"])[0])
+                except (KeyError, ValueError):
+                    self._reply(400, "frmclub et frmsaison requis\n")
+                    return
+
+                status, delay = standin._draw()
+                time.sleep(delay)
+                body = None
+                if status == 200:
+                    body = standin.page(club_id, year, position)
+                    if body is None:
+                        status = 404
+                with standin._lock:
+                    standin.hits.append(Hit(club_id, year, position, status))
+
+                if status == 429:
+                    retry = standin.config.retry_after
+                    headers = {"Retry-After": f"{retry:g}"} if retry is not None else {}
+                    self._reply(429, "Too Many Requests\n", headers)
+                elif body is None:
+                    self._reply(status, "Erreur\n")
+                else:
+                    self._reply(200, body)
+
+            def _meeting(self, query: dict[str, list[str]]) -> None:
+                try:
+                    year = int(query["frmsaison"][0])
+                    date, ville = query["frmdate"][0], query["frmville"][0]
+                    position = int(query.get("frmposition", ["0"])[0])
+                except (KeyError, ValueError):
+                    self._reply(400, "frmsaison, frmdate et frmville requis\n")
+                    return
+                status, delay = standin._draw()
+                time.sleep(delay)
+                body = None
+                if status == 200:
+                    body = standin.meeting(year, date, ville, position)
+                    if body is None:
+                        status = 404
+                with standin._lock:
+                    meeting = f"{date} {ville}"
+                    standin.hits.append(Hit("", year, position, status, meeting))
+                if body is None:
+                    self._reply(status, "Erreur\n")
+                else:
+                    self._reply(200, body)
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Faux athle.fr (liste.aspx) local")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--pages", type=int, default=3, help="Pages par club")
+    parser.add_argument(
+        "--rows", type=int, default=synthetic.ROWS_PER_PAGE, help="Lignes par page"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--latency",
+        default="0",
+        help='Latence (s) : "0.2", "0.05-0.3" ou "lognormal:0.2:0.5"',
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Part de 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Part de 429")
+    parser.add_argument(
+        "--retry-after", type=float, default=1.0, help="Retry-After des 429 (s)"
+    )
+    parser.add_argument(
+        "--insert-every",
+        type=int,
+        default=0,
+        help="Insère des résultats toutes les N pages servies",
+    )
+    parser.add_argument("--insert-rows", type=int, default=5)
+    parser.add_argument(
+        "--recorded", help="Dossier de pages enregistrées (<club>_<saison>_<pos>.html)"
+    )
+    args = parser.parse_args()
+
+    config = StandinConfig(
+        pages=args.pages,
+        rows=args.rows,
+        seed=args.seed,
+        latency=Latency.parse(args.latency),
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        insert_every=args.insert_every,
+        insert_rows=args.insert_rows,
+        recorded_dir=args.recorded,
+    )
+    standin = AthleStandin(config, args.host, args.port)
+    print(f"🏟️  Faux athle.fr : {standin.url}")
+    try:
+        standin.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Arrêt du serveur.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+class StringPool:
+    """Dictionnaire des chaînes d'un run : une seule instance par valeur.
+
+    Villes, épreuves, niveaux, tours, dates et noms se répètent d'une ligne à
+    l'autre : `intern` renvoie toujours le même objet pour une même valeur
+    (mémoire partagée, égalité résolue par identité).
+    """
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: str) -> str:
+        # setdefault est atomique : pas de verrou sur le chemin chaud
+        return self._strings.setdefault(value, value)
@@ -0,0 +1,262 @@
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from html import escape
+
+# Taille de page par défaut pour les pages générées
+ROWS_PER_PAGE = 250
+
+NOMS = [
+    "DUPONT", "MARTIN", "LEROY", "DUBRANA", "MOULINIE", "BERTRAND", "GARCIA",
+    "PETIT", "ROUX", "FOURNIER", "MOREL", "GIRARD", "LAMBERT", "BONNET",
+    "FRANCOIS", "MERCIER", "FAURE", "ROUSSEL", "BLANC", "GUERIN",
+]  # fmt: skip
+PRENOMS_F = ["Marie", "Emma", "Claire", "Léa", "Chloé", "Inès", "Manon", "Jade"]
+PRENOMS_M = ["Lucas", "Yanis", "Kirio", "Hugo", "Louis", "Nathan", "Tom", "Enzo"]
+CATEGORIES = ["SE", "ES", "JU", "CA", "MI", "M0", "M1"]
+VILLES = [
+    "Paris", "Lyon", "Bordeaux", "Talence", "Nantes", "Rennes", "Miramas",
+    "Clermont-Ferrand", "Metz", "Aubière",
+]  # fmt: skip
+# Niveaux "haut niveau" (highlights) et niveaux courants
+NIVEAUX_HAUTS = ["IA1", "IA2", "IB1", "IB2", "N1", "N2", "N3", "N4", "IR1", "IR3"]
+NIVEAUX_BAS = ["", "R1", "R2", "R3", "D1", "D3", "D5", "D7"]
+TOURS_FINALE = ["Finale", "Finale A", ""]
+TOURS_PRELIM = ["Série 1", "Série 3", "Demi-finale", "1/2 Finale", "Qualif."]
+QUALIFS = ["Q", "q", "QI"]
+
+
+@dataclass(frozen=True)
+class Mix:
+    """Proportions des cas particuliers dans les lignes générées."""
+
+    podium: float = 0.15
+    qualif: float = 0.05
+    high_level: float = 0.10
+    reaction: float = 0.30
+    prelim: float = 0.30
+    # Part des résultats hors fenêtre d'analyse (plus de 7 jours)
+    old: float = 0.60
+
+
+DEFAULT_MIX = Mix()
+
+
+def _sprint(rng: random.Random, mix: Mix, base: float) -> str:
+    t = base * rng.uniform(0.97, 1.25)
+    perf = f"{int(t)}''{int(t * 100) % 100:02d}"
+    if rng.random() < mix.reaction:
+        perf += f"({rng.uniform(0.110, 0.210):.3f})"
+    return perf
+
+
+def _demi_fond(rng: random.Random, base: float) -> str:
+    t = base * rng.uniform(0.97, 1.3)
+    minutes, sec = divmod(t, 60)
+    return f"{int(minutes)}'{int(sec):02d}''{int(t * 100) % 100:02d}"
+
+
+def _concours(rng: random.Random, base: float) -> str:
+    d = base * rng.uniform(0.75, 1.05)
+    return f"{int(d)}m{int(d * 100) % 100:02d}"
+
+
+# (épreuve, générateur de perf) ; les sprints peuvent avoir un temps de réaction
+EPREUVES: list[tuple[str, Callable[[random.Random, Mix], str]]] = [
+    ("60m - Salle", lambda rng, mix: _sprint(rng, mix, 7.0)),
+    ("100m", lambda rng, mix: _sprint(rng, mix, 10.9)),
+    ("200m - Salle", lambda rng, mix: _sprint(rng, mix, 22.0)),
+    ("60m Haies - Salle", lambda rng, mix: _sprint(rng, mix, 8.0)),
+    ("400m", lambda rng, mix: _sprint(rng, mix, 49.0)),
+    ("800m", lambda rng, mix: _demi_fond(rng, 112.0)),
+    ("1 500m Piste Courte", lambda rng, mix: _demi_fond(rng, 235.0)),
+    ("3000m", lambda rng, mix: _demi_fond(rng, 510.0)),
+    ("Longueur - Salle", lambda rng, mix: _concours(rng, 7.2)),
+    ("Perche - Salle", lambda rng, mix: _concours(rng, 4.8)),
+    ("Hauteur", lambda rng, mix: _concours(rng, 1.9)),
+    ("Poids (7,260 Kg)", lambda rng, mix: _concours(rng, 15.0)),
+]
+
+
+def _row(
+    rng: random.Random, mix: Mix, today: datetime, since: datetime | None = None
+) -> tuple[datetime, str]:
+    """Une ligne de résultat (format tableau ctnResultats) et sa date."""
+    feminin = rng.random() < 0.5
+    prenom = rng.choice(PRENOMS_F if feminin else PRENOMS_M)
+    nom = f"{rng.choice(NOMS)} {prenom}"
+    cat = rng.choice(CATEGORIES) + ("F" if feminin else "M")
+    epreuve, gen_perf = rng.choice(EPREUVES)
+
+    prelim = rng.random() < mix.prelim
+    tour = rng.choice(TOURS_PRELIM if prelim else TOURS_FINALE)
+    place = rng.randint(1, 3) if rng.random() < mix.podium else rng.randint(4, 40)
+    resultat = f"{place}. {gen_perf(rng, mix)}"
+    if prelim and rng.random() < mix.qualif * 4:
+        resultat += f" {rng.choice(QUALIFS)}"
+    niveau = rng.choice(NIVEAUX_HAUTS if rng.random() < mix.high_level else NIVEAUX_BAS)
+    points = str(rng.randint(600, 1200)) if rng.random() < 0.9 else ""
+
+    # Au-delà de ~6 semaines, les JJ/MM d'une autre année fausseraient l'analyse
+    if rng.random() < mix.old:
+        jours = rng.randint(8, 45)
+    else:
+        jours = rng.randint(0, 6)
+    if since is not None:
+        jours = min(jours, (today - since).days)
+    day = today - timedelta(days=jours)
+    date = day.strftime("%d/%m")
+
+    cells = [
+        nom,
+        f"{epreuve} / {cat}",
+        resultat,
+        tour,
+        f"{cat}/{rng.randint(0, 99):02d}",
+        points,
+        niveau or " ",
+        date,
+        rng.choice(VILLES),
+    ]
+    return day, _tr(cells)
+
+
+def _tr(cells: list[str]) -> str:
+    """Ligne `<tr>` athle.fr (et sa ligne de détail mobile)."""
+    tds = "".join(f"<td>{escape(c, quote=False)}</td>" for c in cells)
+    return (
+        f'<tr class="trlive">{tds}<td class="desktop-tablet-d-none"></td></tr>'
+        '<tr class="detail-row hide desktop-tablet-d-none"><td colspan="4">'
+        '<table class="detail-inner-table"><tbody>'
+        f"<tr><th><div>Tour :</div></th><td>{escape(cells[3])}</td></tr>"
+        f"<tr><th><div>Points :</div></th><td>{cells[5]}</td></tr>"
+        "</tbody></table></td></tr>"
+    )
+
+
+def generate_event_rows(
+    epreuve: str,
+    tour: str,
+    date: str,
+    ville: str,
+    places: list[int],
+    rng: random.Random,
+    mix: Mix = DEFAULT_MIX,
+) -> list[str]:
+    """Autres participants d'une épreuve (page compétition), une ligne par place.
+
+    `epreuve` est complète ("100m / SEF") ; la perf suit l'épreuve de base.
+    """
+    base, _, cat = epreuve.rpartition(" / ")
+    gen_perf = dict(EPREUVES).get(base)
+    rows = []
+    for place in places:
+        feminin = cat.endswith("F")
+        prenom = rng.choice(PRENOMS_F if feminin else PRENOMS_M)
+        perf = gen_perf(rng, mix) if gen_perf else "-"
+        cells = [
+            f"{rng.choice(NOMS)} {prenom}",
+            epreuve,
+            f"{place}. {perf}",
+            tour,
+            f"{cat}/{rng.randint(0, 99):02d}",
+            str(rng.randint(600, 1200)),
+            " ",
+            date,
+            ville,
+        ]
+        rows.append(_tr(cells))
+    return rows
+
+
+def generate_rows(
+    rows: int,
+    rng: random.Random,
+    mix: Mix = DEFAULT_MIX,
+    today: datetime | None = None,
+) -> list[str]:
+    """`rows` lignes `<tr>` de résultats (sans l'enveloppe de la page)."""
+    return [html for _, html in generate_dated_rows(rows, rng, mix, today)]
+
+
+def generate_dated_rows(
+    rows: int,
+    rng: random.Random,
+    mix: Mix = DEFAULT_MIX,
+    today: datetime | None = None,
+    since: datetime | None = None,
+) -> list[tuple[datetime, str]]:
+    """Comme `generate_rows`, avec la date de chaque ligne.
+
+    `since` borne les dates (ex: début de saison : une saison athle.fr ne
+    contient que des résultats de son année).
+    """
+    today = today or datetime(2026, 2, 16)
+    return [_row(rng, mix, today, since) for _ in range(rows)]
+
+
+def render_page(
+    rows_html: list[str],
+    club_id: str = "033033",
+    year: int = 2026,
+    position: int = 0,
+    total_pages: int = 1,
+    club_name: str = "US SYNTHÉTIQUE",
+) -> str:
+    """Enveloppe athle.fr autour de lignes déjà générées (en-tête, pagination)."""
+    pager = ""
+    if total_pages > 1:
+        pager = (
+            '<span class="select-text">'
+            f"Page &gt; {position + 1:03d}/{total_pages:03d} &lt;</span>"
+        )
+    return (
+        '<!DOCTYPE html>\n<html lang="fr">\n<head><title>athle.fr</title></head>\n'
+        f'<body>\n<div class="headers text-normal">{escape(club_name)} | N-A | '
+        f"{club_id[:3]}</div>\n{pager}\n"
+        '<table class="reveal-table base-table" id="ctnResultats">\n<tbody>'
+        '<tr><td class="no-border-no-padding bg-background-grey" colspan="10">'
+        '<div class="mainheaders heading-4">Résultats de votre recherche<br/>'
+        f'<span class="text-small">Année : {year}, N°Club : {club_id}</span>'
+        "</div></td></tr>"
+        f"{''.join(rows_html)}</tbody></table>\n</body>\n</html>\n"
+    )
+
+
+def page_rng(seed: int, club_id: str, year: int, position: int) -> random.Random:
+    """Générateur propre à une page : la page `position` ne dépend pas des autres."""
+    return random.Random(f"{seed}:{club_id}:{year}:{position}")
+
+
+def generate_page(
+    club_id: str = "033033",
+    year: int = 2026,
+    position: int = 0,
+    total_pages: int = 1,
+    rows: int = ROWS_PER_PAGE,
+    seed: int = 0,
+    mix: Mix = DEFAULT_MIX,
+    today: datetime | None = None,
+    club_name: str = "US SYNTHÉTIQUE",
+) -> str:
+    """Page HTML façon athle.fr (liste.aspx), déterministe pour un même seed."""
+    today = today or datetime(year, 2, 16)
+    rows_html = generate_rows(rows, page_rng(seed, club_id, year, position), mix, today)
+    return render_page(rows_html, club_id, year, position, total_pages, club_name)
+
+
+def generate_club_pages(
+    club_id: str = "033033",
+    year: int = 2026,
+    pages: int = 1,
+    rows: int = ROWS_PER_PAGE,
+    seed: int = 0,
+    mix: Mix = DEFAULT_MIX,
+    today: datetime | None = None,
+) -> list[str]:
+    """Toutes les pages d'un club, pagination comprise."""
+    return [
+        generate_page(club_id, year, i, pages, rows, seed, mix, today)
+        for i in range(pages)
+    ]
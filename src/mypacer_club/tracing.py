@@ -0,0 +1,99 @@
+import contextvars
+import itertools
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, TextIO
+
+# Span englobant courant (pour relier enfants et parents, y compris entre threads
+# lancés via contextvars.copy_context)
+_current: contextvars.ContextVar[dict[str, Any] | None] = contextvars.ContextVar(
+    "mypacer_span", default=None
+)
+_ids = itertools.count(1)
+
+
+class Tracer:
+    """Collecte les spans terminés et les écrit en JSON lines.
+
+    Sans fichier, les spans restent en mémoire (`records`), pour les tests.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.records: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._file: TextIO | None = (
+            open(path, "a", encoding="utf-8") if path else None  # noqa: SIM115
+        )
+
+    def emit(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            if self._file:
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._file.flush()
+            else:
+                self.records.append(record)
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+_tracer: Tracer | None = None
+
+
+def enable(path: str | None = None) -> Tracer:
+    """Active le traçage global (fichier JSON lines si `path`)."""
+    global _tracer
+    disable()
+    _tracer = Tracer(path)
+    return _tracer
+
+
+def disable() -> None:
+    global _tracer
+    if _tracer:
+        _tracer.close()
+    _tracer = None
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[dict[str, Any]]:
+    """Mesure un bloc. Le dict renvoyé peut être complété (octets, lignes...).
+
+    Quasi gratuit quand le traçage est désactivé.
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield attrs
+        return
+
+    parent = _current.get()
+    record: dict[str, Any] = {
+        "name": name,
+        "span_id": next(_ids),
+        "parent_id": parent["span_id"] if parent else None,
+    }
+    # Le club est hérité du span parent pour filtrer facilement la trace
+    if parent and "club" in parent["attrs"] and "club" not in attrs:
+        attrs["club"] = parent["attrs"]["club"]
+    token = _current.set({"span_id": record["span_id"], "attrs": attrs})
+    start_wall = time.time()
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield attrs
+    except BaseException as e:
+        status = "error"
+        attrs["error"] = str(e) or type(e).__name__
+        raise
+    finally:
+        record["start"] = round(start_wall, 6)
+        record["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        record["status"] = status
+        record.update(attrs)
+        _current.reset(token)
+        tracer.emit(record)
@@ -0,0 +1,190 @@
+import base64
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from . import scraper
+
+MODES = ("live", "record", "replay")
+PACES = ("fast", "original")
+
+
+def _key(url: str) -> str:
+    """Clé d'un échange : chemin + query, indépendante de l'hôte.
+
+    Un enregistrement fait contre athle.fr se rejoue donc aussi avec
+    `--athle-url` (et inversement).
+    """
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}"
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport réel qui écrit chaque échange dans un fichier JSON lines.
+
+    Une ligne par requête : URL, en-têtes, statut, corps (base64, à l'octet
+    près), durée de la réponse et décalage depuis le début de l'enregistrement.
+    Les erreurs réseau sont enregistrées aussi, pour les rejouer.
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self._file = open(path, "w", encoding="utf-8")  # noqa: SIM115
+        self._lock = threading.Lock()
+        self._t0 = time.monotonic()
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        record: dict[str, Any] = {
+            "method": request.method,
+            "url": request.url,
+            "request_headers": dict(request.headers),
+            "at": datetime.now().isoformat(),
+            "t": round(time.monotonic() - self._t0, 6),
+        }
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+            body = response.content
+        except requests.RequestException as e:
+            record["elapsed"] = round(time.perf_counter() - start, 6)
+            record["error"] = f"{type(e).__name__}: {e}"
+            self._write(record)
+            raise
+        record["elapsed"] = round(response.elapsed.total_seconds(), 6)
+        record["status"] = response.status_code
+        record["headers"] = dict(response.headers)
+        record["body"] = base64.b64encode(body).decode("ascii")
+        self._write(record)
+        return response
+
+    def _write(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        super().close()
+        self._file.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Rejoue un enregistrement sans réseau.
+
+    Les réponses d'une même URL sont rejouées dans l'ordre (ex: 429 puis
+    200) ; la dernière est répétée une fois la file épuisée. `pace="original"`
+    reproduit la chronologie enregistrée : chaque réponse arrive au même
+    décalage (`t` + durée) depuis la première requête qu'à l'enregistrement.
+    `"fast"` répond aussitôt.
+    """
+
+    def __init__(self, path: str, pace: str = "fast") -> None:
+        super().__init__()
+        if pace not in PACES:
+            raise ValueError(f"pace doit valoir {PACES}, pas {pace!r}")
+        self.pace = pace
+        self._queues: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        self._last: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._t0: float | None = None
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._queues[_key(record["url"])].append(record)
+
+    def _next(self, url: str) -> dict[str, Any] | None:
+        key = _key(url)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            return self._last.get(key)
+
+    def _wait(self, record: dict[str, Any]) -> None:
+        """Attend l'instant de la réponse dans le run enregistré.
+
+        Sans décalage `t` (anciens enregistrements), seule la durée compte.
+        """
+        now = time.monotonic()
+        if "t" not in record:
+            time.sleep(record["elapsed"])
+            return
+        with self._lock:
+            if self._t0 is None:
+                # Première requête rejouée = première requête enregistrée
+                self._t0 = now - record["t"]
+            due = self._t0 + record["t"] + record["elapsed"]
+        time.sleep(max(0.0, due - now))
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        record = self._next(request.url or "")
+        if record is None:
+            raise requests.ConnectionError(
+                f"Aucun enregistrement pour {request.url}", request=request
+            )
+        if self.pace == "original":
+            self._wait(record)
+        if "error" in record:
+            raise requests.ConnectionError(record["error"], request=request)
+
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response._content = base64.b64decode(record["body"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url or ""
+        response.request = request
+        response.reason = "Replayed"
+        response.elapsed = timedelta(seconds=record["elapsed"])
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def recorded_at(path: str) -> datetime | None:
+    """Date du premier échange enregistré (horloge du run à rejouer)."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                at = json.loads(line).get("at")
+                return datetime.fromisoformat(at) if at else None
+    return None
+
+
+def make_session(
+    mode: str = "live", path: str | None = None, pace: str = "fast"
+) -> requests.Session:
+    """Session HTTP du scraper, avec le transport du mode demandé.
+
+    - live : réseau, sans enregistrement
+    - record : réseau, chaque échange est ajouté à `path`
+    - replay : aucun réseau, réponses lues dans `path`
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode doit valoir {MODES}, pas {mode!r}")
+    session = requests.Session()
+    session.headers["User-Agent"] = scraper.USER_AGENT
+    if mode == "live":
+        return session
+    if not path:
+        raise ValueError(f"Le mode {mode} nécessite un fichier")
+    adapter: BaseAdapter = (
+        RecordingAdapter(path) if mode == "record" else ReplayAdapter(path, pace)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,115 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .model import ReportModel, build_report_model
+
+
+@dataclass(frozen=True)
+class Variant:
+    """Déclinaison du rapport pour un sous-ensemble du club.
+
+    Un résultat est retenu s'il correspond à l'un des critères : catégorie
+    (préfixe du suffixe d'épreuve, ex: "CA" pour CAM et CAF, "SEF") ou
+    athlète (directement ou via un groupe d'entraînement).
+    """
+
+    name: str
+    recipients: tuple[str, ...] = ()
+    categories: tuple[str, ...] = ()
+    athletes: frozenset[str] = frozenset()
+
+    @property
+    def slug(self) -> str:
+        """Nom court pour les fichiers et clés d'outbox ("Équipe 1" -> "equipe-1")."""
+        ascii_name = (
+            unicodedata.normalize("NFKD", self.name).encode("ascii", "ignore").decode()
+        )
+        return re.sub(r"[^a-z0-9]+", "-", ascii_name.lower()).strip("-")
+
+    def matches(self, result: dict[str, Any]) -> bool:
+        """Vrai si le résultat fait partie de la variante."""
+        if result["nom"] in self.athletes:
+            return True
+        cat = category(result)
+        return any(cat.startswith(prefix) for prefix in self.categories)
+
+
+def parse_variants(data: dict[str, Any]) -> list[Variant]:
+    """Lit les variantes d'un club (config JSON).
+
+    Format : {"groups": {"sprint": ["DUPONT Marie", ...]},
+    "variants": [{"name": "Sprint", "to": ["coach@club.fr"], "groups": ["sprint"],
+    "categories": ["CA", "JU"], "athletes": [...]}]}.
+    """
+    groups: dict[str, list[str]] = data.get("groups", {})
+    variants = []
+    for v in data.get("variants", []):
+        to = v.get("to", [])
+        if isinstance(to, str):
+            to = [t.strip() for t in to.split(",") if t.strip()]
+        athletes = set(v.get("athletes", []))
+        for group in v.get("groups", []):
+            if group not in groups:
+                raise ValueError(f"Groupe inconnu dans {v['name']!r} : {group!r}")
+            athletes.update(groups[group])
+        variants.append(
+            Variant(
+                name=v["name"],
+                recipients=tuple(to),
+                categories=tuple(c.upper() for c in v.get("categories", [])),
+                athletes=frozenset(athletes),
+            )
+        )
+    return variants
+
+
+def category(result: dict[str, Any]) -> str:
+    """Catégorie d'un résultat : suffixe de l'épreuve ("100m / CAM" -> "CAM")."""
+    _, sep, cat = result["epreuve"].rpartition("/")
+    return cat.strip().upper() if sep else ""
+
+
+class ResultIndex:
+    """Résultats analysés, indexés une fois par catégorie et par athlète.
+
+    Chaque variante n'est ensuite qu'une sélection de positions : pas de
+    nouveau scraping, ni de nouvelle analyse.
+    """
+
+    def __init__(
+        self, recent: list[dict[str, Any]], highlights: list[dict[str, Any]]
+    ) -> None:
+        self.recent = recent
+        self.highlights = highlights
+        self.by_category: dict[str, list[int]] = {}
+        self.by_athlete: dict[str, list[int]] = {}
+        for i, r in enumerate(recent):
+            self.by_category.setdefault(category(r), []).append(i)
+            self.by_athlete.setdefault(r["nom"], []).append(i)
+
+    def select(
+        self, variant: Variant
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """(recent, highlights) de la variante, dans l'ordre du rapport complet."""
+        positions: set[int] = set()
+        for prefix in variant.categories:
+            for cat, idx in self.by_category.items():
+                if cat.startswith(prefix):
+                    positions.update(idx)
+        for nom in variant.athletes:
+            positions.update(self.by_athlete.get(nom, ()))
+        recent = [self.recent[i] for i in sorted(positions)]
+        # Les highlights peuvent être des copies enrichies des lignes de `recent`
+        highlights = [h for h in self.highlights if variant.matches(h)]
+        return recent, highlights
+
+    def model(
+        self, club_name: str, variant: Variant, today: datetime | None = None
+    ) -> ReportModel:
+        recent, highlights = self.select(variant)
+        return build_report_model(
+            f"{club_name} · {variant.name}", recent, highlights, today
+        )
@@ -0,0 +1,313 @@
+import contextlib
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import zlib
+from collections.abc import Callable, Container
+from dataclasses import dataclass, field
+from typing import Any
+
+from . import atomicfile
+from .daemon import ClubJob
+from .scraper import FetchError
+
+# Durée d'un bail sans renouvellement : au-delà, le worker est présumé mort
+DEFAULT_LEASE_TTL = 300.0
+DEFAULT_SHARDS = 16
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def shard_of(club_id: str, shards: int) -> int:
+    """Shard d'un club : stable d'un run et d'une machine à l'autre."""
+    return zlib.crc32(club_id.encode()) % shards
+
+
+def _write_json(path: str, data: dict[str, Any]) -> None:
+    atomicfile.write(path, json.dumps(data))
+
+
+def _read_json(path: str) -> dict[str, Any] | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data: dict[str, Any] = json.load(f)
+            return data
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+class FileLeases:
+    """Baux exclusifs à durée limitée, sous forme de fichiers.
+
+    Fonctionne entre process et entre machines qui partagent le dossier :
+    la prise repose sur `os.link` (création atomique, échoue si le bail
+    existe), le renouvellement sur `os.replace` (le bail n'est jamais absent
+    pendant que son titulaire le tient). Un bail expiré est repris
+    par le premier worker qui le voit. Suppose des horloges à peu près
+    synchronisées et un TTL bien plus long que l'intervalle de
+    renouvellement.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        owner: str,
+        ttl: float = DEFAULT_LEASE_TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = root
+        self.owner = owner
+        self.ttl = ttl
+        self.clock = clock
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, f"{name}.lease")
+
+    def holder(self, name: str) -> dict[str, Any] | None:
+        return _read_json(self._path(name))
+
+    def acquire(self, name: str) -> bool:
+        """Prend le bail s'il est libre ou expiré."""
+        path = self._path(name)
+        tmp = f"{path}.{self.owner}.new"
+        _write_json(tmp, {"owner": self.owner, "expires": self.clock() + self.ttl})
+        try:
+            try:
+                os.link(tmp, path)
+                return True
+            except FileExistsError:
+                pass
+            current = _read_json(path)
+            if current and current["expires"] > self.clock():
+                return False
+            # Expiré : on l'écarte sous un nom unique (un seul worker y arrive)
+            stale = f"{path}.{self.owner}.stale"
+            try:
+                os.rename(path, stale)
+            except FileNotFoundError:
+                return False
+            taken = _read_json(stale)
+            if taken != current:
+                # Un bail frais a été posé entre-temps : on le remet en place
+                try:
+                    os.link(stale, path)
+                except FileExistsError:
+                    pass
+                os.unlink(stale)
+                return False
+            os.unlink(stale)
+            try:
+                os.link(tmp, path)
+                return True
+            except FileExistsError:
+                return False
+        finally:
+            os.unlink(tmp)
+
+    def renew(self, name: str) -> bool:
+        """Prolonge le bail. False s'il a été perdu (expiré ou repris).
+
+        Le nouveau bail remplace l'ancien par `os.replace` : le fichier ne
+        disparaît jamais pendant que son titulaire le tient, un `acquire`
+        concurrent le voit donc toujours valide. Un bail expiré n'est pas
+        renouvelé (un autre worker peut être en train de le reprendre), et
+        le bail est relu après écriture pour confirmer le titulaire.
+        """
+        path = self._path(name)
+        current = _read_json(path)
+        if (
+            not current
+            or current["owner"] != self.owner
+            or current["expires"] <= self.clock()
+        ):
+            return False
+        _write_json(path, {"owner": self.owner, "expires": self.clock() + self.ttl})
+        renewed = _read_json(path)
+        return bool(renewed and renewed["owner"] == self.owner)
+
+    def release(self, name: str) -> None:
+        current = _read_json(self._path(name))
+        if current and current["owner"] == self.owner:
+            os.unlink(self._path(name))
+
+
+@dataclass
+class WorkerReport:
+    """Bilan d'un worker."""
+
+    processed: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    shards: list[int] = field(default_factory=list)
+
+
+class WorkQueue:
+    """File de clubs répartie en shards, sur un dossier partagé.
+
+    Arborescence d'un batch (ex: une semaine) :
+        <root>/<batch>/leases/shard-<n>.lease   bail d'un worker
+        <root>/<batch>/clubs/<club>.json        club traité avec succès
+        <root>/<batch>/clubs/<club>.error.json  dernier échec du club
+
+    Un club réussi n'est jamais relancé dans le même batch, y compris quand
+    un shard est repris après la mort de son worker. Un club en échec reste
+    à faire : chaque worker le retente au plus une fois par `run`, et le
+    prochain worker (ou le prochain passage) le reprend.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        jobs: list[ClubJob],
+        batch: str,
+        shards: int = DEFAULT_SHARDS,
+        worker_id: str | None = None,
+        lease_ttl: float = DEFAULT_LEASE_TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.jobs = jobs
+        self.shards = shards
+        self.worker_id = worker_id or default_worker_id()
+        self.clock = clock
+        base = os.path.join(root, batch)
+        self.clubs_dir = os.path.join(base, "clubs")
+        os.makedirs(self.clubs_dir, exist_ok=True)
+        self.leases = FileLeases(
+            os.path.join(base, "leases"), self.worker_id, lease_ttl, clock
+        )
+
+    def shard_jobs(self) -> dict[int, list[ClubJob]]:
+        by_shard: dict[int, list[ClubJob]] = {}
+        for job in self.jobs:
+            by_shard.setdefault(shard_of(job.club_id, self.shards), []).append(job)
+        return by_shard
+
+    def _club_path(self, club_id: str) -> str:
+        return os.path.join(self.clubs_dir, f"{club_id}.json")
+
+    def _error_path(self, club_id: str) -> str:
+        return os.path.join(self.clubs_dir, f"{club_id}.error.json")
+
+    def is_done(self, club_id: str) -> bool:
+        """Vrai si le club a réussi ; un échec enregistré ne compte pas."""
+        return os.path.exists(self._club_path(club_id))
+
+    def mark_done(self, club_id: str) -> None:
+        _write_json(
+            self._club_path(club_id),
+            {"status": "ok", "worker": self.worker_id, "at": self.clock()},
+        )
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._error_path(club_id))
+
+    def mark_failed(self, club_id: str, error: str) -> None:
+        """Garde la dernière erreur du club, sans le marquer comme fait."""
+        _write_json(
+            self._error_path(club_id),
+            {
+                "status": "error",
+                "error": error,
+                "worker": self.worker_id,
+                "at": self.clock(),
+            },
+        )
+
+    def last_error(self, club_id: str) -> str | None:
+        data = _read_json(self._error_path(club_id))
+        return str(data["error"]) if data else None
+
+    def pending_shards(self, skip: Container[str] = ()) -> list[int]:
+        """Shards avec au moins un club à faire, hors clubs de `skip`."""
+        return sorted(
+            n
+            for n, jobs in self.shard_jobs().items()
+            if any(not self.is_done(j.club_id) and j.club_id not in skip for j in jobs)
+        )
+
+    def _heartbeat(
+        self, name: str, lost: threading.Event, stop: threading.Event
+    ) -> None:
+        """Renouvelle le bail tant que le shard est en cours."""
+        while not stop.wait(self.leases.ttl / 3):
+            if not self.leases.renew(name):
+                lost.set()
+                return
+
+    def run_shard(
+        self,
+        shard: int,
+        process: Callable[[ClubJob], str | None],
+        report: WorkerReport,
+    ) -> bool:
+        """Traite un shard si son bail est pris. Retourne False sinon.
+
+        `process` retourne None si le club est fait, sinon son erreur. Une
+        exception de `process` compte comme un échec du club : le shard
+        continue, et le bail est toujours libéré.
+        """
+        name = f"shard-{shard}"
+        if not self.leases.acquire(name):
+            return False
+        lost, stop = threading.Event(), threading.Event()
+        beat = threading.Thread(
+            target=self._heartbeat, args=(name, lost, stop), daemon=True
+        )
+        beat.start()
+        report.shards.append(shard)
+        try:
+            for job in self.shard_jobs().get(shard, []):
+                if lost.is_set():
+                    print(f"⚠️  Bail du shard {shard} perdu, arrêt du shard.")
+                    break
+                if self.is_done(job.club_id) or job.club_id in report.failed:
+                    continue
+                try:
+                    error = process(job)
+                except FetchError as e:
+                    error = str(e)
+                except Exception as e:  # noqa: BLE001 - échec du club, pas du shard
+                    error = f"{type(e).__name__}: {e}"
+                    print(f"❌ Club {job.club_id} : {error}", file=sys.stderr)
+                if error:
+                    self.mark_failed(job.club_id, error)
+                    report.failed[job.club_id] = error
+                else:
+                    self.mark_done(job.club_id)
+                    report.processed.append(job.club_id)
+        finally:
+            stop.set()
+            beat.join()
+            self.leases.release(name)
+        return True
+
+    def run(
+        self,
+        process: Callable[[ClubJob], str | None],
+        poll: float = 5.0,
+        stop: threading.Event | None = None,
+    ) -> WorkerReport:
+        """Prend et traite des shards jusqu'à ce que tout le batch soit fait
+        (ou n'ait plus que des clubs déjà en échec pendant ce run).
+
+        Les shards tenus par d'autres workers sont revus toutes les `poll`
+        secondes : un bail expiré (worker mort) est alors repris.
+        """
+        stop = stop or threading.Event()
+        report = WorkerReport()
+        # Point de départ propre à chaque worker : moins de contention
+        offset = shard_of(self.worker_id, self.shards)
+        while not stop.is_set():
+            # Les clubs en échec de ce run sont laissés aux autres workers
+            pending = self.pending_shards(skip=report.failed)
+            if not pending:
+                break
+            pending.sort(key=lambda n: (n - offset) % self.shards)
+            claimed = [n for n in pending if self.run_shard(n, process, report)]
+            if not claimed:
+                stop.wait(poll)
+        return report
@@ -47,3 +47,23 @@ def make_result():
         return result
 
     return _make
+
+
+@pytest.fixture
+def fake_resend():
+    """Faux serveur Resend démarré sur un port libre."""
+    from tests.fake_resend import FakeResend
+
+    server = FakeResend().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def standin():
+    """Faux athle.fr démarré sur un port libre (config modifiable)."""
+    from mypacer_club.standin import AthleStandin, StandinConfig
+
+    server = AthleStandin(StandinConfig(pages=3, rows=10, retry_after=0)).start()
+    yield server
+    server.stop()
@@ -0,0 +1,91 @@
+"""Faux serveur Resend local (endpoints /emails et /emails/batch)."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+class FakeResend:
+    """Serveur HTTP en thread, qui enregistre les emails reçus.
+
+    `fail_next` injecte des réponses d'erreur (ex: [429, 503]) avant de
+    répondre normalement.
+    """
+
+    def __init__(self) -> None:
+        self.emails: list[dict[str, Any]] = []
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.fail_next: list[int] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeResend":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _reply(self, status: int, body: Any) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"null")
+                with fake._lock:
+                    fake.requests.append((self.path, dict(self.headers)))
+                    status = fake.fail_next.pop(0) if fake.fail_next else 200
+                    if status == 200:
+                        batch = payload if isinstance(payload, list) else [payload]
+                        fake.emails.extend(batch)
+
+                if status == 429:
+                    self._reply(
+                        429,
+                        {
+                            "statusCode": 429,
+                            "name": "rate_limit_exceeded",
+                            "message": "Too many requests",
+                        },
+                    )
+                elif status != 200:
+                    self._reply(
+                        status,
+                        {
+                            "statusCode": status,
+                            "name": "application_error",
+                            "message": "Boom",
+                        },
+                    )
+                elif self.path == "/emails/batch":
+                    self._reply(
+                        200, {"data": [{"id": f"id-{i}"} for i in range(len(batch))]}
+                    )
+                else:
+                    self._reply(200, {"id": "id-0"})
+
+        return Handler
@@ -5,6 +5,7 @@ from freezegun import freeze_time
 from mypacer_club.analyzer import (
     _extract_highlights,
     _niveau_rank,
+    analyze_window,
     parse_date,
     process_results,
 )
@@ -157,6 +158,27 @@ class TestExtractHighlights:
     def test_empty_list(self):
         assert _extract_highlights([]) == []
 
+    def test_input_not_modified(self, make_result):
+        results = [make_result(place=1, tour="Finale")]
+        hl = _extract_highlights(results)
+        assert hl[0]["is_podium"] is True
+        assert "is_podium" not in results[0]
+
+
+# ── analyze_window ──────────────────────────────────────────────────
+
+
+class TestAnalyzeWindow:
+    def test_matches_process_results(self, make_result):
+        today = datetime(2026, 2, 15)
+        results = [
+            make_result(nom="A", date="12/02", place=1, tour="Finale"),
+            make_result(nom="B", date="13/02", niveau="N1"),
+            make_result(nom="C", date="14/02"),
+        ]
+        recent, highlights = process_results(results, today=today)
+        assert analyze_window(recent) == highlights
+
 
 # ── process_results ─────────────────────────────────────────────────
 
@@ -183,6 +205,11 @@ class TestProcessResults:
         recent, _ = process_results(results, days=30)
         assert len(recent) == 1
 
+    def test_explicit_today(self, make_result):
+        results = [make_result(date="12/02"), make_result(date="20/03")]
+        recent, _ = process_results(results, today=datetime(2026, 3, 22))
+        assert [r["date"] for r in recent] == ["20/03"]
+
     def test_empty_input(self):
         recent, highlights = process_results([])
         assert recent == []
@@ -216,3 +243,14 @@ class TestProcessResults:
         recent, _ = process_results(results)
         assert "_dt" in recent[0]
         assert isinstance(recent[0]["_dt"], datetime)
+
+    def test_input_not_modified(self, make_result):
+        results = [
+            make_result(nom="A", date="12/02", place=1, tour="Finale"),
+            make_result(nom="B", date="13/02"),
+        ]
+        snapshot = [dict(r) for r in results]
+        recent, highlights = process_results(results)
+        assert results == snapshot
+        # Les highlights restent les lignes de `recent` (sélection des variantes)
+        assert highlights[0] is recent[0]
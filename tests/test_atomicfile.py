@@ -0,0 +1,40 @@
+import os
+import threading
+
+from mypacer_club import atomicfile
+
+# ── write ───────────────────────────────────────────────────────────
+
+
+class TestWrite:
+    def test_text_and_bytes(self, tmp_path):
+        atomicfile.write(str(tmp_path / "a.txt"), "été")
+        atomicfile.write(str(tmp_path / "b.bin"), b"\x00\x01")
+        assert (tmp_path / "a.txt").read_text(encoding="utf-8") == "été"
+        assert (tmp_path / "b.bin").read_bytes() == b"\x00\x01"
+
+    def test_temp_name_unique_per_process_and_thread(self, tmp_path, monkeypatch):
+        opened = []
+        real_open = open
+
+        def spy(path, *args, **kwargs):
+            opened.append(os.path.basename(path))
+            return real_open(path, *args, **kwargs)
+
+        monkeypatch.setattr("builtins.open", spy)
+        atomicfile.write(str(tmp_path / "page.html"), "x")
+        assert opened == [f"page.html.{os.getpid()}.{threading.get_ident()}.tmp"]
+        assert sorted(os.listdir(tmp_path)) == ["page.html"]
+
+    def test_concurrent_writers(self, tmp_path):
+        path = str(tmp_path / "shared.txt")
+        contents = [str(i) * 10_000 for i in range(8)]
+        threads = [
+            threading.Thread(target=atomicfile.write, args=(path, c)) for c in contents
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert (tmp_path / "shared.txt").read_text() in contents
+        assert os.listdir(tmp_path) == ["shared.txt"]
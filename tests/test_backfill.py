@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+from mypacer_club import analyzer, backfill, scraper, synthetic
+from mypacer_club.backfill import SeasonIndex, season_weeks
+
+TODAY = datetime(2026, 2, 16, 8, 0)
+
+
+def _rows(seed: int = 3) -> list[dict]:
+    html = synthetic.generate_page(rows=200, seed=seed, today=TODAY)
+    return scraper.parse_raw_results(scraper.Page(0, html).soup)
+
+
+# ── season_weeks ────────────────────────────────────────────────────
+
+
+class TestSeasonWeeks:
+    def test_from_first_week_to_last_report(self):
+        weeks = season_weeks(2026, TODAY)
+        assert weeks[0] == datetime(2025, 12, 29)
+        assert weeks[-1] == datetime(2026, 2, 9)
+        assert all(w.weekday() == 0 for w in weeks)
+        assert len(weeks) == 7
+
+    def test_past_season_stops_at_december(self):
+        weeks = season_weeks(2025, TODAY)
+        assert weeks[-1] == datetime(2025, 12, 29)
+        assert len(weeks) == 53
+
+
+# ── SeasonIndex ─────────────────────────────────────────────────────
+
+
+class TestSeasonIndex:
+    def test_window_matches_linear_filter(self):
+        rows = _rows()
+        index = SeasonIndex(rows, 2026)
+        start = datetime(2026, 2, 2)
+        end = start + timedelta(days=7)
+        reference = datetime(2026, 12, 31)
+        dated = [dict(r, _dt=analyzer.parse_date(r["date"], reference)) for r in rows]
+        expected = sorted(
+            (r for r in dated if r["_dt"] and start <= r["_dt"] < end),
+            key=lambda r: (r["_dt"], r["ville"], r["nom"]),
+        )
+        assert index.window(start, end) == expected
+        assert expected
+        assert all("_dt" not in r for r in rows)
+
+    def test_weeks_partition_the_season(self):
+        index = SeasonIndex(_rows(), 2026)
+        weeks = season_weeks(2026, TODAY)
+        total = sum(len(index.window(w, w + backfill.WEEK)) for w in weeks)
+        end = weeks[-1] + backfill.WEEK
+        in_range = [d for d in index.dates if weeks[0] <= d < end]
+        assert total == len(in_range)
+
+    def test_dates_read_in_season_year(self):
+        index = SeasonIndex([{"date": "20/12", "ville": "V", "nom": "N"}], 2025)
+        assert index.dates == [datetime(2025, 12, 20)]
+
+
+# ── build_backfill ──────────────────────────────────────────────────
+
+
+class TestBuildBackfill:
+    def test_one_crawl_for_every_week(self, standin):
+        weeks = backfill.build_backfill("033033", 2026, TODAY, base_url=standin.url)
+        assert len(standin.hits) == standin.config.pages
+        assert [w.start for w in weeks] == season_weeks(2026, TODAY)
+        for w in weeks:
+            assert w.report.week_start == w.start
+            assert all(
+                w.start <= r["_dt"] < w.start + backfill.WEEK for r in w.report.recent
+            )
+
+    def test_parallel_render_is_identical(self, standin):
+        seq = backfill.build_backfill(
+            "033033", 2026, TODAY, workers=1, base_url=standin.url
+        )
+        par = backfill.build_backfill(
+            "033033", 2026, TODAY, workers=4, base_url=standin.url
+        )
+        assert [w.html for w in seq] == [w.html for w in par]
+
+    def test_write(self, standin, tmp_path):
+        weeks = backfill.build_backfill("033033", 2026, TODAY, base_url=standin.url)
+        paths = backfill.write_backfill(weeks, "033033", str(tmp_path))
+        assert paths[0].endswith("033033/2025-12-29.html")
+        assert len(paths) == len(weeks)
@@ -0,0 +1,98 @@
+import pytest
+
+from mypacer_club import scraper
+from mypacer_club.checkpoint import PageCheckpoint
+
+
+def _rows(soups) -> list[dict]:
+    return [r for s in soups for r in scraper.parse_raw_results(s)]
+
+
+# ── PageCheckpoint ──────────────────────────────────────────────────
+
+
+class TestPageCheckpoint:
+    def test_save_and_load(self, tmp_path):
+        cp = PageCheckpoint(str(tmp_path), "033033", 2026)
+        assert cp.positions() == []
+        cp.save(2, "<html>2</html>")
+        cp.save(0, "<html>0</html>")
+        assert cp.positions() == [0, 2]
+        assert cp.load(2) == "<html>2</html>"
+        assert cp.load(1) is None
+
+    def test_scoped_by_club_and_season(self, tmp_path):
+        PageCheckpoint(str(tmp_path), "033033", 2026).save(0, "a")
+        assert PageCheckpoint(str(tmp_path), "075001", 2026).positions() == []
+        assert PageCheckpoint(str(tmp_path), "033033", 2025).positions() == []
+
+    def test_clear(self, tmp_path):
+        cp = PageCheckpoint(str(tmp_path), "033033", 2026)
+        cp.save(0, "a")
+        cp.clear()
+        assert cp.positions() == []
+        cp.clear()  # déjà vide : sans erreur
+
+
+# ── Reprise d'un crawl ──────────────────────────────────────────────
+
+
+class TestResume:
+    def _crawl(self, standin, cp):
+        return scraper.fetch_all_club_pages(
+            "033033",
+            2026,
+            base_url=standin.url,
+            checkpoint=cp,
+            max_retries=0,
+            backoff=0,
+        )
+
+    def test_resumes_missing_positions_only(self, standin, tmp_path):
+        cp = PageCheckpoint(str(tmp_path), "033033", 2026)
+        standin.fail_next = [200, 200, 503]
+        with pytest.raises(scraper.FetchError):
+            self._crawl(standin, cp)
+        assert cp.positions() == [0, 1]
+
+        standin.hits.clear()
+        soups, _ = self._crawl(standin, cp)
+        # Position 0 relue (contrôle), 1 reprise du disque, 2 récupérée
+        assert [h.position for h in standin.hits] == [0, 2]
+        assert len(_rows(soups)) == 30
+        assert cp.positions() == []
+
+    def test_resumed_crawl_matches_full_crawl(self, standin, tmp_path):
+        full, _ = scraper.fetch_all_club_pages("033033", 2026, base_url=standin.url)
+        cp = PageCheckpoint(str(tmp_path), "033033", 2026)
+        standin.fail_next = [200, 200, 503]
+        with pytest.raises(scraper.FetchError):
+            self._crawl(standin, cp)
+        resumed, _ = self._crawl(standin, cp)
+        assert _rows(resumed) == _rows(full)
+
+    def test_stale_checkpoint_is_discarded(self, standin, tmp_path):
+        cp = PageCheckpoint(str(tmp_path), "033033", 2026)
+        standin.fail_next = [200, 200, 503]
+        with pytest.raises(scraper.FetchError):
+            self._crawl(standin, cp)
+        # Nouveaux résultats : toute la pagination est décalée
+        standin.insert_results("033033", 2026, 3)
+        standin.hits.clear()
+        soups, _ = self._crawl(standin, cp)
+        assert [h.position for h in standin.hits] == [0, 1, 2, 3]
+        assert len(_rows(soups)) == 33
+
+    def test_parallel_crawl_checkpoints_pages(self, standin, tmp_path):
+        cp = PageCheckpoint(str(tmp_path), "033033", 2026)
+        standin.fail_next = [200, 503]
+        with pytest.raises(scraper.FetchError):
+            scraper.fetch_all_club_pages(
+                "033033",
+                2026,
+                base_url=standin.url,
+                max_workers=2,
+                checkpoint=cp,
+                max_retries=0,
+            )
+        assert len(cp.positions()) == 2
@@ -0,0 +1,163 @@
+import json
+import urllib.request
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mypacer_club.daemon import (
+    DEFAULT_SCHEDULE,
+    ClubJob,
+    Daemon,
+    load_config,
+    start_status_server,
+)
+from mypacer_club.scheduler import CronSchedule
+from mypacer_club.scraper import FetchError
+
+
+class FakeClock:
+    def __init__(self, start: datetime) -> None:
+        self.now = start
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _job(club_id: str = "033033", expr: str = "30 7 * * 1") -> ClubJob:
+    return ClubJob(club_id, ["a@club.fr"], CronSchedule.parse(expr))
+
+
+# ── load_config ─────────────────────────────────────────────────────
+
+
+class TestLoadConfig:
+    def test_loads_clubs(self, tmp_path):
+        path = tmp_path / "clubs.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "clubs": [
+                        {"id": "033033", "to": ["a@x.fr"], "schedule": "0 6 * * 1"},
+                        {"id": 75001, "to": "b@y.fr, c@z.fr"},
+                    ]
+                }
+            )
+        )
+        jobs = load_config(str(path))
+        assert jobs[0].club_id == "033033"
+        assert jobs[0].schedule.expr == "0 6 * * 1"
+        assert jobs[1].club_id == "75001"
+        assert jobs[1].recipients == ["b@y.fr", "c@z.fr"]
+        assert jobs[1].schedule.expr == DEFAULT_SCHEDULE
+
+
+# ── Daemon ──────────────────────────────────────────────────────────
+
+
+class TestDaemon:
+    def test_initial_next_run(self):
+        clock = FakeClock(datetime(2026, 2, 18, 12, 0))
+        d = Daemon([_job()], "key", clock=clock)
+        assert d.status["033033"].next_run == datetime(2026, 2, 23, 7, 30)
+
+    @patch("mypacer_club.daemon.pipeline.run_club")
+    def test_runs_only_due_jobs(self, mock_run: MagicMock):
+        clock = FakeClock(datetime(2026, 2, 23, 7, 0))
+        d = Daemon([_job("A", "0 7 * * 1"), _job("B", "0 9 * * 1")], "key", clock=clock)
+        clock.now = datetime(2026, 2, 23, 8, 0)
+        assert d.run_pending() == 0
+        clock.now = datetime(2026, 2, 23, 9, 0, 1)
+        mock_run.return_value = None
+        assert d.run_pending() == 1
+        assert mock_run.call_args[0][0] == "B"
+        assert d.status["B"].runs == 1
+        assert d.status["B"].last_status == "ok"
+        assert d.status["B"].next_run == datetime(2026, 3, 2, 9, 0)
+        assert d.status["A"].runs == 0
+
+    @patch("mypacer_club.daemon.pipeline.run_club")
+    def test_reuses_session(self, mock_run: MagicMock):
+        clock = FakeClock(datetime(2026, 2, 23, 7, 31))
+        d = Daemon([_job()], "key", clock=clock)
+        d.run_job(d.jobs[0])
+        d.run_job(d.jobs[0])
+        sessions = {c.kwargs["session"] for c in mock_run.call_args_list}
+        assert sessions == {d.session}
+
+    @patch("mypacer_club.daemon.pipeline.run_club")
+    def test_failure_recorded_not_raised(self, mock_run: MagicMock):
+        mock_run.side_effect = FetchError("Erreur HTTP : 503")
+        d = Daemon([_job()], "key", clock=FakeClock(datetime(2026, 2, 23, 8, 0)))
+        d.run_job(d.jobs[0])
+        assert d.status["033033"].last_status == "error"
+        assert d.status["033033"].last_error == "Erreur HTTP : 503"
+
+    @patch("mypacer_club.daemon.pipeline.run_club")
+    def test_unexpected_error_recorded_and_rescheduled(
+        self, mock_run: MagicMock, capsys
+    ):
+        mock_run.side_effect = RuntimeError("RESEND_API_KEY manquante")
+        d = Daemon([_job()], "key", clock=FakeClock(datetime(2026, 2, 23, 8, 0)))
+        d.run_job(d.jobs[0])
+        st = d.status["033033"]
+        assert st.last_status == "error"
+        assert st.last_error == "RuntimeError: RESEND_API_KEY manquante"
+        assert st.runs == 1
+        assert st.next_run == datetime(2026, 3, 2, 7, 30)
+        assert "RESEND_API_KEY" in capsys.readouterr().err
+
+    @patch("mypacer_club.daemon.pipeline.run_club")
+    def test_fetch_options_passed(self, mock_run: MagicMock):
+        d = Daemon(
+            [_job()],
+            "key",
+            clock=FakeClock(datetime(2026, 2, 23, 8, 0)),
+            fetch_workers=4,
+            checkpoint_dir="cp",
+            parse_cache_dir="pc",
+        )
+        d.run_job(d.jobs[0])
+        kwargs = mock_run.call_args.kwargs
+        assert kwargs["fetch_workers"] == 4
+        assert kwargs["checkpoint_dir"] == "cp"
+        assert kwargs["parse_cache_dir"] == "pc"
+
+    @patch("mypacer_club.daemon.pipeline.run_outbox")
+    def test_uses_outbox_when_configured(self, mock_outbox: MagicMock):
+        mock_outbox.return_value = None
+        d = Daemon(
+            [_job()],
+            "key",
+            outbox_path="o.db",
+            clock=FakeClock(datetime(2026, 2, 23, 8, 0)),
+        )
+        d.run_job(d.jobs[0])
+        assert mock_outbox.call_args[0][:3] == ("o.db", "all", "033033")
+
+    def test_seconds_until_next(self):
+        clock = FakeClock(datetime(2026, 2, 23, 7, 0))
+        d = Daemon([_job()], "key", clock=clock)
+        assert d.seconds_until_next() == timedelta(minutes=30).total_seconds()
+
+
+# ── start_status_server ─────────────────────────────────────────────
+
+
+class TestStatusServer:
+    @pytest.fixture
+    def server(self):
+        d = Daemon([_job()], "key", clock=FakeClock(datetime(2026, 2, 23, 7, 0)))
+        srv = start_status_server(d, 0)
+        yield f"http://127.0.0.1:{srv.server_address[1]}"
+        srv.shutdown()
+
+    def test_health(self, server):
+        with urllib.request.urlopen(f"{server}/health") as resp:
+            assert resp.read() == b"ok\n"
+
+    def test_status(self, server):
+        with urllib.request.urlopen(f"{server}/status") as resp:
+            payload = json.loads(resp.read())
+        assert payload["clubs"]["033033"]["next_run"] == "2026-02-23T07:30:00"
+        assert payload["clubs"]["033033"]["runs"] == 0
@@ -0,0 +1,160 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import resend
+
+from mypacer_club.delivery import (
+    BATCH_SIZE,
+    DeliveryReport,
+    Message,
+    _is_retryable,
+    batch_key,
+    send_messages,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_api_url():
+    url = resend.api_url
+    yield
+    resend.api_url = url
+
+
+def _messages(n: int) -> list[Message]:
+    return [Message(f"to{i}@test.com", "Sujet", "<p>x</p>") for i in range(n)]
+
+
+# ── _is_retryable ───────────────────────────────────────────────────
+
+
+class TestIsRetryable:
+    def test_rate_limit(self):
+        err = resend.exceptions.ResendError(429, "rate_limit_exceeded", "x", "")
+        assert _is_retryable(err)
+
+    def test_server_error(self):
+        err = resend.exceptions.ResendError(503, "application_error", "x", "")
+        assert _is_retryable(err)
+
+    def test_network_error(self):
+        err = resend.exceptions.ResendError(500, "HttpClientError", "x", "")
+        assert _is_retryable(err)
+
+    def test_validation_error_not_retried(self):
+        err = resend.exceptions.ResendError(422, "validation_error", "x", "")
+        assert not _is_retryable(err)
+
+    def test_plain_exception_not_retried(self):
+        assert not _is_retryable(ValueError("x"))
+
+
+class TestRetryDelay:
+    def test_honours_resend_retry_after(self, fake_resend):
+        fake_resend.fail_next = [429]
+        with patch("mypacer_club.delivery.time.sleep") as sleep:
+            send_messages("key", _messages(1), base_url=fake_resend.url)
+        sleep.assert_called_once_with(0.0)
+
+
+# ── DeliveryReport ─────────────────────────────────────────────────
+
+
+class TestDeliveryReport:
+    def test_rate(self):
+        assert DeliveryReport(sent=10, elapsed=2.0).rate == 5.0
+
+    def test_rate_zero_elapsed(self):
+        assert DeliveryReport(sent=10).rate == 0.0
+
+
+# ── send_messages (faux serveur Resend) ───────────────────────────
+
+
+class TestSendMessages:
+    def test_uses_batch_endpoint(self, fake_resend):
+        report = send_messages("key", _messages(3), base_url=fake_resend.url)
+        assert report.sent == 3
+        assert not report.failed
+        assert [path for path, _ in fake_resend.requests] == ["/emails/batch"]
+        assert {e["to"][0] for e in fake_resend.emails} == {
+            "to0@test.com",
+            "to1@test.com",
+            "to2@test.com",
+        }
+
+    def test_splits_into_batches(self, fake_resend):
+        report = send_messages(
+            "key", _messages(BATCH_SIZE * 2 + 1), base_url=fake_resend.url
+        )
+        assert report.sent == BATCH_SIZE * 2 + 1
+        assert len(fake_resend.requests) == 3
+        assert len(fake_resend.emails) == BATCH_SIZE * 2 + 1
+
+    def test_one_recipient_per_message(self, fake_resend):
+        send_messages("key", _messages(2), base_url=fake_resend.url)
+        assert all(len(e["to"]) == 1 for e in fake_resend.emails)
+
+    def test_sends_api_key(self, fake_resend):
+        send_messages("my-key", _messages(1), base_url=fake_resend.url)
+        _, headers = fake_resend.requests[0]
+        assert headers["Authorization"] == "Bearer my-key"
+
+    def test_retries_rate_limit(self, fake_resend):
+        fake_resend.fail_next = [429, 503]
+        report = send_messages("key", _messages(2), base_url=fake_resend.url, backoff=0)
+        assert report.sent == 2
+        assert len(fake_resend.requests) == 3
+
+    def test_batch_retry_reuses_idempotency_key(self, fake_resend):
+        fake_resend.fail_next = [503]
+        messages = _messages(3)
+        send_messages("key", messages, base_url=fake_resend.url, backoff=0)
+        keys = [h["Idempotency-Key"] for _, h in fake_resend.requests]
+        assert keys == [batch_key(messages)] * 2
+
+    def test_batch_key_depends_on_content(self):
+        messages = _messages(3)
+        assert batch_key(messages) == batch_key(messages[::-1])
+        assert batch_key(messages) != batch_key(messages[:2])
+
+    def test_gives_up_after_max_retries(self, fake_resend, capsys):
+        fake_resend.fail_next = [503] * 5
+        report = send_messages(
+            "key", _messages(2), base_url=fake_resend.url, max_retries=2, backoff=0
+        )
+        assert report.sent == 0
+        assert len(report.failed) == 2
+        assert len(fake_resend.requests) == 3
+        assert "Erreur Resend" in capsys.readouterr().err
+
+    def test_validation_error_not_retried(self, fake_resend):
+        fake_resend.fail_next = [422]
+        report = send_messages("key", _messages(1), base_url=fake_resend.url, backoff=0)
+        assert len(report.failed) == 1
+        assert len(fake_resend.requests) == 1
+
+    def test_programming_error_not_swallowed(self, fake_resend):
+        with (
+            patch.object(resend.Batch, "send", side_effect=TypeError("bug")),
+            pytest.raises(TypeError),
+        ):
+            send_messages("key", _messages(1), base_url=fake_resend.url)
+
+    def test_concurrent_batches(self, fake_resend):
+        report = send_messages(
+            "key", _messages(BATCH_SIZE * 5), base_url=fake_resend.url, max_workers=5
+        )
+        assert report.sent == BATCH_SIZE * 5
+        assert report.rate > 0
+
+    @patch("mypacer_club.delivery.resend", None)
+    def test_missing_resend_module(self, capsys):
+        report = send_messages("key", _messages(2))
+        assert len(report.failed) == 2
+        assert "manquant" in capsys.readouterr().err
+
+    @patch("mypacer_club.delivery.resend")
+    def test_empty_messages(self, mock_resend: MagicMock):
+        report = send_messages("key", [])
+        assert report.sent == 0
+        mock_resend.Batch.send.assert_not_called()
@@ -0,0 +1,118 @@
+from datetime import datetime
+
+from mypacer_club import analyzer, fingerprint, metrics, pipeline, scraper, synthetic
+from mypacer_club.fingerprint import FingerprintStore, RunFingerprint
+from mypacer_club.variants import Variant
+
+NOW = datetime(2026, 2, 16, 8, 0)
+
+
+def _pages(seed: int = 1) -> list[scraper.Page]:
+    return [scraper.Page(0, synthetic.generate_page(rows=30, seed=seed, today=NOW))]
+
+
+# ── compute ─────────────────────────────────────────────────────────
+
+
+class TestCompute:
+    def test_stable(self):
+        assert fingerprint.compute(_pages(), NOW, 7) == fingerprint.compute(
+            _pages(), NOW, 7
+        )
+
+    def test_depends_on_pages_and_window(self):
+        base = fingerprint.compute(_pages(), NOW, 7)
+        assert fingerprint.compute(_pages(2), NOW, 7) != base
+        assert fingerprint.compute(_pages(), NOW, 14) != base
+        assert fingerprint.compute(_pages(), datetime(2026, 2, 17), 7) != base
+        # Même jour, autre heure : même fenêtre
+        assert fingerprint.compute(_pages(), datetime(2026, 2, 16, 18), 7) == base
+
+    def test_depends_on_rules_and_recipients(self, monkeypatch):
+        base = fingerprint.compute(_pages(), NOW, 7)
+        assert fingerprint.compute(_pages(), NOW, 7, recipients=["a@x.fr"]) != base
+        variant = Variant("Sprint", ("c@x.fr",), ("CA",), frozenset({"B", "A"}))
+        assert fingerprint.compute(_pages(), NOW, 7, [variant]) != base
+        monkeypatch.setattr(analyzer, "HIGH_LEVELS", ("N",))
+        assert fingerprint.compute(_pages(), NOW, 7) != base
+
+    def test_truncated_page_uses_soup(self):
+        page = _pages()[0]
+        truncated = scraper.Page(0, None, page.soup)
+        assert fingerprint.compute([truncated], NOW, 7)
+
+
+# ── RunFingerprint ──────────────────────────────────────────────────
+
+
+class TestRunFingerprint:
+    def test_unchanged_only_after_commit(self, tmp_path):
+        store = FingerprintStore(str(tmp_path))
+        run = RunFingerprint(store, "033033")
+        assert not run.check(_pages(), NOW, 7)
+        assert run.result == "changed"
+        assert not RunFingerprint(store, "033033").check(_pages(), NOW, 7)
+        run.commit()
+        again = RunFingerprint(store, "033033")
+        assert again.check(_pages(), NOW, 7)
+        assert again.result == "unchanged"
+
+    def test_force(self, tmp_path):
+        store = FingerprintStore(str(tmp_path))
+        store.put("033033", fingerprint.compute(_pages(), NOW, 7))
+        run = RunFingerprint(store, "033033", force=True)
+        assert not run.check(_pages(), NOW, 7)
+        assert run.result == "forced"
+
+    def test_clubs_are_independent(self, tmp_path):
+        store = FingerprintStore(str(tmp_path))
+        store.put("033033", "abc")
+        assert store.get("075001") is None
+        assert store.get("033033") == "abc"
+
+
+# ── Pipeline ────────────────────────────────────────────────────────
+
+
+class TestShortCircuit:
+    def _run(self, standin, fake_resend, tmp_path, **kwargs):
+        return pipeline.run_club(
+            "033033",
+            ["coach@club.fr"],
+            "key",
+            NOW,
+            resend_url=fake_resend.url,
+            base_url=standin.url,
+            fingerprint_dir=str(tmp_path),
+            **kwargs,
+        )
+
+    def test_second_run_not_sent(self, standin, fake_resend, tmp_path, capsys):
+        metrics.REGISTRY.reset()
+        first = self._run(standin, fake_resend, tmp_path)
+        assert first is not None and first.sent == 1
+        second = self._run(standin, fake_resend, tmp_path)
+        assert second is None
+        assert len(fake_resend.emails) == 1
+        assert "run ignoré" in capsys.readouterr().out
+        assert metrics.RUN_FINGERPRINT.value(result="unchanged") == 1
+
+    def test_force_sends_again(self, standin, fake_resend, tmp_path):
+        self._run(standin, fake_resend, tmp_path)
+        result = self._run(standin, fake_resend, tmp_path, force=True)
+        assert result is not None and result.sent == 1
+        assert len(fake_resend.emails) == 2
+
+    def test_failed_send_not_recorded(self, standin, fake_resend, tmp_path):
+        fake_resend.fail_next = [400]
+        first = self._run(standin, fake_resend, tmp_path)
+        assert first is not None and first.failed
+        assert FingerprintStore(str(tmp_path)).get("033033") is None
+        second = self._run(standin, fake_resend, tmp_path)
+        assert second is not None and second.sent == 1
+
+    def test_changed_pages_sent(self, standin, fake_resend, tmp_path):
+        self._run(standin, fake_resend, tmp_path)
+        standin.insert_results("033033", 2026, 2)
+        assert self._run(standin, fake_resend, tmp_path) is not None
+        assert len(fake_resend.emails) == 2
@@ -0,0 +1,213 @@
+import threading
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from mypacer_club import metrics, scraper
+from mypacer_club.hedging import Hedger
+
+
+@dataclass
+class FakeResponse:
+    text: str
+    status_code: int = 200
+
+
+class SlowHttp:
+    """Faux client HTTP : la n-ième requête répond après delays[n].
+
+    `errors` : requêtes en erreur réseau ; `statuses` : codes par requête.
+    """
+
+    def __init__(
+        self,
+        delays: list[float],
+        errors: tuple[int, ...] = (),
+        statuses: dict[int, int] | None = None,
+    ) -> None:
+        self.delays = delays
+        self.errors = errors
+        self.statuses = statuses or {}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs):
+        with self._lock:
+            n = self.calls
+            self.calls += 1
+        time.sleep(self.delays[n] if n < len(self.delays) else 0)
+        if n in self.errors:
+            raise ConnectionError(f"requête {n}")
+        return FakeResponse(f"réponse {n}", self.statuses.get(n, 200))
+
+
+@pytest.fixture
+def hedger():
+    h = Hedger(delay=0.05, budget=1.0)
+    yield h
+    h.close()
+
+
+# ── Hedger ──────────────────────────────────────────────────────────
+
+
+class TestHedger:
+    def test_fast_response_not_hedged(self, hedger):
+        http = SlowHttp([0])
+        assert hedger.get(http, "u").text == "réponse 0"
+        assert http.calls == 1
+        assert hedger.hedges == 0
+
+    def test_slow_response_hedged_and_hedge_wins(self, hedger):
+        metrics.REGISTRY.reset()
+        http = SlowHttp([1.0, 0])
+        start = time.perf_counter()
+        assert hedger.get(http, "u").text == "réponse 1"
+        assert time.perf_counter() - start < 0.5
+        assert metrics.HEDGED_REQUESTS.value(outcome="won") == 1
+
+    def test_primary_can_still_win(self, hedger):
+        metrics.REGISTRY.reset()
+        http = SlowHttp([0.1, 1.0])
+        assert hedger.get(http, "u").text == "réponse 0"
+        assert metrics.HEDGED_REQUESTS.value(outcome="lost") == 1
+
+    def test_failed_hedge_falls_back_to_primary(self, hedger):
+        http = SlowHttp([0.1, 0], errors=(1,))
+        assert hedger.get(http, "u").text == "réponse 0"
+
+    def test_failed_status_does_not_win(self, hedger):
+        metrics.REGISTRY.reset()
+        # Le secours répond vite, mais en 503 : la principale l'emporte
+        http = SlowHttp([0.15, 0], statuses={1: 503})
+        response = hedger.get(http, "u")
+        assert response.text == "réponse 0"
+        assert metrics.HEDGED_REQUESTS.value(outcome="lost") == 1
+
+    def test_both_failed_status_returned(self, hedger):
+        http = SlowHttp([0.1, 0], statuses={0: 503, 1: 429})
+        assert hedger.get(http, "u").status_code in (429, 503)
+
+    def test_only_2xx_latencies_observed(self):
+        h = Hedger(delay=5.0)
+        try:
+            h.get(SlowHttp([0], statuses={0: 503}), "u")
+            assert len(h._latencies) == 0
+            h.get(SlowHttp([0]), "u")
+            assert len(h._latencies) == 1
+        finally:
+            h.close()
+
+    def test_primaries_do_not_queue_behind_pool(self):
+        # Plus de fetchers que de threads de secours : aucune attente
+        h = Hedger(delay=5.0, max_workers=1)
+        http = SlowHttp([0.1] * 8)
+        try:
+            start = time.perf_counter()
+            threads = [
+                threading.Thread(target=h.get, args=(http, "u")) for _ in range(8)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert time.perf_counter() - start < 0.5
+            assert max(h._latencies) < 0.3
+        finally:
+            h.close()
+
+    def test_both_failed(self, hedger):
+        http = SlowHttp([0.1, 0], errors=(0, 1))
+        with pytest.raises(ConnectionError):
+            hedger.get(http, "u")
+
+    def test_budget_caps_extra_requests(self):
+        metrics.REGISTRY.reset()
+        h = Hedger(delay=0.01, budget=0.25)
+        try:
+            http = SlowHttp([0.03] * 100)
+            for _ in range(8):
+                h.get(http, "u")
+        finally:
+            h.close()
+        assert h.hedges == 2
+        assert metrics.HEDGED_REQUESTS.value(outcome="skipped") == 6
+
+    def test_hedge_takes_its_own_slot(self, hedger):
+        limit = threading.BoundedSemaphore(2)
+        http = SlowHttp([0.2, 0])
+        assert hedger.get(http, "u", limit=limit).text == "réponse 1"
+        assert http.calls == 2
+        # La copie perdante rend sa place en finissant
+        time.sleep(0.3)
+        assert limit.acquire(blocking=False)
+        assert limit.acquire(blocking=False)
+
+    def test_no_hedge_without_free_slot(self, hedger):
+        metrics.REGISTRY.reset()
+        limit = threading.BoundedSemaphore(1)
+        http = SlowHttp([0.1, 0])
+        assert hedger.get(http, "u", limit=limit).text == "réponse 0"
+        assert http.calls == 1
+        assert hedger.hedges == 0
+        assert metrics.HEDGED_REQUESTS.value(outcome="no_slot") == 1
+        assert limit.acquire(blocking=False)
+
+    def test_threshold_follows_observed_quantile(self):
+        h = Hedger(quantile=0.9, initial_delay=5.0, min_samples=10)
+        try:
+            assert h.threshold() == 5.0
+            h._latencies.extend(i / 100 for i in range(1, 21))
+            assert h.threshold() == pytest.approx(0.19)
+        finally:
+            h.close()
+
+    def test_from_spec(self):
+        assert Hedger.from_spec("p99").quantile == pytest.approx(0.99)
+        assert Hedger.from_spec("1.5", budget=0.05).delay == 1.5
+        with pytest.raises(ValueError, match="hedging"):
+            Hedger.from_spec("vite")
+
+
+# ── Scraper ─────────────────────────────────────────────────────────
+
+
+class TestFetchHedged:
+    def test_fetch_page_uses_hedger(self, standin, hedger):
+        html = scraper.fetch_page_html(
+            "033033", 2026, hedger=hedger, base_url=standin.url
+        )
+        assert "ctnResultats" in html
+        assert hedger.requests == 1
+
+    def test_hedges_count_in_request_limit(self, standin, monkeypatch):
+        """--hedge ne dépasse pas --max-in-flight."""
+        import requests
+
+        standin.config.latency = standin.config.latency.parse("0.05")
+        lock = threading.Lock()
+        state = {"now": 0, "max": 0}
+        get = requests.get
+
+        def counting_get(*args, **kwargs):
+            with lock:
+                state["now"] += 1
+                state["max"] = max(state["max"], state["now"])
+            try:
+                return get(*args, **kwargs)
+            finally:
+                with lock:
+                    state["now"] -= 1
+
+        monkeypatch.setattr("requests.get", counting_get)
+        h = Hedger(delay=0.01, budget=1.0)
+        scraper.limit_requests(2)
+        try:
+            scraper.fetch_all_pages(
+                "033033", 2026, base_url=standin.url, max_workers=2, hedger=h
+            )
+        finally:
+            scraper.limit_requests(None)
+            h.close()
+        assert state["max"] <= 2
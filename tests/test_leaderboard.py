@@ -0,0 +1,101 @@
+from datetime import datetime
+
+from mypacer_club import leaderboard
+from mypacer_club.leaderboard import ClubSummary, Highlight, merge, summarize
+
+NOW = datetime(2026, 2, 16, 8, 0)
+
+
+def _hl(club: str, place: int | None, niveau: str = "R", podium: bool = True):
+    return Highlight(
+        club, "NOM", "100m / SEM", '11"2', place, niveau, "14/02", "X", podium
+    )
+
+
+# ── summarize ───────────────────────────────────────────────────────
+
+
+class TestSummarize:
+    def test_medals_and_counts(self, make_result):
+        recent = [
+            make_result(nom="A", place=1),
+            make_result(nom="A", place=3),
+            make_result(nom="B", place=5, niveau="N3"),
+        ]
+        highlights = [dict(r, is_podium=r["place"] <= 3) for r in recent]
+        summary = summarize("033033", "US TALENCE", recent, highlights, top=2)
+        assert summary.medals == (1, 0, 1)
+        assert summary.results == 3
+        assert summary.athletes == 2
+        assert len(summary.highlights) == 2
+        assert summary.highlights[0].club == "US TALENCE"
+
+
+# ── merge ───────────────────────────────────────────────────────────
+
+
+class TestMerge:
+    def test_highlights_ranked_across_clubs(self):
+        a = ClubSummary("1", "A", highlights=[_hl("A", 2), _hl("A", None, "N1", False)])
+        b = ClubSummary("2", "B", highlights=[_hl("B", 1), _hl("B", None, "IA", False)])
+        board = merge([a, b], top=3)
+        assert [(h.club, h.place, h.niveau) for h in board.highlights] == [
+            ("B", 1, "R"),
+            ("A", 2, "R"),
+            ("B", None, "IA"),
+        ]
+
+    def test_bigger_field_first_at_same_place(self):
+        small = Highlight("A", "N", "100m", '11"2', 1, "R", "14/02", "X", True, 3)
+        big = Highlight("B", "N", "100m", '11"4', 1, "R", "14/02", "X", True, 40)
+        board = merge([ClubSummary("1", "A", highlights=[small, big])])
+        assert [h.club for h in board.highlights] == ["B", "A"]
+
+    def test_medal_table_gold_first(self):
+        clubs = [
+            ClubSummary("1", "A", medals=(0, 5, 5)),
+            ClubSummary("2", "B", medals=(1, 0, 0)),
+            ClubSummary("3", "C", medals=(1, 1, 0)),
+            ClubSummary("4", "D"),
+        ]
+        board = merge(clubs)
+        assert [c.club_name for c in board.medal_table] == ["C", "B", "A"]
+
+    def test_most_active(self):
+        clubs = [
+            ClubSummary("1", "A", results=10, athletes=4),
+            ClubSummary("2", "B", results=10, athletes=6),
+            ClubSummary("3", "C", results=30, athletes=1),
+        ]
+        board = merge(clubs, top=2)
+        assert [c.club_name for c in board.most_active] == ["C", "B"]
+        assert board.clubs == 3
+
+
+# ── build_leaderboard ───────────────────────────────────────────────
+
+
+class TestBuildLeaderboard:
+    def test_map_reduce_over_clubs(self, standin, capsys):
+        board = leaderboard.build_leaderboard(
+            ["033033", "075001", "069002"], NOW, workers=3, base_url=standin.url
+        )
+        assert board.clubs == 3
+        assert not board.failed
+        assert {h.year for h in standin.hits} == {2026}
+        assert len(standin.hits) == 3 * standin.config.pages
+        html = leaderboard.render_html(board, "Digest Gironde", NOW)
+        assert "Digest Gironde" in html
+        assert "Semaine du 09/02/2026" in html
+
+    def test_failed_club_left_out(self, standin):
+        standin.fail_next = [404]
+        board = leaderboard.build_leaderboard(
+            ["033033", "075001"],
+            NOW,
+            workers=1,
+            base_url=standin.url,
+            max_retries=0,
+        )
+        assert list(board.failed) == ["033033"]
+        assert board.clubs == 1
@@ -0,0 +1,46 @@
+import sys
+
+import pytest
+
+from mypacer_club import main
+
+
+def _parse_error(monkeypatch, capsys, *argv: str) -> str:
+    monkeypatch.setattr(sys, "argv", ["mypacer", *argv])
+    with pytest.raises(SystemExit) as exc:
+        main.main()
+    assert exc.value.code == 2
+    return capsys.readouterr().err
+
+
+# ── Options incompatibles ───────────────────────────────────────────
+
+
+class TestArgs:
+    @pytest.mark.parametrize(
+        "mode",
+        [
+            ["--daemon"],
+            ["--queue", "q"],
+            ["--serve", "0"],
+            ["--leaderboard"],
+            ["--all-clubs"],
+        ],
+    )
+    def test_sample_only_for_one_club(self, monkeypatch, capsys, mode):
+        err = _parse_error(
+            monkeypatch, capsys, "--sample", "page.html", "--config", "c.json", *mode
+        )
+        assert "--sample" in err
+
+    def test_hedge_not_with_daemon(self, monkeypatch, capsys):
+        err = _parse_error(
+            monkeypatch, capsys, "--daemon", "--config", "c.json", "--hedge", "p95"
+        )
+        assert "--hedge" in err
+
+    def test_max_in_flight_positive(self, monkeypatch, capsys):
+        err = _parse_error(
+            monkeypatch, capsys, "--club", "033033", "--max-in-flight", "0"
+        )
+        assert "--max-in-flight" in err
@@ -0,0 +1,215 @@
+import threading
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from mypacer_club import leaderboard, meetings, metrics, pipeline, scraper, synthetic
+from mypacer_club.meetings import MeetingCache, meeting_url, parse_meeting
+from mypacer_club.scraper import Page
+
+NOW = datetime(2026, 2, 16, 8, 0)
+METZ = (2026, "14/02", "Metz")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _meeting_hits(standin) -> Counter:
+    """Listes compétition demandées (une par première page)."""
+    return Counter(h.meeting for h in standin.hits if h.meeting and h.position == 0)
+
+
+def _page_hits(standin) -> Counter:
+    return Counter((h.meeting, h.position) for h in standin.hits if h.meeting)
+
+
+@pytest.fixture
+def limit():
+    yield scraper.limit_requests
+    scraper.limit_requests(None)
+
+
+# ── parse_meeting ───────────────────────────────────────────────────
+
+
+class TestParseMeeting:
+    def test_field_size_and_winner(self):
+        rng = synthetic.page_rng(0, "", 2026, 0)
+        rows = synthetic.generate_event_rows(
+            "100m / SEF", "Finale", "14/02", "Metz", [2, 1, 3], rng
+        )
+        rows += synthetic.generate_event_rows(
+            "100m / SEF", "Série 1", "14/02", "Metz", [1, 2], rng
+        )
+        events = parse_meeting([Page(0, synthetic.render_page(rows)).soup], METZ)
+        final = events[("100m / SEF", "Finale")]
+        assert final.size == 3
+        assert final.winning_mark is not None
+        assert events[("100m / SEF", "Série 1")].size == 2
+
+    def test_event_split_across_pages(self):
+        rng = synthetic.page_rng(0, "", 2026, 0)
+        rows = synthetic.generate_event_rows(
+            "100m / SEF", "Finale", "14/02", "Metz", [1, 2, 3, 4, 5], rng
+        )
+        soups = [
+            Page(0, synthetic.render_page(rows[:3], position=0, total_pages=2)).soup,
+            Page(1, synthetic.render_page(rows[3:], position=1, total_pages=2)).soup,
+        ]
+        assert parse_meeting(soups, METZ)[("100m / SEF", "Finale")].size == 5
+
+    def test_other_meeting_rows_rejected(self):
+        rng = synthetic.page_rng(0, "", 2026, 0)
+        rows = synthetic.generate_event_rows(
+            "100m / SEF", "Finale", "14/02", "Metz", [1, 2], rng
+        )
+        rows += synthetic.generate_event_rows(
+            "100m / SEF", "Finale", "14/02", "Nancy", [1], rng
+        )
+        assert parse_meeting([Page(0, synthetic.render_page(rows)).soup], METZ) is None
+
+    def test_url(self):
+        url = meeting_url((2026, "14/02", "Clermont-Ferrand"), "http://x/liste.aspx")
+        assert "frmsaison=2026" in url
+        assert "frmdate=14%2F02" in url
+        assert "frmville=Clermont-Ferrand" in url
+
+
+# ── MeetingCache ────────────────────────────────────────────────────
+
+
+class TestMeetingCache:
+    def test_report_highlights_enriched(self, standin):
+        meetings = MeetingCache()
+        docs = pipeline.build_reports(
+            "033033", NOW, base_url=standin.url, meetings=meetings
+        )
+        highlights = docs[0].report.highlights
+        enriched = [h for h in highlights if "field_size" in h]
+        assert enriched
+        for h in enriched:
+            assert h["place"] is None or h["field_size"] >= h["place"]
+            if h["place"] == 1:
+                assert h["winning_mark"] == h["perf"]
+        distinct = {(h["date"], h["ville"]) for h in highlights}
+        hits = _meeting_hits(standin)
+        assert len(hits) == len(distinct)
+        assert set(hits.values()) == {1}
+        assert set(_page_hits(standin).values()) == {1}
+        assert f"/{enriched[0]['field_size']}" in docs[0].html
+
+    def test_all_pages_fetched(self, standin):
+        docs = pipeline.build_reports("033033", NOW, base_url=standin.url)
+        h = docs[0].report.highlights[0]
+        key = (2026, h["date"], h["ville"])
+        # Les lignes du club sont déjà générées : seule la compétition change
+        standin.config.rows = 1000
+        single = MeetingCache().get(key, base_url=standin.url)
+        standin.config.rows = 2
+        standin.hits.clear()
+        paged = MeetingCache().get(key, base_url=standin.url)
+        assert single
+        assert paged == single
+        assert max(h.position for h in standin.hits) > 0
+
+    def test_shared_across_clubs(self, standin):
+        standin.config.rows = 40
+        metrics.REGISTRY.reset()
+        meetings = MeetingCache()
+        board = leaderboard.build_leaderboard(
+            ["033033", "075001", "069002"],
+            NOW,
+            workers=4,
+            base_url=standin.url,
+            meetings=meetings,
+        )
+        assert not board.failed
+        hits = _meeting_hits(standin)
+        assert set(hits.values()) == {1}
+        assert set(_page_hits(standin).values()) == {1}
+        assert len(hits) == len(meetings)
+        # Les clubs se croisent sur les mêmes compétitions
+        assert metrics.MEETING_CACHE.value(result="miss") == len(hits)
+        reused = metrics.MEETING_CACHE.value(
+            result="hit"
+        ) + metrics.MEETING_CACHE.value(result="shared")
+        assert reused > 0
+
+    def test_unfiltered_listing_not_used(self, standin, monkeypatch, capsys):
+        """Filtre ignoré par le serveur : liste de toute la saison."""
+        monkeypatch.setattr(
+            meetings,
+            "meeting_url",
+            lambda key, base_url=None: scraper.page_url("033033", 2026, 0, base_url),
+        )
+        cache = MeetingCache()
+        assert cache.get(METZ, base_url=standin.url) == {}
+        assert "autres compétitions" in capsys.readouterr().out
+        hits = len(standin.hits)
+        # Gardée vide pour le TTL normal : pas de nouvelle requête
+        assert cache.get(METZ, base_url=standin.url) == {}
+        assert len(standin.hits) == hits
+
+    def test_long_listing_not_followed(self, standin, monkeypatch, capsys):
+        monkeypatch.setattr(meetings, "MAX_MEETING_PAGES", 2)
+        monkeypatch.setattr(
+            meetings,
+            "meeting_url",
+            lambda key, base_url=None: scraper.page_url("033033", 2026, 0, base_url),
+        )
+        assert MeetingCache().get(METZ, base_url=standin.url) == {}
+        assert [h.position for h in standin.hits] == [0]
+        assert "au plus 2" in capsys.readouterr().out
+
+    def test_failure_kept_for_error_ttl_only(self, standin, capsys):
+        clock = FakeClock()
+        meetings = MeetingCache(error_ttl=300, clock=clock)
+        standin.fail_next = [404]
+        key = (2026, "14/02", "Metz")
+        assert meetings.get(key, base_url=standin.url, max_retries=0) == {}
+        clock.now = 299
+        assert meetings.get(key, base_url=standin.url, max_retries=0) == {}
+        assert _meeting_hits(standin) == {"14/02 Metz": 1}
+        assert "indisponible" in capsys.readouterr().out
+        clock.now = 300
+        meetings.get(key, base_url=standin.url, max_retries=0)
+        assert _meeting_hits(standin) == {"14/02 Metz": 2}
+
+    def test_requests_share_one_limit(self, standin, monkeypatch, limit):
+        """Pages club et compétitions, tous threads confondus, sous la limite."""
+        import requests
+
+        standin.config.latency = standin.config.latency.parse("0.01")
+        lock = threading.Lock()
+        state = {"now": 0, "max": 0}
+        get = requests.get
+
+        def counting_get(*args, **kwargs):
+            with lock:
+                state["now"] += 1
+                state["max"] = max(state["max"], state["now"])
+            try:
+                return get(*args, **kwargs)
+            finally:
+                with lock:
+                    state["now"] -= 1
+
+        monkeypatch.setattr("requests.get", counting_get)
+        limit(2)
+        board = leaderboard.build_leaderboard(
+            ["033033", "075001", "069002", "013004"],
+            NOW,
+            workers=4,
+            fetch_workers=4,
+            base_url=standin.url,
+            meetings=MeetingCache(),
+        )
+        assert not board.failed
+        assert _meeting_hits(standin)
+        assert state["max"] <= 2
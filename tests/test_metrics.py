@@ -0,0 +1,156 @@
+import urllib.request
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mypacer_club import metrics
+from mypacer_club.analyzer import process_results
+from mypacer_club.daemon import Daemon, start_status_server
+from mypacer_club.delivery import Message, send_messages
+from mypacer_club.metrics import Counter, Gauge, Histogram, Registry
+from mypacer_club.scraper import fetch_club_page, parse_raw_results
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    metrics.REGISTRY.reset()
+    yield
+    metrics.REGISTRY.reset()
+
+
+# ── Types de métriques ──────────────────────────────────────────────
+
+
+class TestMetricBase:
+    def test_abstract(self):
+        with pytest.raises(TypeError):
+            metrics._Metric("x", "doc")  # type: ignore[abstract]
+
+
+class TestCounter:
+    def test_inc_with_labels(self):
+        c = Counter("x_total", "doc", ["code"])
+        c.inc(code="200")
+        c.inc(2, code="200")
+        c.inc(code="500")
+        assert c.value(code="200") == 3
+        assert c.samples() == ['x_total{code="200"} 3', 'x_total{code="500"} 1']
+
+    def test_wrong_labels_rejected(self):
+        c = Counter("x_total", "doc", ["code"])
+        with pytest.raises(ValueError):
+            c.inc(club="1")
+
+    def test_label_escaping(self):
+        c = Counter("x_total", "doc", ["club"])
+        c.inc(club='a"b')
+        assert c.samples() == ['x_total{club="a\\"b"} 1']
+
+
+class TestGauge:
+    def test_set_overwrites(self):
+        g = Gauge("g", "doc", ["club"])
+        g.set(5, club="1")
+        g.set(2, club="1")
+        assert g.value(club="1") == 2
+
+
+class TestHistogram:
+    def test_cumulative_buckets(self):
+        h = Histogram("h", "doc", buckets=(1, 5))
+        h.observe(0.5)
+        h.observe(3)
+        h.observe(10)
+        assert h.samples() == [
+            'h_bucket{le="1"} 1',
+            'h_bucket{le="5"} 2',
+            'h_bucket{le="+Inf"} 3',
+            "h_sum 13.5",
+            "h_count 3",
+        ]
+        assert h.count() == 3
+
+
+class TestRegistry:
+    def test_render_has_help_and_type(self):
+        reg = Registry()
+        c = Counter("x_total", "Un compteur.")
+        reg.register(c)
+        c.inc()
+        assert reg.render() == (
+            "# HELP x_total Un compteur.\n# TYPE x_total counter\nx_total 1\n"
+        )
+
+    def test_write_textfile(self, tmp_path):
+        reg = Registry()
+        reg.register(Counter("x_total", "doc"))
+        path = tmp_path / "mypacer.prom"
+        reg.write_textfile(str(path))
+        assert "# TYPE x_total counter" in path.read_text()
+        assert not (tmp_path / "mypacer.prom.tmp").exists()
+
+
+# ── Instrumentation du pipeline ─────────────────────────────────────
+
+
+class TestPipelineHooks:
+    @patch("requests.get")
+    def test_fetch_counts(self, mock_get: MagicMock):
+        mock_response = MagicMock()
+        mock_response.text = "<html></html>"
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+
+        fetch_club_page("033033", 2026)
+
+        assert metrics.PAGES_FETCHED.value(club="033033") == 1
+        assert metrics.HTTP_RESPONSES.value(code="200") == 1
+        assert metrics.FETCH_SECONDS.count() == 1
+
+    def test_parse_rows(self, sample_soup):
+        rows = parse_raw_results(sample_soup)
+        assert metrics.PARSED_ROWS.value() == len(rows)
+        assert metrics.PARSE_SECONDS.count() == 1
+
+    def test_highlights(self, make_result):
+        process_results([make_result(niveau="N1")], today=datetime(2026, 2, 15))
+        assert metrics.ANALYZED_RESULTS.value() == 1
+        assert metrics.HIGHLIGHTS.value() == 1
+
+    def test_backfill_week_counted(self, make_result):
+        from mypacer_club import backfill
+
+        rows = [make_result(date="03/02", niveau="N1"), make_result(date="04/02")]
+        index = backfill.SeasonIndex(rows, 2026)
+        week = backfill.render_week(index, "Club", datetime(2026, 2, 2))
+        assert metrics.ANALYZED_RESULTS.value() == 2
+        assert metrics.HIGHLIGHTS.value() == len(week.report.highlights) == 1
+
+    def test_send(self, fake_resend):
+        import resend
+
+        url = resend.api_url
+        try:
+            messages = [Message("a@b.fr", "S", "<p>x</p>")]
+            send_messages("key", messages, base_url=fake_resend.url)
+            fake_resend.fail_next = [422]
+            send_messages("key", messages, base_url=fake_resend.url)
+        finally:
+            resend.api_url = url
+        assert metrics.EMAIL_BYTES.count() == 1
+        assert metrics.SEND_SECONDS.count() == 2
+        assert metrics.SEND_FAILURES.value() == 1
+
+
+class TestMetricsEndpoint:
+    def test_daemon_serves_metrics(self):
+        metrics.PARSED_ROWS.inc(7)
+        srv = start_status_server(Daemon([], None), 0)
+        try:
+            url = f"http://127.0.0.1:{srv.server_address[1]}/metrics"
+            with urllib.request.urlopen(url) as resp:
+                body = resp.read().decode()
+        finally:
+            srv.shutdown()
+        assert "mypacer_parsed_rows_total 7" in body
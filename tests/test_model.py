@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from freezegun import freeze_time
+
+from mypacer_club.model import build_report_model, is_high_level, week_start
+
+# ── week_start ──────────────────────────────────────────────────────
+
+
+class TestWeekStart:
+    def test_monday_run(self):
+        assert week_start(datetime(2026, 2, 16, 8, 30)) == datetime(2026, 2, 9)
+
+    def test_wednesday_run(self):
+        assert week_start(datetime(2026, 2, 18)) == datetime(2026, 2, 9)
+
+    def test_sunday_run(self):
+        assert week_start(datetime(2026, 2, 22)) == datetime(2026, 2, 9)
+
+    @freeze_time("2026-02-17")
+    def test_defaults_to_now(self):
+        assert week_start() == datetime(2026, 2, 9)
+
+
+class TestIsHighLevel:
+    def test_national(self):
+        assert is_high_level("N3")
+
+    def test_inter(self):
+        assert is_high_level("IR2")
+
+    def test_departemental(self):
+        assert not is_high_level("D4")
+
+
+# ── build_report_model ──────────────────────────────────────────────
+
+
+class TestBuildReportModel:
+    def test_stats(self, make_result):
+        recent = [
+            make_result(nom="A", niveau="N3"),
+            make_result(nom="B", niveau="IR1"),
+            make_result(nom="A", niveau="Dep"),
+        ]
+        model = build_report_model("Club", recent, [recent[0]])
+        assert model.nb_athletes == 2
+        assert model.nb_high == 2
+        assert model.nb_highlights == 1
+
+    def test_meetings_grouped_in_order(self, make_result):
+        recent = [
+            make_result(nom="A", date="10/02", ville="Paris"),
+            make_result(nom="B", date="10/02", ville="Paris"),
+            make_result(nom="A", date="11/02", ville="Lyon"),
+        ]
+        model = build_report_model("Club", recent, [])
+        assert [(m.date, m.ville) for m in model.meetings] == [
+            ("10/02", "Paris"),
+            ("11/02", "Lyon"),
+        ]
+        assert len(model.meetings[0].results) == 2
+        assert model.meetings[0].athletes == {"A", "B"}
+
+    def test_by_athlete(self, make_result):
+        recent = [make_result(nom="A"), make_result(nom="B"), make_result(nom="A")]
+        model = build_report_model("Club", recent, [])
+        assert list(model.by_athlete) == ["A", "B"]
+        assert len(model.by_athlete["A"]) == 2
+
+    def test_single_clock(self, make_result):
+        today = datetime(2026, 2, 17, 6, 0)
+        model = build_report_model("Club", [make_result()], [], today=today)
+        assert model.generated_at == today
+        assert model.week_label == "09/02"
+
+    def test_preheader(self, make_result):
+        model = build_report_model("US TALENCE", [make_result()], [])
+        assert model.preheader == "1 athlètes · 0 highlights · US TALENCE"
+
+    def test_empty(self):
+        model = build_report_model("Club", [], [])
+        assert model.nb_athletes == 0
+        assert model.meetings == []
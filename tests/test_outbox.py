@@ -0,0 +1,122 @@
+import pytest
+import resend
+
+from mypacer_club.outbox import Outbox, make_key
+
+
+@pytest.fixture(autouse=True)
+def restore_api_url():
+    url = resend.api_url
+    yield
+    resend.api_url = url
+
+
+@pytest.fixture
+def box(tmp_path):
+    b = Outbox(str(tmp_path / "outbox.db"))
+    yield b
+    b.close()
+
+
+# ── make_key ────────────────────────────────────────────────────────
+
+
+class TestMakeKey:
+    def test_key_components(self):
+        assert make_key("033033", "2026-02-09", "a@b.fr") == "033033:2026-02-09:a@b.fr"
+
+    def test_recipient_normalized(self):
+        assert make_key("1", "w", " A@B.fr ") == make_key("1", "w", "a@b.fr")
+
+
+# ── Outbox ──────────────────────────────────────────────────────────
+
+
+class TestEnqueue:
+    def test_enqueue_new(self, box):
+        assert box.enqueue("033033", "2026-02-09", "a@b.fr", "Sujet", "<p>x</p>")
+        assert len(box.pending()) == 1
+
+    def test_enqueue_is_idempotent(self, box):
+        box.enqueue("033033", "2026-02-09", "a@b.fr", "Sujet", "<p>x</p>")
+        assert not box.enqueue("033033", "2026-02-09", "a@b.fr", "Sujet", "<p>y</p>")
+        assert len(box.pending()) == 1
+        assert box.pending()[0].html == "<p>x</p>"
+
+    def test_other_week_is_new_message(self, box):
+        box.enqueue("033033", "2026-02-09", "a@b.fr", "Sujet", "<p>x</p>")
+        assert box.enqueue("033033", "2026-02-16", "a@b.fr", "Sujet", "<p>x</p>")
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "outbox.db")
+        first = Outbox(path)
+        first.enqueue("033033", "2026-02-09", "a@b.fr", "Sujet", "<p>x</p>")
+        first.close()
+        second = Outbox(path)
+        assert second.has(make_key("033033", "2026-02-09", "a@b.fr"))
+        second.close()
+
+
+class TestMarkFailed:
+    def test_retried_until_max_attempts(self, box):
+        box.enqueue("1", "w", "a@b.fr", "S", "h")
+        key = make_key("1", "w", "a@b.fr")
+        box.mark_failed([(key, "boom")], max_attempts=2)
+        assert box.get(key).status == "pending"
+        box.mark_failed([(key, "boom")], max_attempts=2)
+        entry = box.get(key)
+        assert entry.status == "dead"
+        assert entry.attempts == 2
+        assert entry.last_error == "boom"
+        assert box.pending() == []
+
+
+class TestDrain:
+    def test_sends_pending_and_marks_sent(self, box, fake_resend):
+        box.enqueue("1", "w", "a@b.fr", "S", "h")
+        box.enqueue("1", "w", "c@d.fr", "S", "h")
+        report = box.drain("key", base_url=fake_resend.url)
+        assert report.sent == 2
+        assert box.pending() == []
+        assert box.get(make_key("1", "w", "a@b.fr")).status == "sent"
+
+    def test_second_drain_sends_nothing(self, box, fake_resend):
+        box.enqueue("1", "w", "a@b.fr", "S", "h")
+        box.drain("key", base_url=fake_resend.url)
+        box.drain("key", base_url=fake_resend.url)
+        assert len(fake_resend.emails) == 1
+
+    def test_reenqueue_after_send_does_not_resend(self, box, fake_resend):
+        box.enqueue("1", "w", "a@b.fr", "S", "h")
+        box.drain("key", base_url=fake_resend.url)
+        box.enqueue("1", "w", "a@b.fr", "S", "h")
+        box.drain("key", base_url=fake_resend.url)
+        assert len(fake_resend.emails) == 1
+
+    def test_sends_idempotency_key(self, box, fake_resend):
+        box.enqueue("1", "w", "a@b.fr", "S", "h")
+        box.drain("key", base_url=fake_resend.url)
+        _, headers = fake_resend.requests[0]
+        assert "Idempotency-Key" in headers
+
+    def test_idempotency_key_per_message(self, box, fake_resend):
+        for to in ("a@b.fr", "c@d.fr"):
+            box.enqueue("1", "w", to, "S", "h")
+        # Un drain partiel puis le reste : chaque message garde sa clé
+        box.drain("key", base_url=fake_resend.url, limit=1)
+        box.drain("key", base_url=fake_resend.url)
+        sent = {
+            h["Idempotency-Key"]
+            for path, h in fake_resend.requests
+            if path == "/emails"
+        }
+        assert sent == {make_key("1", "w", "a@b.fr"), make_key("1", "w", "c@d.fr")}
+
+    def test_failure_kept_pending(self, box, fake_resend):
+        fake_resend.fail_next = [422]
+        box.enqueue("1", "w", "a@b.fr", "S", "h")
+        report = box.drain("key", base_url=fake_resend.url)
+        assert report.sent == 0
+        entry = box.get(make_key("1", "w", "a@b.fr"))
+        assert entry.status == "pending"
+        assert entry.attempts == 1
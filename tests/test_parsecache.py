@@ -0,0 +1,107 @@
+import os
+import time
+from datetime import datetime
+
+from mypacer_club import metrics, pipeline, scraper, synthetic
+from mypacer_club.parsecache import RecordCache
+from mypacer_club.stringpool import StringPool
+
+NOW = datetime(2026, 2, 16, 8, 0)
+
+
+def _page(seed: int = 1) -> scraper.Page:
+    return scraper.Page(0, synthetic.generate_page(rows=30, seed=seed, today=NOW))
+
+
+# ── RecordCache ─────────────────────────────────────────────────────
+
+
+class TestRecordCache:
+    def test_round_trip(self, tmp_path):
+        page = _page()
+        rows = scraper.parse_raw_results(page.soup)
+        cache = RecordCache(str(tmp_path))
+        cache.put("abcd", rows)
+        assert cache.get("abcd") == rows
+        assert cache.get("ef01") is None
+
+    def test_hit_skips_soup(self, tmp_path):
+        cache = RecordCache(str(tmp_path))
+        expected = cache.parse(_page())
+        page = _page()
+        assert cache.parse(page) == expected
+        assert page._soup is None
+        assert cache.hits == 1
+
+    def test_hit_strings_go_through_pool(self, tmp_path):
+        cache = RecordCache(str(tmp_path))
+        cache.parse(_page())
+        pool = StringPool()
+        rows = cache.parse(_page(), pool)
+        assert rows[0]["ville"] is pool.intern(str(rows[0]["ville"]))
+
+    def test_changed_page_is_reparsed(self, tmp_path):
+        cache = RecordCache(str(tmp_path))
+        cache.parse(_page(1))
+        assert cache.parse(_page(2)) == scraper.parse_raw_results(_page(2).soup)
+        assert cache.hits == 0
+
+    def test_parser_version_invalidates(self, tmp_path):
+        RecordCache(str(tmp_path), version=1).parse(_page())
+        cache = RecordCache(str(tmp_path), version=2)
+        cache.parse(_page())
+        assert cache.hits == 0
+        assert os.listdir(tmp_path) == ["v2"]
+
+    def test_only_version_dirs_removed(self, tmp_path):
+        for name in ("v1", "vendor", "videos", "v2-old"):
+            (tmp_path / name).mkdir()
+        RecordCache(str(tmp_path), version=2)
+        assert sorted(os.listdir(tmp_path)) == ["v2-old", "vendor", "videos"]
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        cache = RecordCache(str(tmp_path))
+        page = _page()
+        cache.parse(page)
+        with open(cache._path(cache.key(str(page.html))), "wb") as f:
+            f.write(b"pas du zlib")
+        assert cache.parse(_page()) == scraper.parse_raw_results(page.soup)
+        assert cache.hits == 0
+
+    def test_truncated_page_not_cached(self, tmp_path):
+        cache = RecordCache(str(tmp_path))
+        page = scraper.Page(0, None, _page().soup)
+        cache.parse(page)
+        assert not os.path.exists(cache.dir)
+
+    def test_compact(self, tmp_path):
+        cache = RecordCache(str(tmp_path))
+        page = _page()
+        cache.parse(page)
+        stored = os.path.getsize(cache._path(cache.key(str(page.html))))
+        assert stored < len(str(page.html).encode("utf-8")) / 5
+
+    def test_prune_removes_unused_entries(self, tmp_path):
+        cache = RecordCache(str(tmp_path))
+        cache.put("aa01", [])
+        cache.put("bb02", [])
+        old = time.time() - 90 * 86400
+        os.utime(cache._path("aa01"), (old, old))
+        assert cache.prune(max_age_days=60) == 1
+        assert cache.get("aa01") is None
+        assert cache.get("bb02") == []
+
+
+# ── Pipeline ────────────────────────────────────────────────────────
+
+
+class TestPipelineCache:
+    def test_second_run_served_from_cache(self, standin, tmp_path):
+        metrics.REGISTRY.reset()
+        kwargs = {"base_url": standin.url, "parse_cache_dir": str(tmp_path)}
+        first, html = pipeline.build_report("033033", NOW, **kwargs)
+        second, html_again = pipeline.build_report("033033", NOW, **kwargs)
+        assert html_again == html
+        assert second.recent == first.recent
+        assert metrics.PARSE_CACHE.value(result="hit") == standin.config.pages
+        assert metrics.PARSE_CACHE.value(result="miss") == standin.config.pages
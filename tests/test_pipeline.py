@@ -0,0 +1,103 @@
+import copy
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from mypacer_club import analyzer, model, pipeline, reporter, scraper, synthetic
+from mypacer_club.daemon import ClubJob
+from mypacer_club.scheduler import CronSchedule
+
+NOW = datetime(2026, 2, 16, 8, 0)
+
+FREE_THREADED = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def _job(club_id: str, to: str = "coach@club.fr") -> ClubJob:
+    return ClubJob(club_id, [to], CronSchedule.parse("0 7 * * 1"))
+
+
+def _render(raw: list[dict]) -> str:
+    recent, highlights = analyzer.process_results(raw, days=7, today=NOW)
+    report = model.build_report_model("US TALENCE", recent, highlights, today=NOW)
+    return reporter.render_html(report)
+
+
+# ── run_clubs ───────────────────────────────────────────────────────
+
+
+class TestRunClubs:
+    def test_every_club_sent(self, standin, fake_resend, capsys):
+        clubs = ["033033", "075001", "069002", "013001"]
+        failed = pipeline.run_clubs(
+            [_job(c, f"{c}@club.fr") for c in clubs],
+            "key",
+            NOW,
+            workers=4,
+            resend_url=fake_resend.url,
+            base_url=standin.url,
+        )
+        assert failed == {}
+        assert {e["to"][0] for e in fake_resend.emails} == {
+            f"{c}@club.fr" for c in clubs
+        }
+        assert len(standin.hits) == len(clubs) * standin.config.pages
+
+    def test_failed_club_reported(self, standin, fake_resend, capsys):
+        standin.fail_next = [404]
+        failed = pipeline.run_clubs(
+            [_job("033033"), _job("075001")],
+            "key",
+            NOW,
+            workers=1,
+            resend_url=fake_resend.url,
+            base_url=standin.url,
+        )
+        assert list(failed) == ["033033"]
+        assert len(fake_resend.emails) == 1
+
+    def test_unexpected_error_does_not_abort_batch(self, monkeypatch, capsys):
+        def run_job(club_id, *args, **kwargs):
+            if club_id == "075001":
+                raise RuntimeError("outbox verrouillée")
+
+        monkeypatch.setattr(pipeline, "run_job", run_job)
+        failed = pipeline.run_clubs(
+            [_job(c) for c in ("033033", "075001", "069002")], "key", NOW, workers=2
+        )
+        assert failed == {"075001": "RuntimeError: outbox verrouillée"}
+        assert "075001" in capsys.readouterr().err
+
+
+# ── Données partagées entre threads ─────────────────────────────────
+
+
+class TestSharedData:
+    def test_analysis_leaves_parsed_rows_intact(self):
+        html = synthetic.generate_page(rows=200, seed=4, today=NOW)
+        raw = scraper.parse_raw_results(scraper.Page(0, html).soup)
+        snapshot = copy.deepcopy(raw)
+        _render(raw)
+        assert raw == snapshot
+
+    def _stress(self, rounds: int = 200) -> None:
+        """Mêmes lignes parsées, analysées et rendues par 8 threads à la fois."""
+        html = synthetic.generate_page(rows=500, seed=5, today=NOW)
+        raw = scraper.parse_raw_results(scraper.Page(0, html).soup)
+        snapshot = copy.deepcopy(raw)
+        expected = _render(raw)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            outputs = list(pool.map(lambda _: _render(raw), range(rounds)))
+        assert set(outputs) == {expected}
+        assert raw == snapshot
+
+    def test_stress_threads(self):
+        self._stress(rounds=40)
+
+    @pytest.mark.skipif(not FREE_THREADED, reason="build free-threaded requis")
+    def test_stress_without_gil(self):
+        """PYTHON_GIL=0 : le GIL reste désactivé (aucune extension ne le
+        réactive) pendant que les threads partagent les lignes."""
+        self._stress()
+        assert not sys._is_gil_enabled()
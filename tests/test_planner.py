@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+
+from mypacer_club import analyzer, scraper
+from mypacer_club.planner import SeasonPlan, fetch_window, plan_seasons
+from mypacer_club.standin import AthleStandin, StandinConfig
+
+NEW_YEAR = datetime(2026, 1, 3, 8, 0)
+
+
+def _rows(soups) -> list[dict]:
+    return [r for s in soups for r in scraper.parse_raw_results(s)]
+
+
+# ── plan_seasons ────────────────────────────────────────────────────
+
+
+class TestPlanSeasons:
+    def test_single_season_outside_january(self):
+        assert plan_seasons(datetime(2026, 2, 16, 8, 0), 7) == [SeasonPlan(2026)]
+
+    def test_early_january_adds_previous_season_tail(self):
+        assert plan_seasons(NEW_YEAR, 7) == [
+            SeasonPlan(2026),
+            SeasonPlan(2025, since=datetime(2025, 12, 27)),
+        ]
+
+    def test_window_ending_on_january_first(self):
+        assert plan_seasons(datetime(2026, 1, 8, 8, 0), 7) == [SeasonPlan(2026)]
+
+
+# ── fetch_window ────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def new_year_standin():
+    """Faux athle.fr au 3 janvier : saison 2026 naissante, 2025 close."""
+    server = AthleStandin(StandinConfig(pages=3, rows=10, today=NEW_YEAR)).start()
+    yield server
+    server.stop()
+
+
+class TestFetchWindow:
+    def test_same_as_full_crawl_outside_january(self, standin):
+        today = datetime(2026, 2, 16, 8, 0)
+        pages, raw = fetch_window("033033", today, 7, base_url=standin.url)
+        full, full_raw = scraper.fetch_all_club_pages(
+            "033033", 2026, base_url=standin.url
+        )
+        assert _rows(p.soup for p in pages) == _rows(full)
+        assert raw == full_raw
+        assert {h.year for h in standin.hits} == {2026}
+
+    def test_previous_season_fetched_partially(self, new_year_standin):
+        pages, _ = fetch_window("033033", NEW_YEAR, 7, base_url=new_year_standin.url)
+        previous = [h for h in new_year_standin.hits if h.year == 2025]
+        assert previous
+        assert len(previous) < 3
+        # Saison en cours complète, puis la fin de décembre
+        rows = _rows(p.soup for p in pages)
+        december = [r for r in rows if r["date"].endswith("/12")]
+        assert december
+        assert all(r["date"] >= "27/12" for r in december)
+        assert len(rows) == 30 + len(december)
+
+    def test_december_results_reach_the_report(self, new_year_standin):
+        pages, _ = fetch_window("033033", NEW_YEAR, 7, base_url=new_year_standin.url)
+        recent, _ = analyzer.process_results(
+            _rows(p.soup for p in pages), days=7, today=NEW_YEAR
+        )
+        years = {r["_dt"].year for r in recent}
+        assert years == {2025, 2026}
+        assert all(r["_dt"] <= NEW_YEAR for r in recent)
@@ -0,0 +1,142 @@
+import os
+import pstats
+import time
+from datetime import datetime
+
+import pytest
+
+from mypacer_club import pipeline, profiling
+from mypacer_club.analyzer import process_results
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    p = profiling.enable("all", str(tmp_path), top=5)
+    yield p
+    profiling.disable()
+
+
+# ── stage ───────────────────────────────────────────────────────────
+
+
+class TestStage:
+    def test_disabled_is_noop(self):
+        with profiling.stage("parse"):
+            pass
+        assert profiling._profiler is None
+
+    def test_cpu_only_collects_no_memory(self, tmp_path):
+        p = profiling.enable("cpu", str(tmp_path))
+        try:
+            with profiling.stage("analyze"):
+                sum(range(1000))
+        finally:
+            profiling.disable()
+        assert list(p.cpu_stages) == ["analyze"]
+        assert p.mem_stages == {}
+
+    def test_mem_records_peak_and_top(self, profiler):
+        with profiling.stage("render"):
+            blob = [bytearray(1000) for _ in range(100)]
+        st = profiler.mem_stages["render"]
+        assert st.peak >= 100_000
+        assert 0 < len(st.top) <= 5
+        assert blob
+
+    def test_mem_top_taken_at_peak(self, profiler):
+        with profiling.stage("parse"):
+            blob = [bytearray(10_000) for _ in range(500)]
+            time.sleep(0.05)
+            del blob
+        st = profiler.mem_stages["parse"]
+        # Libéré avant la fin de l'étape, mais toujours en tête au pic
+        assert "test_profiling.py" in st.top[0]
+        assert st.peak >= 5_000_000
+
+    def test_stages_accumulate(self, profiler):
+        for _ in range(2):
+            with profiling.stage("fetch"):
+                pass
+        assert list(profiler.cpu_stages) == ["fetch"]
+
+    def test_exception_still_recorded(self, profiler):
+        with pytest.raises(ValueError), profiling.stage("parse"):
+            raise ValueError("boom")
+        assert "parse" in profiler.cpu_stages
+        assert "parse" in profiler.mem_stages
+
+
+# ── rapport ─────────────────────────────────────────────────────────
+
+
+class TestReport:
+    def test_hot_functions_project_only(self, profiler, make_result):
+        raw = [make_result(date="01/02") for _ in range(20)]
+        with profiling.stage("analyze"):
+            process_results(raw)
+        rows = profiler.hot_functions("analyze")
+        assert rows
+        assert all(label.startswith("analyzer.py:") for label, *_ in rows)
+        # Trié par temps cumulé décroissant
+        cumul = [ct for *_, ct in rows]
+        assert cumul == sorted(cumul, reverse=True)
+
+    def test_hot_functions_unknown_stage(self, profiler):
+        assert profiler.hot_functions("nope") == []
+
+    def test_write_pstats_and_mem(self, profiler, tmp_path):
+        with profiling.stage("parse"):
+            sum(range(1000))
+        paths = profiler.write()
+        assert sorted(os.path.basename(p) for p in paths) == [
+            "parse.mem.txt",
+            "parse.pstats",
+        ]
+        pstats.Stats(str(tmp_path / "parse.pstats"))  # relisible par pstats
+        assert (tmp_path / "parse.mem.txt").read_text().startswith("peak: ")
+
+    def test_print_report(self, profiler, capsys):
+        with profiling.stage("render"):
+            pass
+        profiler.print_report()
+        out = capsys.readouterr().out
+        assert "🔥 [render]" in out
+        assert "🧠 [render]" in out
+
+
+# ── Pipeline ────────────────────────────────────────────────────────
+
+
+class TestPipelineStages:
+    def test_build_report_profiles_each_stage(self, profiler):
+        pipeline.build_report(
+            "033033",
+            datetime(2026, 2, 16, 8, 0),
+            sample="tests/fixtures/sample_table.html",
+        )
+        assert list(profiler.cpu_stages) == ["fetch", "parse", "analyze", "render"]
+
+    def test_club_threads_skip_cpu(self, tmp_path, standin, fake_resend, capsys):
+        from mypacer_club.daemon import ClubJob
+        from mypacer_club.scheduler import CronSchedule
+
+        p = profiling.enable("cpu", str(tmp_path))
+        try:
+            failed = pipeline.run_clubs(
+                [
+                    ClubJob(c, ["coach@club.fr"], CronSchedule.parse("0 7 * * 1"))
+                    for c in ("033033", "075001", "069002", "013001")
+                ],
+                "key",
+                datetime(2026, 2, 16, 8, 0),
+                workers=4,
+                resend_url=fake_resend.url,
+                base_url=standin.url,
+            )
+        finally:
+            profiling.disable()
+        assert failed == {}
+        assert p.cpu_stages == {}
+        assert p.cpu_skipped > 0
+        p.print_report()
+        assert "thread principal" in capsys.readouterr().out
@@ -1,16 +1,24 @@
+import sys
 from unittest.mock import MagicMock, patch
 
 from freezegun import freeze_time
 
+from mypacer_club.model import build_report_model
 from mypacer_club.reporter import (
+    _fit,
     _generate_cards,
     _generate_congrats,
     _generate_dashboard,
+    _generate_results_section,
     format_html_report,
     send_email,
 )
 
 
+def _model(recent, highlights=()):
+    return build_report_model("Club", recent, list(highlights))
+
+
 # ── _generate_dashboard ─────────────────────────────────────────────
 
 
@@ -21,13 +29,13 @@ class TestGenerateDashboard:
             make_result(nom="B"),
             make_result(nom="A"),  # duplicate
         ]
-        html = _generate_dashboard(recent, [])
+        html = _generate_dashboard(_model(recent, []))
         assert ">2<" in html  # 2 unique athletes
 
     def test_highlights_count(self, make_result):
         recent = [make_result()]
         highlights = [make_result(), make_result()]
-        html = _generate_dashboard(recent, highlights)
+        html = _generate_dashboard(_model(recent, highlights))
         # The "2" for highlights should appear in the HTML
         assert ">2<" in html
 
@@ -38,15 +46,15 @@ class TestGenerateDashboard:
             make_result(niveau="IA2"),
             make_result(niveau="Dep"),
         ]
-        html = _generate_dashboard(recent, [])
+        html = _generate_dashboard(_model(recent, []))
         assert ">3<" in html  # N3, IR1, IA2
 
     def test_empty_lists(self):
-        html = _generate_dashboard([], [])
+        html = _generate_dashboard(_model([], []))
         assert ">0<" in html
 
     def test_niveau_national_label(self, make_result):
-        html = _generate_dashboard([make_result()], [])
+        html = _generate_dashboard(_model([make_result()], []))
         assert "Perfs IR et Nat." in html
 
 
@@ -57,19 +65,19 @@ class TestGenerateCongrats:
     def test_with_highlights(self, make_result):
         recent = [make_result(nom="A"), make_result(nom="B")]
         highlights = [make_result()]
-        html = _generate_congrats(recent, highlights)
+        html = _generate_congrats(_model(recent, highlights))
         assert "Bravo" in html
         assert "performances remarquables" in html
         assert "2 athlètes" in html
 
     def test_without_highlights(self, make_result):
         recent = [make_result(nom="A"), make_result(nom="B")]
-        html = _generate_congrats(recent, [])
+        html = _generate_congrats(_model(recent, []))
         assert "en compétition" in html
         assert "Bravo" not in html
 
     def test_no_results(self):
-        html = _generate_congrats([], [])
+        html = _generate_congrats(_model([], []))
         assert html == ""
 
 
@@ -223,32 +231,116 @@ class TestFormatHtmlReport:
         assert "Partagez" in html
 
 
+# ── Budget de taille ────────────────────────────────────────────────
+
+
+def _many_results(make_result, n: int = 600) -> list:
+    return [
+        make_result(nom=f"ATHLETE {i % 30}", date=f"{i % 7 + 1}/02", ville="Paris")
+        for i in range(n)
+    ]
+
+
+class TestFit:
+    def test_fits_within_budget(self):
+        assert _fit(["ab", "cd"], 4) == "abcd"
+
+    def test_over_budget_returns_none(self):
+        assert _fit(["ab", "cd"], 3) is None
+
+    def test_stops_consuming_when_over_budget(self):
+        consumed = []
+
+        def gen():
+            for frag in ["aaaa", "bbbb", "cccc"]:
+                consumed.append(frag)
+                yield frag
+
+        assert _fit(gen(), 5) is None
+        assert consumed == ["aaaa", "bbbb"]
+
+    def test_counts_utf8_bytes(self):
+        assert _fit(["é"], 1) is None
+
+
+class TestResultsSection:
+    def test_full_cards_when_budget_allows(self, make_result):
+        html = _generate_results_section(_model([make_result()]), 100_000)
+        assert "condensée" not in html
+        assert "border-left: 5px solid" in html
+
+    def test_collapses_to_one_line_per_athlete(self, make_result):
+        recent = _many_results(make_result)
+        cards_size = len(_generate_cards(recent).encode("utf-8"))
+        html = _generate_results_section(_model(recent), cards_size // 2)
+        assert "condensée" in html
+        assert "border-left: 5px solid" not in html
+        assert html.count("ATHLETE 7<") == 1
+
+    def test_groups_by_meeting_when_still_too_big(self, make_result):
+        recent = _many_results(make_result)
+        html = _generate_results_section(_model(recent), 3_000)
+        assert "condensée" in html
+        assert "résultats," in html
+        assert "ATHLETE" not in html
+
+    def test_empty_recent(self):
+        html = _generate_results_section(_model([]), 0)
+        assert "Aucune" in html
+
+
+@freeze_time("2026-02-17")
+class TestFormatHtmlReportBudget:
+    def test_stays_under_budget(self, make_result):
+        recent = _many_results(make_result, 2000)
+        html = format_html_report("Club", recent, [], max_bytes=40_000)
+        assert len(html.encode("utf-8")) <= 40_000
+
+    def test_highlights_and_dashboard_always_kept(self, make_result):
+        recent = _many_results(make_result, 2000)
+        hl = [make_result(nom="CHAMPION", is_podium=True, place=1)]
+        html = format_html_report("Club", recent, hl, max_bytes=20_000)
+        assert "Podiums et hautes performances" in html
+        assert "CHAMPION" in html
+        assert "Athlètes" in html
+        assert "Résultats (2000)" in html
+
+    def test_small_report_unchanged(self, make_result):
+        html = format_html_report("Club", [make_result()], [])
+        assert "condensée" not in html
+
+
 # ── send_email ───────────────────────────────────────────────────────
 
 
 class TestSendEmail:
-    @patch("mypacer_club.reporter.resend")
-    def test_sends_via_resend(self, mock_resend: MagicMock):
+    @patch("resend.api_key", None)
+    @patch("resend.Emails.send")
+    def test_sends_via_resend(self, mock_send: MagicMock):
         send_email("key123", "to@test.com", "Subject", "<p>Body</p>")
-        mock_resend.Emails.send.assert_called_once()
-        call_args = mock_resend.Emails.send.call_args[0][0]
+        mock_send.assert_called_once()
+        call_args = mock_send.call_args[0][0]
         assert call_args["to"] == ["to@test.com"]
         assert call_args["subject"] == "Subject"
         assert call_args["html"] == "<p>Body</p>"
 
-    @patch("mypacer_club.reporter.resend")
-    def test_sets_api_key(self, mock_resend: MagicMock):
+    @patch("resend.api_key", None)
+    @patch("resend.Emails.send")
+    def test_sets_api_key(self, mock_send: MagicMock):
+        import resend
+
         send_email("my-api-key", "to@test.com", "Sub", "<p>x</p>")
-        assert mock_resend.api_key == "my-api-key"
+        assert resend.api_key == "my-api-key"
 
-    @patch("mypacer_club.reporter.resend")
-    def test_handles_send_exception(self, mock_resend: MagicMock, capsys):
-        mock_resend.Emails.send.side_effect = Exception("API error")
+    @patch("resend.api_key", None)
+    @patch("resend.Emails.send")
+    def test_handles_send_exception(self, mock_send: MagicMock, capsys):
+        mock_send.side_effect = Exception("API error")
         send_email("key", "to@test.com", "Sub", "<p>x</p>")
         captured = capsys.readouterr()
         assert "Erreur Resend" in captured.out
 
-    @patch("mypacer_club.reporter.resend", None)
+    @patch.dict(sys.modules, {"resend": None})
     def test_missing_resend_module(self, capsys):
         send_email("key", "to@test.com", "Sub", "<p>x</p>")
         captured = capsys.readouterr()
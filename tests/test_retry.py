@@ -0,0 +1,24 @@
+from mypacer_club import retry
+
+# ── delay ───────────────────────────────────────────────────────────
+
+
+class TestDelay:
+    def test_exponential_backoff(self):
+        assert retry.delay(None, 0, 0.5) == 0.5
+        assert retry.delay({}, 2, 0.5) == 2.0
+
+    def test_honours_retry_after(self):
+        assert retry.delay({"Retry-After": "3"}, 0, 0.5) == 3.0
+        assert retry.delay({"retry-after": "3"}, 0, 0.5) == 3.0
+
+    def test_retry_after_capped(self):
+        assert retry.delay({"Retry-After": "3600"}, 0, 0.5) == retry.MAX_DELAY
+        assert retry.delay({"Retry-After": "3600"}, 0, 0.5, max_delay=5) == 5
+
+    def test_backoff_capped(self):
+        assert retry.delay(None, 20, 1.0) == retry.MAX_DELAY
+
+    def test_unparsable_retry_after_falls_back(self):
+        header = {"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"}
+        assert retry.delay(header, 1, 0.5) == 1.0
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+
+from mypacer_club.scheduler import CronSchedule
+
+# ── CronSchedule.parse ──────────────────────────────────────────────
+
+
+class TestParse:
+    def test_wildcards(self):
+        s = CronSchedule.parse("* * * * *")
+        assert len(s.minutes) == 60
+        assert len(s.weekdays) == 7
+
+    def test_list_and_range(self):
+        s = CronSchedule.parse("0,30 6-8 * * 1-5")
+        assert s.minutes == {0, 30}
+        assert s.hours == {6, 7, 8}
+        assert s.weekdays == {1, 2, 3, 4, 5}
+
+    def test_step(self):
+        assert CronSchedule.parse("*/15 * * * *").minutes == {0, 15, 30, 45}
+
+    def test_sunday_as_7(self):
+        assert CronSchedule.parse("0 7 * * 7").weekdays == {0}
+
+    def test_wrong_field_count(self):
+        with pytest.raises(ValueError):
+            CronSchedule.parse("0 7 * *")
+
+    def test_out_of_range(self):
+        with pytest.raises(ValueError):
+            CronSchedule.parse("60 7 * * *")
+
+
+# ── matches / next_after ────────────────────────────────────────────
+
+
+class TestNextAfter:
+    def test_monday_morning(self):
+        s = CronSchedule.parse("30 7 * * 1")
+        # Mercredi 18/02/2026 -> lundi 23/02/2026 7h30
+        assert s.next_after(datetime(2026, 2, 18, 12, 0)) == datetime(
+            2026, 2, 23, 7, 30
+        )
+
+    def test_strictly_after(self):
+        s = CronSchedule.parse("30 7 * * 1")
+        assert s.next_after(datetime(2026, 2, 23, 7, 30)) == datetime(2026, 3, 2, 7, 30)
+
+    def test_same_day_later(self):
+        s = CronSchedule.parse("0 8 * * *")
+        assert s.next_after(datetime(2026, 2, 18, 7, 59, 30)) == datetime(
+            2026, 2, 18, 8, 0
+        )
+
+    def test_month_rollover(self):
+        s = CronSchedule.parse("0 6 1 * *")
+        assert s.next_after(datetime(2026, 12, 15)) == datetime(2027, 1, 1, 6, 0)
+
+    def test_dom_or_dow_when_both_restricted(self):
+        s = CronSchedule.parse("0 6 15 * 1")
+        # 15/02/2026 est un dimanche, le lundi 16 arrive après
+        assert s.next_after(datetime(2026, 2, 14, 12, 0)) == datetime(2026, 2, 15, 6, 0)
+        assert s.next_after(datetime(2026, 2, 15, 12, 0)) == datetime(2026, 2, 16, 6, 0)
+
+    def test_matches(self):
+        s = CronSchedule.parse("30 7 * * 1")
+        assert s.matches(datetime(2026, 2, 23, 7, 30))
+        assert not s.matches(datetime(2026, 2, 24, 7, 30))
+
+    def test_impossible_date(self):
+        with pytest.raises(ValueError):
+            CronSchedule.parse("0 0 31 2 *").next_after(datetime(2026, 1, 1))
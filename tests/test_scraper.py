@@ -4,7 +4,9 @@ from unittest.mock import MagicMock, patch
 import pytest
 from bs4 import BeautifulSoup
 
+from mypacer_club import retry
 from mypacer_club.scraper import (
+    FetchError,
     _get_total_pages,
     extract_club_name,
     fetch_all_club_pages,
@@ -35,7 +37,7 @@ class TestLoadLocalPage:
 
 
 class TestFetchClubPage:
-    @patch("mypacer_club.scraper.requests.get")
+    @patch("requests.get")
     def test_success(self, mock_get: MagicMock):
         mock_response = MagicMock()
         mock_response.text = "<html><body>OK</body></html>"
@@ -51,14 +53,36 @@ class TestFetchClubPage:
         assert "033033" in call_url
         assert "2026" in call_url
 
-    @patch("mypacer_club.scraper.requests.get")
-    def test_http_error_exits(self, mock_get: MagicMock):
+    @patch("mypacer_club.scraper.time.sleep")
+    @patch("requests.get")
+    def test_http_error_raises(self, mock_get: MagicMock, mock_sleep: MagicMock):
         import requests
 
         mock_get.side_effect = requests.ConnectionError("timeout")
-        with pytest.raises(SystemExit):
+        with pytest.raises(FetchError):
             fetch_club_page("033033", 2026)
 
+    @patch("mypacer_club.scraper.time.sleep")
+    @patch("requests.get")
+    def test_network_error_retried_with_backoff(
+        self, mock_get: MagicMock, mock_sleep: MagicMock
+    ):
+        import requests
+
+        mock_get.side_effect = requests.ConnectionError("timeout")
+        with pytest.raises(FetchError):
+            fetch_club_page("033033", 2026, max_retries=2, backoff=1.0)
+        assert mock_get.call_count == 3
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0]
+
+    @patch("mypacer_club.scraper.time.sleep")
+    def test_retry_after_capped(self, mock_sleep: MagicMock, standin):
+        standin.fail_next = [429]
+        standin.config.retry_after = 3600
+        fetch_club_page("033033", 2026, base_url=standin.url)
+        # time.sleep est partagé avec le standin (latence simulée, 0 s)
+        assert max(c.args[0] for c in mock_sleep.call_args_list) == retry.MAX_DELAY
+
 
 # ── extract_club_name ───────────────────────────────────────────────
 
@@ -190,7 +214,7 @@ class TestGetTotalPages:
 
 
 class TestFetchClubPagePosition:
-    @patch("mypacer_club.scraper.requests.get")
+    @patch("requests.get")
     def test_with_position(self, mock_get: MagicMock):
         mock_response = MagicMock()
         mock_response.text = "<html><body>OK</body></html>"
@@ -202,7 +226,7 @@ class TestFetchClubPagePosition:
         call_url = mock_get.call_args[0][0]
         assert "frmposition=2" in call_url
 
-    @patch("mypacer_club.scraper.requests.get")
+    @patch("requests.get")
     def test_without_position(self, mock_get: MagicMock):
         mock_response = MagicMock()
         mock_response.text = "<html><body>OK</body></html>"
@@ -219,7 +243,7 @@ class TestFetchClubPagePosition:
 
 
 class TestFetchAllClubPages:
-    @patch("mypacer_club.scraper.requests.get")
+    @patch("requests.get")
     def test_single_page_no_extra_requests(self, mock_get: MagicMock):
         mock_response = MagicMock()
         mock_response.text = "<html><body>No pagination</body></html>"
@@ -231,7 +255,7 @@ class TestFetchAllClubPages:
         assert len(soups) == 1
         assert mock_get.call_count == 1
 
-    @patch("mypacer_club.scraper.requests.get")
+    @patch("requests.get")
     def test_multi_page_fetches_all(self, mock_get: MagicMock):
         page1_html = (
             "<html><body>"
@@ -0,0 +1,142 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+import pytest
+
+from mypacer_club import metrics, service
+from mypacer_club.service import ReportService, SingleFlightCache
+
+NOW = datetime(2026, 2, 16, 8, 0)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# ── SingleFlightCache ───────────────────────────────────────────────
+
+
+class TestSingleFlightCache:
+    def test_hit_until_ttl(self):
+        clock = FakeClock()
+        cache: SingleFlightCache[int] = SingleFlightCache(10, 8, clock)
+        assert cache.get("a", lambda: 1) == (1, "miss")
+        clock.now = 9
+        assert cache.get("a", lambda: 2) == (1, "hit")
+        clock.now = 10
+        assert cache.get("a", lambda: 3) == (3, "miss")
+
+    def test_lru_eviction(self):
+        cache: SingleFlightCache[str] = SingleFlightCache(60, 2)
+        cache.get("a", lambda: "a")
+        cache.get("b", lambda: "b")
+        cache.get("a", lambda: "a")  # "a" redevient la plus récente
+        cache.get("c", lambda: "c")
+        assert len(cache) == 2
+        assert cache.get("a", lambda: "x") == ("a", "hit")
+        assert cache.get("b", lambda: "x") == ("x", "miss")
+
+    def test_concurrent_requests_share_one_build(self):
+        cache: SingleFlightCache[int] = SingleFlightCache(60, 8)
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def build() -> int:
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 42
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(cache.get("a", build)))
+        leader.start()
+        started.wait(5)
+        followers = [
+            threading.Thread(target=lambda: results.append(cache.get("a", build)))
+            for _ in range(5)
+        ]
+        for t in followers:
+            t.start()
+        release.set()
+        for t in [leader, *followers]:
+            t.join(5)
+        assert len(calls) == 1
+        assert sorted(results) == [(42, "miss")] + [(42, "shared")] * 5
+
+    def test_error_not_cached(self):
+        cache: SingleFlightCache[int] = SingleFlightCache(60, 8)
+
+        def fail() -> int:
+            raise SystemExit(1)
+
+        with pytest.raises(SystemExit):
+            cache.get("a", fail)
+        assert cache.get("a", lambda: 1) == (1, "miss")
+
+    def test_ttl_per_value(self):
+        clock = FakeClock()
+        cache: SingleFlightCache[int | None] = SingleFlightCache(
+            60, 8, clock, ttl_for=lambda v: 5 if v is None else 60
+        )
+        cache.get("ok", lambda: 1)
+        cache.get("ko", lambda: None)
+        clock.now = 5
+        assert cache.get("ok", lambda: 2) == (1, "hit")
+        assert cache.get("ko", lambda: 3) == (3, "miss")
+
+
+# ── Serveur ─────────────────────────────────────────────────────────
+
+
+class TestReportServer:
+    @pytest.fixture
+    def server(self, standin):
+        build = service.pipeline_builder(base_url=standin.url, clock=lambda: NOW)
+        srv = service.make_server(ReportService(build), 0)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        yield f"http://127.0.0.1:{srv.server_address[1]}"
+        srv.shutdown()
+        srv.server_close()
+
+    def test_report_then_results_from_cache(self, server, standin):
+        metrics.REGISTRY.reset()
+        with urllib.request.urlopen(f"{server}/clubs/033033/report") as resp:
+            assert resp.headers["Content-Type"].startswith("text/html")
+            assert b"<html" in resp.read()
+        crawled = len(standin.hits)
+        with urllib.request.urlopen(f"{server}/clubs/033033/results") as resp:
+            payload = json.loads(resp.read())
+        assert len(standin.hits) == crawled
+        assert payload["week_start"] == "2026-02-09"
+        assert all("_dt" not in r for r in payload["recent"])
+        assert metrics.REPORT_CACHE.value(result="hit") == 1
+
+    def test_burst_crawls_once(self, server, standin):
+        def fetch() -> None:
+            with urllib.request.urlopen(f"{server}/clubs/075001/report") as resp:
+                resp.read()
+
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+        assert len([h for h in standin.hits if h.position == 0]) == 1
+
+    def test_unknown_route(self, server):
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(f"{server}/clubs/033033/other")
+        assert exc.value.code == 404
+
+    def test_scraping_error_is_502(self, server, standin):
+        standin.fail_next = [404]
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(f"{server}/clubs/033033/report")
+        assert exc.value.code == 502
@@ -0,0 +1,149 @@
+import random
+from datetime import datetime
+
+import pytest
+import requests
+
+from mypacer_club import scraper
+from mypacer_club.standin import AthleStandin, Latency, StandinConfig
+
+NOW = datetime(2026, 2, 16, 8, 0)
+
+
+def _rows(soups) -> list[dict]:
+    return [r for s in soups for r in scraper.parse_raw_results(s)]
+
+
+# ── Latency ─────────────────────────────────────────────────────────
+
+
+class TestLatency:
+    def test_fixed(self):
+        assert Latency.parse("0.2").sample(random.Random(0)) == 0.2
+
+    def test_uniform(self):
+        lat = Latency.parse("0.05-0.3")
+        rng = random.Random(0)
+        assert all(0.05 <= lat.sample(rng) <= 0.3 for _ in range(50))
+
+    def test_lognormal_median(self):
+        lat = Latency.parse("lognormal:0.2:0.5")
+        rng = random.Random(0)
+        samples = sorted(lat.sample(rng) for _ in range(1001))
+        assert 0.15 < samples[500] < 0.25
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="Latence invalide"):
+            Latency.parse("vite")
+
+
+# ── Pages servies ───────────────────────────────────────────────────
+
+
+class TestPages:
+    def test_fetch_all_pages(self, standin):
+        soups, _ = scraper.fetch_all_club_pages("033033", 2026, base_url=standin.url)
+        assert len(soups) == 3
+        assert len(_rows(soups)) == 30
+        assert [h.position for h in standin.hits] == [0, 1, 2]
+
+    def test_clubs_are_distinct(self, standin):
+        a, _ = scraper.fetch_club_page("033033", 2026, base_url=standin.url)
+        b, _ = scraper.fetch_club_page("075001", 2026, base_url=standin.url)
+        assert scraper.parse_raw_results(a) != scraper.parse_raw_results(b)
+
+    def test_out_of_range_is_404(self, standin):
+        r = requests.get(scraper.page_url("033033", 2026, 9, standin.url), timeout=5)
+        assert r.status_code == 404
+
+    def test_missing_club_is_400(self, standin):
+        assert requests.get(standin.url, timeout=5).status_code == 400
+
+    def test_recorded_pages_served_first(self, tmp_path):
+        (tmp_path / "033033_2026_0.html").write_text(
+            "<html><body>Enregistrée</body></html>", encoding="utf-8"
+        )
+        server = AthleStandin(StandinConfig(recorded_dir=str(tmp_path))).start()
+        try:
+            _, raw = scraper.fetch_club_page("033033", 2026, base_url=server.url)
+            assert "Enregistrée" in raw
+        finally:
+            server.stop()
+
+    def test_concurrent_fetch_keeps_order(self, standin):
+        seq, _ = scraper.fetch_all_club_pages("033033", 2026, base_url=standin.url)
+        par, _ = scraper.fetch_all_club_pages(
+            "033033", 2026, base_url=standin.url, max_workers=3
+        )
+        assert _rows(par) == _rows(seq)
+
+
+# ── Pannes injectées ────────────────────────────────────────────────
+
+
+class TestFaults:
+    def test_429_retried_with_retry_after(self, standin):
+        standin.fail_next = [429, 503]
+        soup, _ = scraper.fetch_club_page(
+            "033033", 2026, base_url=standin.url, backoff=0
+        )
+        assert len(scraper.parse_raw_results(soup)) == 10
+        assert [h.status for h in standin.hits] == [429, 503, 200]
+
+    def test_gives_up_after_max_retries(self, standin):
+        standin.fail_next = [503, 503]
+        with pytest.raises(scraper.FetchError):
+            scraper.fetch_club_page(
+                "033033", 2026, base_url=standin.url, max_retries=1, backoff=0
+            )
+        assert len(standin.hits) == 2
+
+    def test_404_not_retried(self, standin):
+        with pytest.raises(scraper.FetchError):
+            scraper.fetch_club_page("033033", 2026, position=9, base_url=standin.url)
+        assert len(standin.hits) == 1
+
+    def test_random_throttling_is_seeded(self):
+        config = StandinConfig(rows=1, throttle_rate=0.5, retry_after=0, seed=3)
+        statuses = []
+        for _ in range(2):
+            server = AthleStandin(config).start()
+            try:
+                for _ in range(10):
+                    requests.get(scraper.page_url("033033", 2026, 0, server.url))
+                statuses.append([h.status for h in server.hits])
+            finally:
+                server.stop()
+        assert statuses[0] == statuses[1]
+        assert 429 in statuses[0]
+        assert 200 in statuses[0]
+
+
+# ── Insertion en cours de crawl ─────────────────────────────────────
+
+
+class TestMidCrawlInsert:
+    def test_insert_results_shifts_pages(self, standin):
+        before, _ = scraper.fetch_club_page("033033", 2026, base_url=standin.url)
+        standin.insert_results("033033", 2026, 4)
+        after, _ = scraper.fetch_club_page("033033", 2026, base_url=standin.url)
+        # Les 6 premières lignes d'avant sont maintenant décalées de 4
+        assert (
+            scraper.parse_raw_results(after)[4:]
+            == (scraper.parse_raw_results(before)[:6])
+        )
+        # Une page de plus (34 lignes sur des pages de 10)
+        assert scraper._get_total_pages(after) == 4
+
+    def test_insert_every_duplicates_rows_across_pages(self):
+        config = StandinConfig(pages=3, rows=10, insert_every=1, insert_rows=2)
+        server = AthleStandin(config).start()
+        try:
+            soups, _ = scraper.fetch_all_club_pages("033033", 2026, base_url=server.url)
+        finally:
+            server.stop()
+        rows = _rows(soups)
+        # Chaque insertion repousse des lignes déjà vues sur la page suivante
+        assert len(rows) == 30
+        keys = [tuple(r.values()) for r in rows]
+        assert len(set(keys)) < len(keys)
@@ -0,0 +1,81 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = str(Path(__file__).parent.parent / "src")
+SAMPLE_PATH = str(Path(__file__).parent / "fixtures" / "sample_table.html")
+
+# Budget d'import du point d'entrée (cumulé, -X importtime). Large marge par
+# rapport à la mesure locale (~15 ms) pour absorber les machines de CI.
+IMPORT_BUDGET_MS = 60
+
+# Dépendances lourdes, propres à certains modes
+NETWORK = {"requests", "urllib3", "resend"}
+HEAVY = NETWORK | {"bs4", "lxml", "sqlite3", "http.server", "dotenv", "cProfile"}
+
+
+def _importtime(args: list[str], cwd: str) -> dict[str, int]:
+    """Lance Python avec -X importtime. Retourne {module: cumulé (µs)}."""
+    env = {**os.environ, "PYTHONPATH": SRC}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$", line)
+        if m:
+            modules[m.group(2)] = int(m.group(1))
+    return modules
+
+
+# ── Import du point d'entrée ────────────────────────────────────────
+
+
+class TestEntryPointImport:
+    def test_no_heavy_dependency(self, tmp_path):
+        modules = _importtime(["-c", "import mypacer_club.main"], str(tmp_path))
+        assert "mypacer_club.main" in modules
+        assert not HEAVY & modules.keys()
+
+    def test_within_budget(self, tmp_path):
+        modules = _importtime(["-c", "import mypacer_club.main"], str(tmp_path))
+        assert modules["mypacer_club.main"] / 1000 < IMPORT_BUDGET_MS
+
+
+# ── Imports par mode ────────────────────────────────────────────────
+
+
+class TestModeImports:
+    def test_sample_preview_skips_network_and_outbox(self, tmp_path):
+        modules = _importtime(
+            ["-m", "mypacer_club.main", "--club", "033033", "--sample", SAMPLE_PATH],
+            str(tmp_path),
+        )
+        assert (tmp_path / "preview_033033.html").exists()
+        assert "bs4" in modules
+        assert not (NETWORK | {"sqlite3", "http.server"}) & modules.keys()
+
+
+# ── .env ────────────────────────────────────────────────────────────
+
+
+class TestDotenv:
+    def test_found_from_cwd_and_loaded(self, tmp_path, monkeypatch):
+        from mypacer_club import main
+
+        (tmp_path / ".env").write_text("MYPACER_TEST_VAR=ok\n", encoding="utf-8")
+        sub = tmp_path / "a" / "b"
+        sub.mkdir(parents=True)
+        monkeypatch.chdir(sub)
+        monkeypatch.delenv("MYPACER_TEST_VAR", raising=False)
+        assert main._find_dotenv() == str(tmp_path / ".env")
+        main._load_dotenv()
+        assert os.environ["MYPACER_TEST_VAR"] == "ok"
+        monkeypatch.delenv("MYPACER_TEST_VAR")
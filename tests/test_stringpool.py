@@ -0,0 +1,41 @@
+from bs4 import BeautifulSoup
+
+from mypacer_club import scraper, synthetic
+from mypacer_club.stringpool import StringPool
+
+# ── StringPool ──────────────────────────────────────────────────────
+
+
+class TestStringPool:
+    def test_intern_returns_same_instance(self):
+        pool = StringPool()
+        first = "Talence "
+        a = pool.intern(first.strip())
+        b = pool.intern(first.rstrip())
+        assert a == b == "Talence"
+        assert a is b
+        assert len(pool) == 1
+
+
+# ── Parsing ─────────────────────────────────────────────────────────
+
+
+class TestParseWithPool:
+    def test_repeated_columns_share_storage(self):
+        soups = [
+            BeautifulSoup(html, "lxml")
+            for html in synthetic.generate_club_pages(pages=2, rows=50)
+        ]
+        pool = StringPool()
+        rows = [r for s in soups for r in scraper.parse_raw_results(s, pool)]
+        for key in ("ville", "epreuve", "niveau", "tour", "date", "nom"):
+            by_value = {}
+            for r in rows:
+                assert by_value.setdefault(r[key], r[key]) is r[key]
+        # 6 colonnes par ligne, moins de la moitié de valeurs distinctes
+        assert len(pool) < len(rows) * 6 / 2
+
+    def test_same_rows_with_or_without_pool(self, sample_soup):
+        assert scraper.parse_raw_results(
+            sample_soup, StringPool()
+        ) == scraper._parse_rows(sample_soup)
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+from mypacer_club import synthetic
+from mypacer_club.analyzer import process_results
+from mypacer_club.scraper import _get_total_pages, extract_club_name, parse_raw_results
+
+NOW = datetime(2026, 2, 16, 8, 0)
+
+
+def _parse(html: str) -> list[dict]:
+    return parse_raw_results(BeautifulSoup(html, "lxml"))
+
+
+# ── generate_page ───────────────────────────────────────────────────
+
+
+class TestGeneratePage:
+    def test_rows_parsed_by_scraper(self):
+        rows = _parse(synthetic.generate_page(rows=40, today=NOW))
+        assert len(rows) == 40
+        assert all(r["nom"] and r["epreuve"] and r["perf"] for r in rows)
+
+    def test_deterministic_for_seed(self):
+        a = synthetic.generate_page(rows=20, seed=1, today=NOW)
+        b = synthetic.generate_page(rows=20, seed=1, today=NOW)
+        c = synthetic.generate_page(rows=20, seed=2, today=NOW)
+        assert a == b
+        assert a != c
+
+    def test_club_name_and_pagination(self):
+        html = synthetic.generate_page(position=2, total_pages=5, rows=1)
+        soup = BeautifulSoup(html, "lxml")
+        assert _get_total_pages(soup) == 5
+        assert extract_club_name(soup, "x") == "US SYNTHÉTIQUE"
+
+    def test_single_page_has_no_pager(self):
+        soup = BeautifulSoup(synthetic.generate_page(rows=1), "lxml")
+        assert _get_total_pages(soup) == 1
+
+    def test_mix_reaction_and_qualif(self):
+        mix = synthetic.Mix(reaction=1.0, prelim=1.0, qualif=1.0)
+        rows = _parse(synthetic.generate_page(rows=200, mix=mix, today=NOW))
+        assert any(" (0." in r["perf"] for r in rows)
+        assert any(r["qualif"] for r in rows)
+
+    def test_mix_no_highlights(self):
+        mix = synthetic.Mix(podium=0, qualif=0, high_level=0)
+        rows = _parse(synthetic.generate_page(rows=200, mix=mix, today=NOW))
+        _, highlights = process_results(rows, today=NOW)
+        assert highlights == []
+
+    def test_old_share_outside_window(self):
+        rows = _parse(
+            synthetic.generate_page(rows=100, mix=synthetic.Mix(old=1.0), today=NOW)
+        )
+        recent, _ = process_results(rows, today=NOW)
+        assert recent == []
+
+
+# ── generate_club_pages ─────────────────────────────────────────────
+
+
+class TestGenerateClubPages:
+    def test_pages_independent_of_total(self):
+        pages = synthetic.generate_club_pages(pages=3, rows=5, today=NOW)
+        assert len(pages) == 3
+        # Même contenu de lignes quelle que soit la pagination
+        alone = synthetic.generate_page(position=1, total_pages=1, rows=5, today=NOW)
+        assert _parse(pages[1]) == _parse(alone)
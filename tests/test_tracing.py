@@ -0,0 +1,99 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mypacer_club import tracing
+from mypacer_club.scraper import fetch_club_page
+
+
+@pytest.fixture
+def tracer():
+    t = tracing.enable()
+    yield t
+    tracing.disable()
+
+
+# ── span ────────────────────────────────────────────────────────────
+
+
+class TestSpan:
+    def test_disabled_yields_attrs(self):
+        with tracing.span("x", a=1) as sp:
+            sp["b"] = 2
+        assert sp == {"a": 1, "b": 2}
+
+    def test_records_duration_and_attrs(self, tracer):
+        with tracing.span("parse", club="033033") as sp:
+            sp["rows"] = 42
+        (rec,) = tracer.records
+        assert rec["name"] == "parse"
+        assert rec["rows"] == 42
+        assert rec["club"] == "033033"
+        assert rec["duration_ms"] >= 0
+        assert rec["status"] == "ok"
+
+    def test_nested_spans_linked_and_club_inherited(self, tracer):
+        with tracing.span("club", club="033033"), tracing.span("fetch"):
+            pass
+        child, parent = tracer.records
+        assert child["parent_id"] == parent["span_id"]
+        assert child["club"] == "033033"
+        assert parent["parent_id"] is None
+
+    def test_error_recorded_and_reraised(self, tracer):
+        with pytest.raises(ValueError), tracing.span("x"):
+            raise ValueError("boom")
+        assert tracer.records[0]["status"] == "error"
+        assert tracer.records[0]["error"] == "boom"
+
+    def test_threads_do_not_share_parent(self, tracer):
+        def work():
+            with tracing.span("worker"):
+                pass
+
+        with tracing.span("main"):
+            t = threading.Thread(target=work)
+            t.start()
+            t.join()
+        worker = next(r for r in tracer.records if r["name"] == "worker")
+        assert worker["parent_id"] is None
+
+
+class TestJsonLines:
+    def test_writes_one_line_per_span(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        tracing.enable(str(path))
+        try:
+            with tracing.span("a"):
+                pass
+            with tracing.span("b", rows=3):
+                pass
+        finally:
+            tracing.disable()
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [r["name"] for r in lines] == ["a", "b"]
+        assert lines[1]["rows"] == 3
+
+
+# ── Instrumentation ─────────────────────────────────────────────────
+
+
+class TestFetchPageSpan:
+    @patch("requests.get")
+    def test_fetch_page_span(self, mock_get: MagicMock, tracer):
+        mock_response = MagicMock()
+        mock_response.text = "<html><body>OK</body></html>"
+        mock_response.content = b"<html><body>OK</body></html>"
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+
+        fetch_club_page("033033", 2026, position=2)
+
+        fetch = next(r for r in tracer.records if r["name"] == "fetch_page")
+        assert fetch["club"] == "033033"
+        assert fetch["position"] == 2
+        assert fetch["bytes"] == len(mock_response.content)
+        assert fetch["status_code"] == 200
+        assert fetch["cache_hit"] is False
@@ -0,0 +1,165 @@
+import json
+import time
+from datetime import datetime
+
+import pytest
+import requests
+
+from mypacer_club import pipeline, scraper, transport
+
+NOW = datetime(2026, 2, 16, 8, 0)
+
+
+@pytest.fixture
+def recording(standin, tmp_path):
+    """Crawl complet du faux athle.fr, enregistré."""
+    path = str(tmp_path / "run.jsonl")
+    session = transport.make_session("record", path)
+    try:
+        soups, _ = scraper.fetch_all_club_pages(
+            "033033", 2026, session=session, base_url=standin.url
+        )
+    finally:
+        session.close()
+    return path, soups
+
+
+# ── Enregistrement ──────────────────────────────────────────────────
+
+
+class TestRecord:
+    def test_one_line_per_exchange(self, recording):
+        path, _ = recording
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) == 3
+        assert [r["status"] for r in records] == [200, 200, 200]
+        assert records[0]["request_headers"]["User-Agent"] == scraper.USER_AGENT
+        assert all(r["elapsed"] >= 0 and r["t"] >= 0 for r in records)
+        assert transport.recorded_at(path) == datetime.fromisoformat(records[0]["at"])
+
+    def test_network_error_recorded(self, tmp_path):
+        path = str(tmp_path / "err.jsonl")
+        session = transport.make_session("record", path)
+        with pytest.raises(requests.ConnectionError):
+            session.get("http://127.0.0.1:9/bases/liste.aspx?x=1", timeout=1)
+        session.close()
+        with open(path, encoding="utf-8") as f:
+            (record,) = [json.loads(line) for line in f]
+        assert record["error"].startswith("ConnectionError")
+
+
+# ── Replay ──────────────────────────────────────────────────────────
+
+
+class TestReplay:
+    def test_bit_for_bit(self, recording, standin):
+        path, soups = recording
+        standin.stop()  # plus aucun réseau
+        session = transport.make_session("replay", path)
+        replayed, _ = scraper.fetch_all_club_pages(
+            "033033", 2026, session=session, base_url=standin.url
+        )
+        assert [str(s) for s in replayed] == [str(s) for s in soups]
+
+    def test_host_independent(self, recording):
+        path, soups = recording
+        # Enregistré contre le serveur local, rejoué avec l'URL athle.fr
+        session = transport.make_session("replay", path)
+        replayed, _ = scraper.fetch_all_club_pages("033033", 2026, session=session)
+        assert len(replayed) == len(soups)
+
+    def test_replays_statuses_in_order(self, standin, tmp_path):
+        path = str(tmp_path / "retry.jsonl")
+        standin.fail_next = [429]
+        session = transport.make_session("record", path)
+        scraper.fetch_club_page("033033", 2026, session=session, base_url=standin.url)
+        session.close()
+
+        session = transport.make_session("replay", path)
+        url = scraper.page_url("033033", 2026, 0, standin.url)
+        assert session.get(url).status_code == 429
+        assert session.get(url).status_code == 200
+        # File épuisée : la dernière réponse est répétée
+        assert session.get(url).status_code == 200
+
+    def test_missing_recording(self, recording):
+        session = transport.make_session("replay", recording[0])
+        with pytest.raises(requests.ConnectionError, match="Aucun enregistrement"):
+            session.get(scraper.page_url("999999", 2026))
+
+    def test_original_pace(self, tmp_path):
+        path = tmp_path / "slow.jsonl"
+        record = {
+            "url": "https://x/bases/liste.aspx?a=1",
+            "status": 200,
+            "headers": {"Content-Type": "text/html; charset=utf-8"},
+            "body": "",
+            "elapsed": 0.2,
+        }
+        path.write_text(json.dumps(record) + "\n", encoding="utf-8")
+        url = "https://x/bases/liste.aspx?a=1"
+
+        fast = transport.make_session("replay", str(path))
+        start = time.perf_counter()
+        fast.get(url)
+        assert time.perf_counter() - start < 0.1
+
+        paced = transport.make_session("replay", str(path), pace="original")
+        start = time.perf_counter()
+        paced.get(url)
+        assert time.perf_counter() - start >= 0.2
+
+    def test_original_pace_keeps_gaps(self, tmp_path):
+        path = tmp_path / "gaps.jsonl"
+        base = {
+            "status": 200,
+            "headers": {"Content-Type": "text/html; charset=utf-8"},
+            "body": "",
+            "elapsed": 0.05,
+        }
+        # Deux requêtes enregistrées à 0.3 s d'écart (réponse en 0.05 s)
+        lines = [
+            {**base, "url": f"https://x/bases/liste.aspx?a={i}", "t": t}
+            for i, t in ((1, 0.0), (2, 0.3))
+        ]
+        path.write_text("\n".join(json.dumps(r) for r in lines), encoding="utf-8")
+
+        paced = transport.make_session("replay", str(path), pace="original")
+        start = time.perf_counter()
+        paced.get("https://x/bases/liste.aspx?a=1")
+        first = time.perf_counter() - start
+        paced.get("https://x/bases/liste.aspx?a=2")
+        total = time.perf_counter() - start
+        assert 0.05 <= first < 0.25
+        assert total >= 0.35
+
+    def test_end_to_end_report_identical(self, recording, standin):
+        path, _ = recording
+        _, live_html = pipeline.build_report(
+            "033033", NOW, base_url=standin.url, session=requests.Session()
+        )
+        _, replay_html = pipeline.build_report(
+            "033033",
+            NOW,
+            base_url=standin.url,
+            session=transport.make_session("replay", path),
+        )
+        assert replay_html == live_html
+
+
+# ── make_session ────────────────────────────────────────────────────
+
+
+class TestMakeSession:
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError, match="mode"):
+            transport.make_session("proxy")
+
+    def test_file_required(self):
+        with pytest.raises(ValueError, match="nécessite un fichier"):
+            transport.make_session("replay")
+
+    def test_invalid_pace(self, recording):
+        with pytest.raises(ValueError, match="pace"):
+            transport.make_session("replay", recording[0], pace="slow")
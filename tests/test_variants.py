@@ -0,0 +1,150 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from mypacer_club import pipeline, reporter
+from mypacer_club.daemon import load_config
+from mypacer_club.model import build_report_model
+from mypacer_club.variants import ResultIndex, Variant, category, parse_variants
+
+SAMPLE_PATH = str(Path(__file__).parent / "fixtures" / "sample_table.html")
+NOW = datetime(2026, 2, 15, 8, 0)
+
+
+# ── parse_variants ──────────────────────────────────────────────────
+
+
+class TestParseVariants:
+    def test_groups_expanded_to_athletes(self):
+        variants = parse_variants(
+            {
+                "groups": {"sprint": ["DUPONT Marie", "MARTIN Lucas"]},
+                "variants": [
+                    {
+                        "name": "Sprint",
+                        "to": "a@club.fr, b@club.fr",
+                        "groups": ["sprint"],
+                        "athletes": ["KOVANOV Danik"],
+                        "categories": ["ca"],
+                    }
+                ],
+            }
+        )
+        assert variants == [
+            Variant(
+                "Sprint",
+                ("a@club.fr", "b@club.fr"),
+                ("CA",),
+                frozenset({"DUPONT Marie", "MARTIN Lucas", "KOVANOV Danik"}),
+            )
+        ]
+
+    def test_unknown_group(self):
+        with pytest.raises(ValueError, match="sprint"):
+            parse_variants({"variants": [{"name": "S", "groups": ["sprint"]}]})
+
+    def test_no_variants(self):
+        assert parse_variants({"id": "033033"}) == []
+
+    def test_loaded_from_club_config(self, tmp_path):
+        path = tmp_path / "clubs.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "clubs": [
+                        {
+                            "id": "033033",
+                            "to": ["a@x.fr"],
+                            "variants": [{"name": "Cadets", "categories": ["CA"]}],
+                        }
+                    ]
+                }
+            )
+        )
+        [job] = load_config(str(path))
+        assert job.variants == [Variant("Cadets", categories=("CA",))]
+
+    def test_slug(self):
+        assert Variant("Équipe 1 / Sprint").slug == "equipe-1-sprint"
+
+
+# ── ResultIndex ─────────────────────────────────────────────────────
+
+
+class TestResultIndex:
+    def test_category(self, make_result):
+        assert category(make_result(epreuve="60m - Salle / CAM")) == "CAM"
+        assert category(make_result(epreuve="Cross")) == ""
+
+    def test_select_by_category_prefix(self, make_result):
+        recent = [
+            make_result(nom="A", epreuve="100m / CAM"),
+            make_result(nom="B", epreuve="100m / SEF"),
+            make_result(nom="C", epreuve="200m / CAF"),
+        ]
+        index = ResultIndex(recent, [recent[1], recent[2]])
+        sel, hl = index.select(Variant("Cadets", categories=("CA",)))
+        assert [r["nom"] for r in sel] == ["A", "C"]
+        assert [h["nom"] for h in hl] == ["C"]
+
+    def test_select_enriched_highlight_copies(self, make_result):
+        recent = [
+            make_result(nom="A", epreuve="100m / CAM"),
+            make_result(nom="B", epreuve="100m / SEF"),
+        ]
+        highlights = [dict(r, field_size=12) for r in recent]
+        index = ResultIndex(recent, highlights)
+        _, hl = index.select(Variant("Cadets", categories=("CA",)))
+        assert [(h["nom"], h["field_size"]) for h in hl] == [("A", 12)]
+
+    def test_select_by_athlete_keeps_report_order(self, make_result):
+        recent = [make_result(nom=n) for n in ("A", "B", "C", "B")]
+        index = ResultIndex(recent, [])
+        sel, _ = index.select(
+            Variant("G", athletes=frozenset({"B", "C"}), categories=("SEF",))
+        )
+        assert sel == recent
+
+    def test_model_is_filtered_view(self, make_result):
+        recent = [make_result(nom="A"), make_result(nom="B", epreuve="1 500m / MIM")]
+        model = ResultIndex(recent, []).model(
+            "US TALENCE", Variant("Minimes", categories=("MI",)), today=NOW
+        )
+        assert model.club_name == "US TALENCE · Minimes"
+        assert model.nb_athletes == 1
+        assert model.recent == [recent[1]]
+
+
+# ── Rendu partagé ───────────────────────────────────────────────────
+
+
+class TestSharedRender:
+    def test_cards_rendered_once_across_variants(self, make_result):
+        recent = [make_result(nom=f"A{i}", epreuve="100m / CAM") for i in range(5)]
+        full = build_report_model("Club", recent, [], today=NOW)
+        view = ResultIndex(recent, []).model(
+            "Club", Variant("Cadets", categories=("CAM",)), today=NOW
+        )
+        cache: reporter.CardCache = {}
+        reporter.render_html(full, cache=cache)
+        assert len(cache) == 5
+        html = reporter.render_html(view, cache=cache)
+        assert len(cache) == 5
+        assert html == reporter.render_html(view)
+
+    def test_build_reports_one_analysis_many_documents(self, capsys):
+        variants = [
+            Variant("Sprint", categories=("SE",)),
+            Variant("Espoirs", categories=("ES",)),
+        ]
+        docs = pipeline.build_reports(
+            "033033", NOW, variants=variants, sample=SAMPLE_PATH
+        )
+        assert [d.variant for d in docs] == [None, *variants]
+        full, sprint, espoirs = (d.report for d in docs)
+        assert len(sprint.recent) + len(espoirs.recent) <= len(full.recent)
+        assert all(r["epreuve"].endswith(("SEF", "SEM")) for r in sprint.recent)
+        assert docs[1].club_key("033033") == "033033/sprint"
+        assert "variante(s) rendue(s)" in capsys.readouterr().out
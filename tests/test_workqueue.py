@@ -0,0 +1,291 @@
+import threading
+
+from mypacer_club import workqueue
+from mypacer_club.daemon import DEFAULT_SCHEDULE, ClubJob
+from mypacer_club.scraper import FetchError
+from mypacer_club.workqueue import FileLeases, WorkerReport, WorkQueue, shard_of
+
+
+class FakeClock:
+    def __init__(self, start: float = 1000.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _jobs(n: int) -> list[ClubJob]:
+    return [ClubJob(f"{i:06d}", ["a@club.fr"], DEFAULT_SCHEDULE) for i in range(n)]
+
+
+# ── shard_of ────────────────────────────────────────────────────────
+
+
+class TestShardOf:
+    def test_stable(self):
+        assert shard_of("033033", 16) == shard_of("033033", 16)
+        assert 0 <= shard_of("033033", 16) < 16
+
+    def test_spreads_clubs(self):
+        shards = {shard_of(f"{i:06d}", 8) for i in range(200)}
+        assert shards == set(range(8))
+
+
+# ── FileLeases ──────────────────────────────────────────────────────
+
+
+class TestFileLeases:
+    def test_acquire_is_exclusive(self, tmp_path):
+        clock = FakeClock()
+        a = FileLeases(str(tmp_path), "a", ttl=60, clock=clock)
+        b = FileLeases(str(tmp_path), "b", ttl=60, clock=clock)
+        assert a.acquire("shard-0")
+        assert not b.acquire("shard-0")
+        assert a.holder("shard-0")["owner"] == "a"
+
+    def test_release_frees_lease(self, tmp_path):
+        clock = FakeClock()
+        a = FileLeases(str(tmp_path), "a", ttl=60, clock=clock)
+        b = FileLeases(str(tmp_path), "b", ttl=60, clock=clock)
+        a.acquire("shard-0")
+        b.release("shard-0")  # pas le propriétaire : sans effet
+        assert not b.acquire("shard-0")
+        a.release("shard-0")
+        assert b.acquire("shard-0")
+
+    def test_expired_lease_is_reclaimed(self, tmp_path):
+        clock = FakeClock()
+        a = FileLeases(str(tmp_path), "a", ttl=60, clock=clock)
+        b = FileLeases(str(tmp_path), "b", ttl=60, clock=clock)
+        a.acquire("shard-0")
+        clock.now += 61
+        assert b.acquire("shard-0")
+        assert b.holder("shard-0")["owner"] == "b"
+
+    def test_renew_keeps_lease(self, tmp_path):
+        clock = FakeClock()
+        a = FileLeases(str(tmp_path), "a", ttl=60, clock=clock)
+        b = FileLeases(str(tmp_path), "b", ttl=60, clock=clock)
+        a.acquire("shard-0")
+        clock.now += 50
+        assert a.renew("shard-0")
+        clock.now += 50
+        assert not b.acquire("shard-0")
+
+    def test_renew_fails_after_steal(self, tmp_path):
+        clock = FakeClock()
+        a = FileLeases(str(tmp_path), "a", ttl=60, clock=clock)
+        b = FileLeases(str(tmp_path), "b", ttl=60, clock=clock)
+        a.acquire("shard-0")
+        clock.now += 61
+        b.acquire("shard-0")
+        assert not a.renew("shard-0")
+
+    def test_renew_does_not_overwrite_new_holder(self, tmp_path, monkeypatch):
+        clock = FakeClock()
+        a = FileLeases(str(tmp_path), "a", ttl=60, clock=clock)
+        b = FileLeases(str(tmp_path), "b", ttl=60, clock=clock)
+        a.acquire("shard-0")
+        clock.now += 61
+        # b reprend le bail expiré juste après la lecture faite par renew
+        read = workqueue._read_json
+
+        def read_then_steal(path):
+            data = read(path)
+            if path.endswith(".lease"):
+                monkeypatch.setattr(workqueue, "_read_json", read)
+                assert b.acquire("shard-0")
+            return data
+
+        monkeypatch.setattr(workqueue, "_read_json", read_then_steal)
+        assert not a.renew("shard-0")
+        assert a.holder("shard-0")["owner"] == "b"
+
+    def test_renew_keeps_file_for_concurrent_acquire(self, tmp_path, monkeypatch):
+        clock = FakeClock()
+        a = FileLeases(str(tmp_path), "a", ttl=60, clock=clock)
+        b = FileLeases(str(tmp_path), "b", ttl=60, clock=clock)
+        a.acquire("shard-0")
+        clock.now += 30
+        # b tente sa prise pendant l'écriture du nouveau bail de a
+        replace = workqueue.os.replace
+        attempts = []
+
+        def replace_during_acquire(src, dst):
+            if dst.endswith(".lease") and not attempts:
+                attempts.append(b.acquire("shard-0"))
+            replace(src, dst)
+
+        monkeypatch.setattr(workqueue.os, "replace", replace_during_acquire)
+        assert a.renew("shard-0")
+        assert attempts == [False]
+        assert a.holder("shard-0") == {"owner": "a", "expires": clock.now + 60}
+
+    def test_expired_lease_not_renewed(self, tmp_path):
+        clock = FakeClock()
+        a = FileLeases(str(tmp_path), "a", ttl=60, clock=clock)
+        a.acquire("shard-0")
+        clock.now += 61
+        assert not a.renew("shard-0")
+
+    def test_no_leftover_files(self, tmp_path):
+        a = FileLeases(str(tmp_path), "a", ttl=60)
+        a.acquire("shard-0")
+        a.renew("shard-0")
+        a.release("shard-0")
+        assert list(tmp_path.iterdir()) == []
+
+
+# ── WorkQueue ───────────────────────────────────────────────────────
+
+
+class TestWorkQueue:
+    def test_single_worker_processes_all(self, tmp_path):
+        jobs = _jobs(10)
+        queue = WorkQueue(str(tmp_path), jobs, "2026-02-09", shards=4)
+        seen: list[str] = []
+        report = queue.run(lambda job: seen.append(job.club_id))
+        assert sorted(seen) == [j.club_id for j in jobs]
+        assert sorted(report.processed) == sorted(seen)
+        assert queue.pending_shards() == []
+
+    def test_workers_process_each_club_once(self, tmp_path):
+        jobs = _jobs(40)
+        seen: list[str] = []
+        lock = threading.Lock()
+
+        def process(job: ClubJob) -> None:
+            with lock:
+                seen.append(job.club_id)
+
+        def worker(name: str) -> None:
+            queue = WorkQueue(
+                str(tmp_path), jobs, "2026-02-09", shards=8, worker_id=name
+            )
+            queue.run(process, poll=0.01)
+
+        threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(seen) == [j.club_id for j in jobs]
+
+    def test_done_clubs_are_not_rerun(self, tmp_path):
+        jobs = _jobs(5)
+        WorkQueue(str(tmp_path), jobs, "2026-02-09", shards=2).run(lambda job: None)
+        seen: list[str] = []
+        report = WorkQueue(str(tmp_path), jobs, "2026-02-09", shards=2).run(
+            lambda job: seen.append(job.club_id)
+        )
+        assert seen == []
+        assert report.shards == []
+
+    def test_new_batch_runs_again(self, tmp_path):
+        jobs = _jobs(3)
+        WorkQueue(str(tmp_path), jobs, "2026-02-09", shards=2).run(lambda job: None)
+        seen: list[str] = []
+        WorkQueue(str(tmp_path), jobs, "2026-02-16", shards=2).run(
+            lambda job: seen.append(job.club_id)
+        )
+        assert len(seen) == 3
+
+    def test_failure_is_recorded_and_shard_continues(self, tmp_path):
+        jobs = _jobs(6)
+
+        def process(job: ClubJob) -> str | None:
+            if job.club_id == "000002":
+                raise FetchError("athle.fr indisponible")
+            if job.club_id == "000004":
+                return "1 envoi(s) en échec"
+            return None
+
+        queue = WorkQueue(str(tmp_path), jobs, "2026-02-09", shards=1)
+        report = queue.run(process)
+        assert report.failed == {
+            "000002": "athle.fr indisponible",
+            "000004": "1 envoi(s) en échec",
+        }
+        assert len(report.processed) == 4
+        # Les échecs restent à faire, avec leur dernière erreur
+        assert queue.pending_shards() == [0]
+        assert not queue.is_done("000002")
+        assert queue.last_error("000002") == "athle.fr indisponible"
+
+    def test_unexpected_error_does_not_stop_worker(self, tmp_path, capsys):
+        jobs = _jobs(4)
+
+        def process(job: ClubJob) -> str | None:
+            if job.club_id == "000001":
+                raise RuntimeError("RESEND_API_KEY manquante")
+            return None
+
+        queue = WorkQueue(str(tmp_path), jobs, "2026-02-09", shards=1)
+        report = queue.run(process)
+        assert report.failed == {"000001": "RuntimeError: RESEND_API_KEY manquante"}
+        assert len(report.processed) == 3
+        assert queue.leases.holder("shard-0") is None
+        assert "000001" in capsys.readouterr().err
+
+    def test_failed_club_retried_by_next_pass(self, tmp_path):
+        jobs = _jobs(4)
+        first = WorkQueue(str(tmp_path), jobs, "2026-02-09", shards=2)
+
+        def flaky(job: ClubJob) -> str | None:
+            if job.club_id == "000001":
+                raise FetchError("Erreur HTTP : 503")
+            return None
+
+        report = first.run(flaky, poll=0.01)
+        assert list(report.failed) == ["000001"]
+
+        seen: list[str] = []
+        second = WorkQueue(
+            str(tmp_path), jobs, "2026-02-09", shards=2, worker_id="other"
+        )
+        report = second.run(lambda job: seen.append(job.club_id), poll=0.01)
+        assert seen == ["000001"]
+        assert report.processed == ["000001"]
+        assert second.pending_shards() == []
+        assert second.last_error("000001") is None
+
+    def test_dead_worker_shard_is_reclaimed(self, tmp_path):
+        jobs = _jobs(4)
+        clock = FakeClock()
+        dead = WorkQueue(
+            str(tmp_path), jobs, "2026-02-09", shards=1, worker_id="dead", clock=clock
+        )
+        # Le worker meurt après le premier club, bail toujours posé
+        assert dead.leases.acquire("shard-0")
+        dead.mark_done("000000")
+
+        alive = WorkQueue(
+            str(tmp_path),
+            jobs,
+            "2026-02-09",
+            shards=1,
+            worker_id="alive",
+            lease_ttl=60,
+            clock=clock,
+        )
+        seen: list[str] = []
+        report = WorkerReport()
+        assert not alive.run_shard(0, lambda job: seen.append(job.club_id), report)
+        clock.now += 301
+        assert alive.run_shard(0, lambda job: seen.append(job.club_id), report)
+        assert seen == ["000001", "000002", "000003"]
+
+    def test_lost_lease_stops_shard(self, tmp_path):
+        jobs = _jobs(3)
+        queue = WorkQueue(str(tmp_path), jobs, "2026-02-09", shards=1, lease_ttl=0.03)
+        seen: list[str] = []
+
+        def process(job: ClubJob) -> None:
+            seen.append(job.club_id)
+            # Un autre worker reprend le bail pendant le traitement
+            queue.leases.release("shard-0")
+            FileLeases(queue.leases.root, "other", ttl=60).acquire("shard-0")
+            threading.Event().wait(0.05)
+
+        queue.run_shard(0, process, WorkerReport())
+        assert seen == ["000000"]